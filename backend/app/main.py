@@ -4,6 +4,7 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 from app.db import engine, Base, get_db
 from app import models  # noqa: F401 - register all models with Base.metadata
 from app.routers import auth, jobs, resume, chat, dashboard, subscription
@@ -15,6 +16,46 @@ logger = logging.getLogger(__name__)
 # Create all tables on startup (SQLite / PostgreSQL)
 Base.metadata.create_all(bind=engine)
 
+
+def _ensure_job_match_columns():
+    """If job_matches was created before scores were persisted per resume version, add the missing columns."""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as conn:
+        rows = conn.execute(text("PRAGMA table_info(job_matches)")).fetchall()
+        if not rows:
+            return
+        columns = [row[1] for row in rows]
+        for name, ddl in (("resume_id", "INTEGER"), ("job_hash", "VARCHAR(40)"), ("updated_at", "DATETIME")):
+            if name not in columns:
+                conn.execute(text(f"ALTER TABLE job_matches ADD COLUMN {name} {ddl}"))
+        conn.commit()
+        try:
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_job_matches_user_job ON job_matches (user_id, job_id)"
+            ))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.warning("job_matches: unique (user_id, job_id) index not created: %s", e)
+
+
+_ensure_job_match_columns()
+
+
+def _ensure_jobs_unique_index():
+    """Add the (title, company) unique index to jobs tables created before it was part of the model."""
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_title_company ON jobs (title, company)"))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.warning("jobs: unique (title, company) index not created (duplicate rows?): %s", e)
+
+
+_ensure_jobs_unique_index()
+
 CORS_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
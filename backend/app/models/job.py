@@ -1,11 +1,13 @@
 """Job model: global job listing (no user_id). Source e.g. SerpAPI."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from app.db import Base
 
 
 class Job(Base):
     __tablename__ = "jobs"
+    # One row per listing; search results and saved jobs are matched on (title, company)
+    __table_args__ = (Index("ux_jobs_title_company", "title", "company", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -1,15 +1,19 @@
-"""JobMatch: user–job match score and reasons (e.g. for AI recommendations)."""
+"""JobMatch: user–job match score and reasons, persisted per (user, resume version, job content)."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, ForeignKey, JSON, Index
 from app.db import Base
 
 
 class JobMatch(Base):
     __tablename__ = "job_matches"
+    __table_args__ = (Index("ux_job_matches_user_job", "user_id", "job_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
     match_score = Column(Float, nullable=False)  # 0–100
-    reasons = Column(JSON, default=list)  # or Text if JSON stored as string
+    reasons = Column(JSON, default=list)  # matched resume keywords
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=True)  # resume version the score was computed from
+    job_hash = Column(String(40), nullable=True)  # sha1 of job title/company/description at scoring time
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
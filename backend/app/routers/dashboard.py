@@ -1,10 +1,11 @@
-"""Dashboard: stats from real DB (Application, Resume)."""
+"""Dashboard: stats from real DB (Application, Resume, JobMatch)."""
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.db import get_db
 from app.auth import require_user
 from app.models import User, Application, Resume
+from app.services.job_match import top_matches
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
@@ -14,7 +15,7 @@ def dashboard_stats(
     db: Session = Depends(get_db),
     user: User = Depends(require_user),
 ):
-    """Return basic counts: jobs (applications), applications sent (redirected), resumes."""
+    """Return basic counts: jobs (applications), applications sent (redirected), resumes; plus best stored job matches."""
     jobs_count = db.query(Application).filter(Application.user_id == user.id).count()
     applications_count = db.query(Application).filter(
         Application.user_id == user.id,
@@ -25,4 +26,5 @@ def dashboard_stats(
         "jobs_saved": jobs_count,
         "applications_sent": applications_count,
         "resumes_uploaded": resumes_count,
+        "top_matches": top_matches(db, user.id),
     }
@@ -2,8 +2,11 @@
 Jobs: search, list, save, match, and apply/redirect (tracking only – no auto-submit).
 Uses Job (global) + Application (user actions: viewed / shortlisted / redirected).
 """
+import logging
 from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from pydantic import BaseModel as PydanticBaseModel
 
@@ -14,10 +17,18 @@ from app.schemas import JobSearchParams, JobResponse
 from app.services.serpapi_jobs import search_jobs as serpapi_search
 from app.plan_checks import check_redirect_allowed, check_job_save_allowed
 from app.services.llm import complete
+from app.services.job_match import get_job_matches, latest_resume
+
+logger = logging.getLogger(__name__)
 
 
-def _job_to_response(job: Job, job_id_override: int | None = None) -> JobResponse:
+def _job_to_response(
+    job: Job,
+    job_id_override: int | None = None,
+    match: tuple[float, list[str]] | None = None,
+) -> JobResponse:
     """Map Job model to frontend JobResponse (company_name, job_title, application_url)."""
+    match_score, matched_skills = match or (0.0, [])
     return JobResponse(
         id=job_id_override or job.id,
         company_name=job.company,
@@ -26,12 +37,67 @@ def _job_to_response(job: Job, job_id_override: int | None = None) -> JobRespons
         description=job.description,
         application_url=job.apply_url or "",
         company_logo_url=None,
-        match_score=0.0,
-        matched_skills=[],
+        match_score=match_score,
+        matched_skills=matched_skills,
         posted_at=None,
     )
 
 
+def _store_search_results(db: Session, raw: list[dict]) -> list[Job]:
+    """
+    Upsert search results into jobs by (title, company) with one commit; returns rows aligned with raw.
+    If a concurrent request inserted one of the jobs first (unique index), the batch is retried once
+    against the rows now stored.
+    """
+    try:
+        return _insert_search_results(db, raw)
+    except IntegrityError:
+        db.rollback()
+        return _insert_search_results(db, raw)
+
+
+def _insert_search_results(db: Session, raw: list[dict]) -> list[Job]:
+    keys = [(r["job_title"], r["company_name"]) for r in raw]
+    wanted = set(keys)
+    existing = {
+        (j.title, j.company): j
+        for j in db.query(Job).filter(Job.title.in_({k[0] for k in keys})).all()
+        if (j.title, j.company) in wanted
+    }
+    for key, r in zip(keys, raw):
+        if key not in existing:
+            existing[key] = Job(
+                title=r["job_title"],
+                company=r["company_name"],
+                location=r.get("location"),
+                description=r.get("description"),
+                apply_url=r.get("application_url") or "",
+                source=r.get("source") or "SerpAPI",
+            )
+            db.add(existing[key])
+    db.commit()
+    return [existing[key] for key in keys]
+
+
+def _get_or_create_job(db: Session, **fields) -> Job:
+    """
+    Return the stored job with this title+company, else create it. jobs has a unique index on the pair
+    (ux_jobs_title_company), so if a concurrent request created it first, that row is returned.
+    """
+    job = db.query(Job).filter(Job.title == fields["title"], Job.company == fields["company"]).first()
+    if job:
+        return job
+    job = Job(**fields)
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return db.query(Job).filter(Job.title == fields["title"], Job.company == fields["company"]).one()
+    db.refresh(job)
+    return job
+
+
 class JobPayload(PydanticBaseModel):
     """Optional payload when saving/redirecting from search (job not yet in DB)."""
     company_name: str
@@ -65,10 +131,28 @@ def search_jobs(
     db: Session = Depends(get_db),
     user: User = Depends(require_user),
 ):
-    """Search jobs (SerpAPI or mock). Returns list; save via POST /action with action=shortlisted."""
+    """
+    Search jobs (SerpAPI or mock). Returns list; save via POST /action with action=shortlisted.
+    Live results are stored in jobs so match scores vs the user's latest resume persist in job_matches
+    (nothing is stored without a resume, and mock results never are); ids stay 0 in the response
+    (unsaved for the client).
+    """
     raw = serpapi_search(body.job_title, body.location, body.remote)
+    matches: dict[int, tuple[float, list[str]]] = {}
+    stored: list[Job | None] = [None] * len(raw)
+    live = [i for i, r in enumerate(raw) if r.get("source") != "mock"]
+    resume = latest_resume(db, user.id) if live else None
+    if resume and (resume.resume_text or "").strip():
+        try:
+            for i, job in zip(live, _store_search_results(db, [raw[i] for i in live])):
+                stored[i] = job
+            matches = get_job_matches(db, user.id, [j for j in stored if j is not None])
+        except Exception:
+            logger.exception("jobs: could not store search results and match scores for user %s", user.id)
+            db.rollback()
     out = []
-    for i, r in enumerate(raw):
+    for r, job in zip(raw, stored):
+        match_score, matched_skills = matches.get(job.id, (0.0, [])) if job is not None else (0.0, [])
         out.append(JobResponse(
             id=0,
             company_name=r["company_name"],
@@ -77,8 +161,8 @@ def search_jobs(
             description=r.get("description"),
             application_url=r.get("application_url") or "",
             company_logo_url=r.get("company_logo_url"),
-            match_score=0.8 - (i * 0.05),
-            matched_skills=[],
+            match_score=match_score,
+            matched_skills=matched_skills,
             posted_at=r.get("posted_at"),
         ))
     return out
@@ -96,7 +180,8 @@ def list_jobs(
     if not job_ids:
         return []
     jobs = db.query(Job).filter(Job.id.in_(job_ids)).order_by(Job.created_at.desc()).all()
-    return [_job_to_response(j) for j in jobs]
+    matches = get_job_matches(db, user.id, jobs)
+    return [_job_to_response(j, match=matches.get(j.id)) for j in jobs]
 
 
 @router.post("/cover-letter")
@@ -155,7 +240,8 @@ def record_action(
     if (body.job_id == 0 or not job) and body.job and body.action in ("shortlisted", "redirected"):
         check_job_save_allowed(db, user.id)
         j = body.job
-        new_job = Job(
+        new_job = _get_or_create_job(
+            db,
             title=j.job_title,
             company=j.company_name,
             location=j.location,
@@ -163,21 +249,16 @@ def record_action(
             apply_url=j.application_url or "",
             source="SerpAPI",
         )
-        db.add(new_job)
-        db.commit()
-        db.refresh(new_job)
         job_id = new_job.id
     elif (body.job_id == 0 or not job) and body.action in ("shortlisted", "redirected"):
         check_job_save_allowed(db, user.id)
-        new_job = Job(
+        new_job = _get_or_create_job(
+            db,
             title="Applied via search",
             company="Unknown",
             apply_url="",
             source="SerpAPI",
         )
-        db.add(new_job)
-        db.commit()
-        db.refresh(new_job)
         job_id = new_job.id
     elif job:
         job_id = job.id
@@ -0,0 +1,123 @@
+"""
+Resume–job keyword match, persisted in job_matches per (user, resume version, job).
+A stored score is reused until the user's latest resume or the job's content hash changes.
+The tokenizer and score formula are a copy of the search scorer's (services/job_match.py, which this
+package cannot import); tests/test_job_match.py checks that stored and live scores agree.
+"""
+import hashlib
+import heapq
+import logging
+import re
+
+from sqlalchemy.orm import Session
+
+from app.models import Job, JobMatch, Resume
+
+logger = logging.getLogger(__name__)
+
+_STOP_WORDS = {"the", "and", "for", "with", "you", "your", "this", "that", "are", "was", "have", "has", "from", "can", "will", "all", "any", "not", "but", "its", "may", "new", "one", "our", "out", "use", "via"}
+
+
+def _keywords(text: str | None) -> frozenset[str]:
+    words = re.findall(r"[a-z0-9]+", (text or "").lower())
+    return frozenset(w for w in words if len(w) >= 3 and w not in _STOP_WORDS)
+
+
+class ResumeProfile:
+    """Keyword set of one resume version."""
+
+    __slots__ = ("keywords",)
+
+    def __init__(self, text: str):
+        self.keywords = _keywords(text)
+
+
+def compute_keyword_match(resume: ResumeProfile, job_title: str, job_description: str | None) -> tuple[float, list[str]]:
+    """(score 0-100, up to 5 matched keywords in alphabetical order): overlap ratio plus absolute overlap count."""
+    job_kw = _keywords(f"{job_title or ''} {job_description or ''}")
+    if not job_kw:
+        return 0.0, []
+    overlap = resume.keywords & job_kw
+    ratio = len(overlap) / len(job_kw)
+    score = min(100.0, (ratio * 60) + (min(len(overlap), 15) * 2.5))
+    return round(score, 1), heapq.nsmallest(5, overlap)
+
+
+def job_content_hash(job: Job) -> str:
+    return hashlib.sha1(f"{job.title}\0{job.company}\0{job.description or ''}".encode("utf-8")).hexdigest()
+
+
+def latest_resume(db: Session, user_id: int) -> Resume | None:
+    return db.query(Resume).filter(Resume.user_id == user_id).order_by(Resume.created_at.desc()).first()
+
+
+def get_job_matches(db: Session, user_id: int, jobs: list[Job]) -> dict[int, tuple[float, list[str]]]:
+    """
+    job_id -> (match_score, matched keywords) for the user's latest resume.
+    Served from job_matches when the stored row has the same resume version and job hash;
+    otherwise recomputed and written back. Empty if the user has no resume.
+    """
+    resume = latest_resume(db, user_id)
+    if not jobs or not resume or not (resume.resume_text or "").strip():
+        return {}
+    stored = {
+        m.job_id: m
+        for m in db.query(JobMatch).filter(
+            JobMatch.user_id == user_id,
+            JobMatch.job_id.in_([j.id for j in jobs]),
+        ).all()
+    }
+    profile: ResumeProfile | None = None
+    out: dict[int, tuple[float, list[str]]] = {}
+    changed = 0
+    for job in jobs:
+        job_hash = job_content_hash(job)
+        m = stored.get(job.id)
+        if m is not None and m.resume_id == resume.id and m.job_hash == job_hash:
+            out[job.id] = (m.match_score, list(m.reasons or []))
+            continue
+        if profile is None:
+            profile = ResumeProfile(resume.resume_text)
+        score, reasons = compute_keyword_match(profile, job.title, job.description)
+        out[job.id] = (score, reasons)
+        if m is None:
+            m = JobMatch(user_id=user_id, job_id=job.id)
+            db.add(m)
+            stored[job.id] = m
+        m.match_score = score
+        m.reasons = reasons
+        m.resume_id = resume.id
+        m.job_hash = job_hash
+        changed += 1
+    if changed:
+        try:
+            db.commit()
+        except Exception as e:
+            logger.warning("job_match: could not persist %d scores for user %s: %s", changed, user_id, e)
+            db.rollback()
+    return out
+
+
+def top_matches(db: Session, user_id: int, limit: int = 5) -> list[dict]:
+    """Best stored matches for the user's current resume version (for the dashboard)."""
+    resume = latest_resume(db, user_id)
+    if not resume:
+        return []
+    rows = (
+        db.query(JobMatch, Job)
+        .join(Job, Job.id == JobMatch.job_id)
+        .filter(JobMatch.user_id == user_id, JobMatch.resume_id == resume.id)
+        .order_by(JobMatch.match_score.desc())
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "job_id": job.id,
+            "job_title": job.title,
+            "company_name": job.company,
+            "match_score": m.match_score,
+            "matched_skills": list(m.reasons or []),
+        }
+        for m, job in rows
+    ]
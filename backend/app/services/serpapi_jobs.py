@@ -1,4 +1,4 @@
-"""Job search via SerpAPI or mock results."""
+"""Job search via SerpAPI or mock results (source "SerpAPI" / "mock" on each result)."""
 from app.config import settings
 
 def search_jobs(job_title: str, location: str = "", remote: bool = False) -> list[dict]:
@@ -28,6 +28,7 @@ def search_jobs(job_title: str, location: str = "", remote: bool = False) -> lis
                 "company_logo_url": None,
                 "posted_at": None,
                 "external_id": str(j.get("job_id") or id(j)),
+                "source": "SerpAPI",
             })
         return out
     except Exception:
@@ -45,6 +46,7 @@ def _mock_jobs(job_title: str, location: str, remote: bool) -> list[dict]:
             "company_logo_url": None,
             "posted_at": None,
             "external_id": "mock-1",
+            "source": "mock",
         },
         {
             "company_name": "TechStart Inc",
@@ -55,5 +57,6 @@ def _mock_jobs(job_title: str, location: str, remote: bool) -> list[dict]:
             "company_logo_url": None,
             "posted_at": None,
             "external_id": "mock-2",
+            "source": "mock",
         },
     ]
@@ -3,11 +3,18 @@ Database setup for PathPilot.
 SQLite engine, session, base. Tables auto-create on first use (no manual migrations).
 Reads DATABASE_URL from environment. For Vercel, use /tmp or persistent storage.
 """
+import logging
 import os
+import time
 from pathlib import Path
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
+
+from services import metrics, timing
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./pathpilot.db")
 # Vercel serverless: writable dir is /tmp; persist path when not in serverless
@@ -20,13 +27,45 @@ else:
         db_path = Path(DATABASE_URL.replace("sqlite:///./", ""))
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection (db_pool_checkout_wait_seconds)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+# In-memory SQLite keeps SQLAlchemy's single-connection pool; file databases get the (timed) QueuePool they default to
+_url = make_url(DATABASE_URL)
+_pool_kwargs = {} if _url.get_backend_name() == "sqlite" and _url.database in (None, "", ":memory:") else {
+    "poolclass": TimedQueuePool,
+}
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},
     echo=False,
+    **_pool_kwargs,
 )
+if isinstance(engine.pool, QueuePool):
+    metrics.watch_pool(engine.pool)
+
+# SERVER_TIMING=1: SQL statements and commits show up as "db" / "db_commit" request timing spans
+timing.instrument_engine(engine)
+
+
+class TimedSession(Session):
+    def commit(self):
+        with timing.span("db_commit"):
+            super().commit()
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, class_=TimedSession if timing.enabled() else Session,
+)
 Base = declarative_base()
 
 _tables_created = False
@@ -62,11 +101,59 @@ def ensure_tables():
                 if "evaluated_at" not in columns:
                     conn.execute(text("ALTER TABLE resumes ADD COLUMN evaluated_at DATETIME"))
                     conn.commit()
+        _ensure_jobs_unique_index()
+        _ensure_jobs_location_id()
+        _ensure_jobs_fts()
         _tables_created = True
     except Exception:
         pass
 
 
+def _ensure_jobs_unique_index():
+    """Add the (title, company) unique index to older jobs tables. Skipped if rows already duplicate (bulk upsert then goes per-row)."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_title_company ON jobs (title, company)"
+            ))
+            conn.commit()
+    except Exception as e:
+        logger.warning("jobs: unique (title, company) index not created (duplicate rows?): %s", e)
+
+
+def _ensure_jobs_location_id():
+    """
+    Add jobs.location_id to older tables and fill it for rows stored without one. Rows stored as a bare US
+    state are resolved again (before gazetteer version 2 a lone "DE" or "CA" was the state, now the country).
+    """
+    from services.gazetteer import location_id
+    with engine.connect() as conn:
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(jobs)")).fetchall()]
+        if columns and "location_id" not in columns:
+            conn.execute(text("ALTER TABLE jobs ADD COLUMN location_id VARCHAR(64)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_location_id ON jobs (location_id)"))
+            conn.commit()
+        rows = conn.execute(text(
+            "SELECT id, location, location_id FROM jobs"
+            " WHERE (location_id IS NULL OR location_id LIKE 'us/__') AND location IS NOT NULL AND location != ''"
+        )).fetchall()
+        updates = []
+        for job_id, location, stored_id in rows:
+            loc_id = location_id(location)
+            if loc_id and loc_id != stored_id:
+                updates.append({"id": job_id, "location_id": loc_id})
+        if updates:
+            conn.execute(text("UPDATE jobs SET location_id = :location_id WHERE id = :id"), updates)
+            conn.commit()
+
+
+def _ensure_jobs_fts():
+    """Create the jobs_fts full-text table and its sync triggers (services/job_fts.py)."""
+    from services.job_fts import ensure_job_fts
+    with engine.connect() as conn:
+        ensure_job_fts(conn)
+
+
 def get_db_session():
     """Return a DB session (for serverless). Call ensure_tables(); use session; then session.close()."""
     ensure_tables()
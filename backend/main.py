@@ -1,11 +1,13 @@
 """
 PathPilot API - FastAPI app.
-Creates DB tables on startup, mounts routers, CORS, /health.
+Creates DB tables on startup, mounts routers, CORS, /health, /metrics (Prometheus text format).
 Run: uvicorn main:app --reload
 
 Loads backend/.env so SERPAPI_KEY, OPENAI_API_KEY, SECRET_KEY, etc. are available.
 """
 import os
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Load .env from backend/ so all API keys (SerpAPI, OpenAI, JWT) are available
@@ -16,13 +18,17 @@ try:
 except ImportError:
     pass
 
-from fastapi import FastAPI
+import anyio.to_thread
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 
 from db import Base, engine
 import models  # noqa: F401 - register tables with Base.metadata
 from routers import auth, jobs, apply, resume, ai, subscription, chat
+from services.http_client import aclose_clients
+from services.job_signatures import start_backfill
+from services import metrics, timing
 
 # Create all tables when the app starts
 Base.metadata.create_all(bind=engine)
@@ -43,10 +49,29 @@ def _ensure_users_plan_column():
 
 _ensure_users_plan_column()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup: report the sync endpoint threadpool's load; start writing metrics snapshots (METRICS_DIR);
+    sign stored jobs that predate job_signatures (near-duplicate checks) in the background.
+    Shutdown: close pooled provider HTTP clients (keep-alive connections); write a final metrics snapshot.
+    """
+    metrics.watch_threadpool(anyio.to_thread.current_default_thread_limiter())
+    metrics.start()
+    start_backfill()
+    try:
+        yield
+    finally:
+        await aclose_clients()
+        metrics.stop()
+
+
 app = FastAPI(
     title="PathPilot API",
     description="AI-powered job search platform. Assisted Apply + Redirect only (no auto-submit).",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 
@@ -80,6 +105,45 @@ app.add_middleware(
     max_age=600,
 )
 
+if timing.enabled():
+    @app.middleware("http")
+    async def server_timing(request: Request, call_next):
+        """SERVER_TIMING=1: collect this request's spans; send them as Server-Timing and log them."""
+        started = time.perf_counter()
+        collector, token = timing.start()
+        try:
+            response = await call_next(request)
+        finally:
+            timing.finish(token)
+        total = time.perf_counter() - started
+        response.headers["Server-Timing"] = timing.header_value(collector, total)
+        timing.log_request(request.method, request.url.path, response.status_code, collector, total)
+        return response
+
+
+if metrics.enabled():
+    @app.middleware("http")
+    async def request_metrics(request: Request, call_next):
+        """Observe http_request_duration_seconds by method, route template (not raw path) and status."""
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # The router records the matched route and path params in the (shared) scope
+            metrics.HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=request.method, route=metrics.route_template(request.scope), status=status,
+            )
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_endpoint():
+        """Prometheus scrape endpoint; merges every worker's snapshot when METRICS_DIR is set."""
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # /api prefix so frontend can call /api/auth/register, /api/jobs/search, etc.
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
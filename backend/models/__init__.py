@@ -5,8 +5,9 @@ from models.resume import Resume
 from models.ai_usage import AIUsage
 from models.conversation import Conversation, Message
 from models.search_session import SearchSession, JobMatch
+from models.job_signature import JobSignature, JobLshBand
 
 __all__ = [
     "User", "Job", "Application", "Resume", "AIUsage", "Conversation", "Message",
-    "SearchSession", "JobMatch",
+    "SearchSession", "JobMatch", "JobSignature", "JobLshBand",
 ]
@@ -1,16 +1,20 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 
 from db import Base
 
 
 class Job(Base):
     __tablename__ = "jobs"
+    # One row per (title, company): lets search results be upserted in bulk with ON CONFLICT
+    __table_args__ = (Index("ux_jobs_title_company", "title", "company", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     company = Column(String(255), nullable=False)
     location = Column(String(255), nullable=True)
+    # Canonical gazetteer id of location ("us/co/denver"), set at ingest; area filters are prefix matches
+    location_id = Column(String(64), nullable=True, index=True)
     description = Column(Text, nullable=True)
     apply_url = Column(String(1024), nullable=True)
     source = Column(String(64), default="serpapi", nullable=True)
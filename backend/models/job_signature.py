@@ -0,0 +1,20 @@
+"""Persisted MinHash signatures and LSH band buckets of stored jobs (near-duplicate lookups, services/job_signatures.py)."""
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, LargeBinary
+
+from db import Base
+
+
+class JobSignature(Base):
+    __tablename__ = "job_signatures"
+
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    # DEDUPE_NUM_PERM little-endian uint64 values (services/dedupe.py pack_signature)
+    signature = Column(LargeBinary, nullable=False)
+
+
+class JobLshBand(Base):
+    __tablename__ = "job_lsh_bands"
+
+    # Hash of (band number, band values); lookups are by bucket, so it leads the primary key
+    bucket = Column(BigInteger, primary_key=True, autoincrement=False)
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
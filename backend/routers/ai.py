@@ -129,7 +129,7 @@ def career_chat(
     db.commit()
     db.refresh(user_msg)
 
-    reply = chat_completion(messages_for_llm, max_tokens=1024)
+    reply = chat_completion(messages_for_llm, max_tokens=1024, feature="career_chat")
 
     assistant_msg = Message(conversation_id=conv_id, role="assistant", content=reply)
     db.add(assistant_msg)
@@ -2,9 +2,10 @@
 import logging
 from datetime import datetime, date
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from db import get_db
+from db import get_db, get_db_session
 
 logger = logging.getLogger(__name__)
 from models.job import Job
@@ -22,24 +23,48 @@ from schemas.job import (
 from routers.auth import get_current_user, get_current_user_optional
 from models.user import User
 from services.serpapi import search_jobs, search_jobs_mock
-from services.job_match import compute_match
-from services.job_storage import load_jobs_from_json, filter_jobs, filter_jobs_query_only
+from services.job_match import ResumeProfile, compute_match, compute_match_batch, get_resume_profile
+from services.job_storage import load_jobs_with_index, filter_jobs, filter_jobs_query_only
+from services.semantic import get_semantic_index
+from services.dedupe import NearDuplicateIndex, near_dedupe_enabled
+from services.job_signatures import find_near_duplicates, signature, store_signatures
+from services.job_fts import JOB_DB_SEARCH_MIN_RESULTS, search_stored_jobs
+from services.gazetteer import location_id
+from services.singleflight import SingleFlight
+from services.search_cache import SearchCache
+from services import timing
 
 router = APIRouter()
 
 
-def _upsert_job(db: Session, j: dict, source: str) -> Job | None:
-    """Normalize and store job; return existing or new Job row. Returns None on DB error."""
+def _find_near_duplicate(db: Session, title: str, location: str | None, sig: tuple[int, ...]) -> Job | None:
+    """Stored job that is a near-duplicate (MinHash/LSH, services/job_signatures.py) of this one, if any."""
+    job_id = find_near_duplicates(db, [(title, location, sig)])[0]
+    return db.query(Job).filter(Job.id == job_id).first() if job_id is not None else None
+
+
+def _upsert_job(db: Session, j: dict, source: str, near_dupes: bool = False) -> Job | None:
+    """
+    Normalize and store job; return existing or new Job row. Returns None on DB error.
+    near_dupes (search ingestion only): a near-duplicate of a stored job (same posting and place, reworded
+    description or near-identical title) returns that job. User saves and actions match the exact
+    (title, company) key only, so a record never points at a different posting than the one the user chose.
+    """
     try:
-        title = (j.get("title") or "").strip() or "Job"
-        company = (j.get("company") or "").strip() or "Company"
+        title, company = _job_key(j)
         existing = db.query(Job).filter(Job.title == title, Job.company == company).first()
         if existing:
             return existing
+        sig = signature(title, company, j.get("description")) if near_dedupe_enabled() else None
+        if near_dupes and sig is not None:
+            existing = _find_near_duplicate(db, title, j.get("location"), sig)
+            if existing:
+                return existing
         job = Job(
             title=title,
             company=company,
             location=j.get("location"),
+            location_id=location_id(j.get("location")),
             description=j.get("description") or None,
             apply_url=j.get("apply_url"),
             source=source,
@@ -47,6 +72,8 @@ def _upsert_job(db: Session, j: dict, source: str) -> Job | None:
         db.add(job)
         db.commit()
         db.refresh(job)
+        if sig is not None:
+            store_signatures(db, [(job.id, sig)])
         return job
     except Exception as e:
         logger.warning("_upsert_job failed for title=%r company=%r: %s", j.get("title"), j.get("company"), e)
@@ -54,59 +81,180 @@ def _upsert_job(db: Session, j: dict, source: str) -> Job | None:
         return None
 
 
-def _get_user_resume_text(db: Session, user_id: int | None) -> str | None:
+def _job_key(j: dict) -> tuple[str, str]:
+    """Normalized (title, company) key, matching the unique index on jobs."""
+    return (j.get("title") or "").strip() or "Job", (j.get("company") or "").strip() or "Company"
+
+
+@timing.timed("upsert")
+def _bulk_upsert_jobs(db: Session, items: list[tuple[dict, str]]) -> list[int | None]:
+    """
+    Store many (job dict, source) pairs in one transaction: INSERT ... ON CONFLICT (title, company)
+    DO UPDATE ... RETURNING id. Returns job ids aligned with items (None where a row could not be stored).
+    Items that near-duplicate a stored job get that job's id; near-duplicates within the batch share one row,
+    so ids can repeat (see _first_per_job).
+    If the bulk statement fails (e.g. legacy DB without the unique index), falls back to _upsert_job per row
+    so one bad row does not drop the rest.
+    """
+    if not items:
+        return []
+    keys = [_job_key(j) for j, _ in items]
+    dup_ids: dict[tuple[str, str], int] = {}
+    batch_dupes = NearDuplicateIndex() if near_dedupe_enabled() else None
+    sigs: dict[tuple[str, str], tuple[int, ...]] = {}
+    stored_dupes: dict[tuple[str, str], int | None] = {}
+    if batch_dupes is not None:
+        locations: dict[tuple[str, str], str | None] = {}
+        for key, (j, _) in zip(keys, items):
+            if key not in sigs:
+                sigs[key] = signature(key[0], key[1], j.get("description"))
+                locations[key] = j.get("location")
+        stored_dupes = dict(zip(sigs, find_near_duplicates(db, [(key[0], locations[key], sig) for key, sig in sigs.items()])))
+    rows: dict[tuple[str, str], dict] = {}
+    for i, (key, (j, source)) in enumerate(zip(keys, items)):
+        if key in rows or key in dup_ids:
+            continue
+        if batch_dupes is not None:
+            stored_id = stored_dupes[key]
+            if stored_id is not None:
+                dup_ids[key] = stored_id
+                continue
+            earlier = batch_dupes.check_and_add(str(i), key[0], key[1], j.get("description"), j.get("location"), sigs[key])
+            if earlier is not None:
+                # Same posting as an earlier item in this batch: store it once, under the earlier key
+                keys[i] = keys[int(earlier)]
+                continue
+        rows[key] = {
+            "title": key[0],
+            "company": key[1],
+            "location": j.get("location"),
+            "location_id": location_id(j.get("location")),
+            "description": j.get("description") or None,
+            "apply_url": j.get("apply_url"),
+            "source": source,
+        }
+    if not rows:
+        return [dup_ids.get(key) for key in keys]
+    dialect = db.get_bind().dialect.name
+    insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+    if insert is not None:
+        try:
+            stmt = insert(Job).values(list(rows.values()))
+            # No-op update so RETURNING also yields ids of rows that already existed
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.title, Job.company],
+                set_={"title": stmt.excluded.title},
+            ).returning(Job.id, Job.title, Job.company)
+            ids = {(title, company): job_id for job_id, title, company in db.execute(stmt)}
+            db.commit()
+            store_signatures(db, [(ids[key], sigs[key]) for key in rows if key in ids and key in sigs])
+            ids.update(dup_ids)
+            return [ids.get(key) for key in keys]
+        except Exception as e:
+            logger.warning("_bulk_upsert_jobs: bulk insert of %d jobs failed, retrying per row: %s", len(rows), e)
+            db.rollback()
+    out: list[int | None] = []
+    for j, source in items:
+        job = _upsert_job(db, j, source, near_dupes=True)
+        out.append(job.id if job else None)
+    return out
+
+
+def _get_user_resume_profile(db: Session, user_id: int | None) -> ResumeProfile | None:
+    """Keyword profile of the user's latest resume (cached per resume version)."""
     if not user_id:
         return None
     r = db.query(Resume).filter(Resume.user_id == user_id).order_by(Resume.created_at.desc()).first()
-    return r.resume_text if r else None
+    return get_resume_profile(r.resume_text, resume_id=r.id, user_id=user_id) if r else None
+
+
+def _job_result(job: Job, salary: str | None = None, posted_date: str | None = None) -> dict:
+    """Search result fields (everything in JobSearchResultResponse except per-user match_score/reasons)."""
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "description": job.description,
+        "apply_url": job.apply_url,
+        "source": job.source,
+        "salary": salary,
+        "posted_date": posted_date,
+    }
+
+
+@timing.timed("score")
+def _score_jobs(db: Session, jobs: list[dict], user_id: int | None) -> list[JobSearchResultResponse]:
+    """Attach the user's match_score + reasons (latest resume vs job title/description) to search results."""
+    resume_profile = _get_user_resume_profile(db, user_id)
+    try:
+        matches = compute_match_batch(resume_profile, jobs)
+    except Exception as e:
+        logger.warning("compute_match_batch failed for %d jobs, scoring one by one: %s", len(jobs), e)
+        matches = []
+        for j in jobs:
+            try:
+                matches.append(compute_match(resume_profile, j["title"], j.get("description")))
+            except Exception as e:
+                logger.warning("compute_match failed for job id=%s: %s", j.get("id"), e)
+                matches.append((0.0, []))
+    return [
+        JobSearchResultResponse(**j, match_score=match_score, reasons=reasons)
+        for j, (match_score, reasons) in zip(jobs, matches)
+    ]
+
+
+def _json_job_result(j: dict, fallback_id: int) -> dict:
+    """Search result fields for a jobs.json entry."""
+    return {
+        "id": int(j.get("id") or fallback_id),
+        "title": (j.get("title") or "").strip() or "Job",
+        "company": (j.get("company") or "").strip() or "Company",
+        "location": j.get("location"),
+        "description": j.get("description"),
+        "apply_url": j.get("apply_url"),
+        "source": j.get("source"),
+        "salary": j.get("salary"),
+        "posted_date": j.get("posted_date"),
+    }
 
 
-def _job_search_from_json(db: Session, q: str, location: str, user_id: int | None) -> list[JobSearchResultResponse]:
-    """Load jobs from data/jobs.json, filter by q/location; if none match location, filter by query only so we still list jobs."""
+@timing.timed("json_search")
+def _job_search_from_json(q: str, location: str, radius_km: float | None = None) -> list[dict]:
+    """
+    Load jobs from data/jobs.json, filter by q/location; if none match location, filter by query only so we still list jobs.
+    With radius_km only jobs within that distance of location are returned (no query-only fallback).
+    """
     try:
-        all_jobs = load_jobs_from_json()
+        all_jobs, index = load_jobs_with_index()
     except Exception as e:
         logger.warning("job search: load from JSON failed: %s", e)
         return []
     if not all_jobs:
         return []
-    filtered = filter_jobs(all_jobs, q or "", location or "")
-    if not filtered:
+    filtered = filter_jobs(all_jobs, q or "", location or "", index=index, radius_km=radius_km)
+    if not filtered and not radius_km:
         # Still show jobs matching query only (maintain listing; location may vary)
-        filtered = filter_jobs_query_only(all_jobs, q or "")
+        filtered = filter_jobs_query_only(all_jobs, q or "", index=index)
     if not filtered:
         return []
-    resume_text = _get_user_resume_text(db, user_id)
-    out: list[JobSearchResultResponse] = []
-    for j in filtered:
-        try:
-            match_score, reasons = compute_match(
-                resume_text,
-                j.get("title") or "",
-                j.get("description") or "",
-            )
-        except Exception:
-            match_score, reasons = 0.0, []
-        out.append(
-            JobSearchResultResponse(
-                id=int(j.get("id") or len(out) + 1),
-                title=(j.get("title") or "").strip() or "Job",
-                company=(j.get("company") or "").strip() or "Company",
-                location=j.get("location"),
-                description=j.get("description"),
-                apply_url=j.get("apply_url"),
-                source=j.get("source"),
-                match_score=match_score,
-                reasons=reasons,
-                salary=j.get("salary"),
-                posted_date=j.get("posted_date"),
-            )
-        )
+    out = [_json_job_result(j, i + 1) for i, j in enumerate(filtered)]
     logger.info("job search: serving %d jobs from JSON", len(out))
     return out
 
 
-def _get_same_day_session_jobs(db: Session, q: str, location: str, user_id: int | None) -> list[JobSearchResultResponse] | None:
+@timing.timed("fts")
+def _job_search_from_db(db: Session, q: str, location: str, radius_km: float | None = None) -> list[dict]:
+    """Jobs stored by earlier searches that match q/location (FTS5, bm25-ranked); [] if fewer than JOB_DB_SEARCH_MIN_RESULTS."""
+    jobs = search_stored_jobs(db, q, location, radius_km=radius_km)
+    if len(jobs) < max(1, JOB_DB_SEARCH_MIN_RESULTS):
+        return []
+    logger.info("job search: serving %d stored jobs from full-text search", len(jobs))
+    return [_job_result(job) for job in jobs]
+
+
+@timing.timed("same_day")
+def _get_same_day_session_jobs(db: Session, q: str, location: str) -> list[dict] | None:
     """If a search_session exists for (q, location) today, return jobs from job_matches. Else None."""
     q_norm = (q or "").strip() or "Software Engineer"
     loc_norm = (location or "").strip()
@@ -125,36 +273,12 @@ def _get_same_day_session_jobs(db: Session, q: str, location: str, user_id: int
         if not session:
             return None
         matches = db.query(JobMatch).filter(JobMatch.search_session_id == session.id).all()
-        job_ids = [m.job_id for m in matches]
+        job_ids = list(dict.fromkeys(m.job_id for m in matches))
         if not job_ids:
             return None
         jobs = db.query(Job).filter(Job.id.in_(job_ids)).all()
         job_by_id = {j.id: j for j in jobs}
-        resume_text = _get_user_resume_text(db, user_id)
-        out: list[JobSearchResultResponse] = []
-        for jid in job_ids:
-            job = job_by_id.get(jid)
-            if not job:
-                continue
-            try:
-                match_score, reasons = compute_match(resume_text, job.title, job.description)
-            except Exception:
-                match_score, reasons = 0.0, []
-            out.append(
-                JobSearchResultResponse(
-                    id=job.id,
-                    title=job.title,
-                    company=job.company,
-                    location=job.location,
-                    description=job.description,
-                    apply_url=job.apply_url,
-                    source=job.source,
-                    match_score=match_score,
-                    reasons=reasons,
-                    salary=None,
-                    posted_date=None,
-                )
-            )
+        out = [_job_result(job_by_id[jid]) for jid in job_ids if jid in job_by_id]
         logger.info("job search: reusing same-day session, %d jobs", len(out))
         return out if out else None
     except Exception as e:
@@ -162,8 +286,10 @@ def _get_same_day_session_jobs(db: Session, q: str, location: str, user_id: int
         return None
 
 
+@timing.timed("session_save")
 def _save_search_session(db: Session, q: str, location: str, job_ids: list[int]) -> None:
-    """Create search_sessions and job_matches for reuse."""
+    """Create search_sessions and job_matches for reuse (each job once, in order)."""
+    job_ids = list(dict.fromkeys(job_ids))
     try:
         session = SearchSession(query=(q or "").strip() or "Software Engineer", location=(location or "").strip())
         db.add(session)
@@ -177,51 +303,55 @@ def _save_search_session(db: Session, q: str, location: str, job_ids: list[int])
         db.rollback()
 
 
-def _job_search_workflow(db: Session, q: str, location: str, user_id: int | None) -> list[JobSearchResultResponse]:
+def _first_per_job(results: list[dict], job_ids: list[int | None]) -> tuple[list[dict], list[int | None]]:
     """
-    1) Same-day reuse: if DB has search_sessions for (q, location) today, return those jobs (no scrape).
-    2) Else data/jobs.json (filter by q/location); if none, filter by query only; upsert and save session.
-    3) Else SerpAPI/Adzuna; upsert and save session.
-    4) If still no jobs, return dummy jobs. Location = user-entered (e.g. Berlin) so results match their search.
+    Results and their stored ids, keeping only the first result per id (near-duplicates were folded into
+    one row), in order. Results that could not be stored (None) are all kept.
     """
-    logger.info("job search start: q=%r location=%r user_id=%s", q, location, user_id)
-    q_norm = (q or "").strip() or "Software Engineer"
-    # Use the user's entered location as-is (e.g. Berlin → list jobs in Berlin); empty = no location filter
-    loc_norm = (location or "").strip()
+    seen: set[int] = set()
+    kept: list[tuple[dict, int | None]] = []
+    for r, jid in zip(results, job_ids):
+        if jid is not None:
+            if jid in seen:
+                continue
+            seen.add(jid)
+        kept.append((r, jid))
+    return [r for r, _ in kept], [jid for _, jid in kept]
 
+
+def _fetch_search_jobs(db: Session, q_norm: str, loc_norm: str, radius_km: float | None = None) -> list[dict]:
+    """
+    User-independent part of the search (steps 1-5 of _job_search_workflow): find jobs, store them,
+    record the search session. Returns result dicts without match scores.
+    Search sessions are keyed by (q, location) only, so radius searches neither reuse nor record them.
+    """
     # 1) Check DB for same-day search (no re-scrape)
-    from_db = _get_same_day_session_jobs(db, q_norm, loc_norm, user_id)
-    if from_db:
-        return from_db
+    if not radius_km:
+        from_db = _get_same_day_session_jobs(db, q_norm, loc_norm)
+        if from_db:
+            return from_db
 
     # 2) JSON first (real data with apply links)
-    from_json = _job_search_from_json(db, q_norm, loc_norm, user_id)
+    from_json = _job_search_from_json(q_norm, loc_norm, radius_km)
     if from_json:
         # Persist to DB and create session so same-day reuse works next time
-        job_ids_created: list[int] = []
-        for r in from_json:
-            job = _upsert_job(
-                db,
-                {
-                    "title": r.title,
-                    "company": r.company,
-                    "location": r.location,
-                    "description": r.description,
-                    "apply_url": r.apply_url,
-                    "salary": r.salary,
-                    "posted_date": r.posted_date,
-                },
-                r.source or "json",
-            )
-            if job:
-                job_ids_created.append(job.id)
-        if job_ids_created:
+        job_ids = _bulk_upsert_jobs(db, [(r, r["source"] or "json") for r in from_json])
+        from_json, job_ids = _first_per_job(from_json, job_ids)
+        job_ids_created = [jid for jid in job_ids if jid is not None]
+        if job_ids_created and not radius_km:
             _save_search_session(db, q_norm, loc_norm, job_ids_created)
         return from_json
 
-    # 3) Live API (SerpAPI/Adzuna)
+    # 3) Jobs stored by earlier searches (full-text search in the DB, no provider call)
+    from_db = _job_search_from_db(db, q_norm, loc_norm, radius_km)
+    if from_db:
+        if not radius_km:
+            _save_search_session(db, q_norm, loc_norm, [j["id"] for j in from_db])
+        return from_db
+
+    # 4) Live API (SerpAPI/Adzuna)
     try:
-        raw = search_jobs(q_norm, loc_norm)
+        raw = search_jobs(q_norm, loc_norm, radius_km)
     except Exception as e:
         logger.warning("search_jobs raised: %s; using dummy jobs", e)
         raw = []
@@ -239,64 +369,86 @@ def _job_search_workflow(db: Session, q: str, location: str, user_id: int | None
     source = "serpapi" if is_live else "mock"
     logger.info("job search: using %s, %d raw results", source, len(raw))
 
-    resume_text = _get_user_resume_text(db, user_id)
-    out: list[JobSearchResultResponse] = []
-    job_ids_for_session: list[int] = []
-    for i, j in enumerate(raw):
-        job = _upsert_job(db, j, source)
+    out: list[dict] = []
+    job_ids = _bulk_upsert_jobs(db, [(j, source) for j in raw])
+    raw, job_ids = _first_per_job(raw, job_ids)
+    stored = [jid for jid in job_ids if jid is not None]
+    job_by_id = {job.id: job for job in db.query(Job).filter(Job.id.in_(stored)).all()} if stored else {}
+    for i, (j, jid) in enumerate(zip(raw, job_ids)):
+        job = job_by_id.get(jid) if jid is not None else None
         if job is not None:
-            job_ids_for_session.append(job.id)
-            try:
-                match_score, reasons = compute_match(
-                    resume_text,
-                    job.title,
-                    job.description,
-                )
-            except Exception as e:
-                logger.warning("compute_match failed for job id=%s: %s", job.id, e)
-                match_score, reasons = 0.0, []
-            out.append(
-                JobSearchResultResponse(
-                    id=job.id,
-                    title=job.title,
-                    company=job.company,
-                    location=job.location,
-                    description=job.description,
-                    apply_url=job.apply_url,
-                    source=job.source,
-                    match_score=match_score,
-                    reasons=reasons,
-                    salary=j.get("salary"),
-                    posted_date=j.get("posted_date"),
-                )
-            )
+            out.append(_job_result(job, j.get("salary"), j.get("posted_date")))
         else:
             # DB upsert failed: still return job from raw so the UI shows results
-            try:
-                match_score, reasons = compute_match(
-                    resume_text,
-                    j.get("title") or "",
-                    j.get("description") or "",
-                )
-            except Exception:
-                match_score, reasons = 0.0, []
-            out.append(
-                JobSearchResultResponse(
-                    id=-(i + 1),  # synthetic id so Apply can create job via body.job
-                    title=(j.get("title") or "").strip() or "Job",
-                    company=(j.get("company") or "").strip() or "Company",
-                    location=j.get("location"),
-                    description=j.get("description"),
-                    apply_url=j.get("apply_url"),
-                    source=source,
-                    match_score=match_score,
-                    reasons=reasons,
-                    salary=j.get("salary"),
-                    posted_date=j.get("posted_date"),
-                )
-            )
-    if job_ids_for_session:
-        _save_search_session(db, q_norm, loc_norm, job_ids_for_session)
+            out.append({
+                "id": -(i + 1),  # synthetic id so Apply can create job via body.job
+                "title": (j.get("title") or "").strip() or "Job",
+                "company": (j.get("company") or "").strip() or "Company",
+                "location": j.get("location"),
+                "description": j.get("description"),
+                "apply_url": j.get("apply_url"),
+                "source": source,
+                "salary": j.get("salary"),
+                "posted_date": j.get("posted_date"),
+            })
+    if stored and not radius_km:
+        _save_search_session(db, q_norm, loc_norm, stored)
+    return out
+
+
+# Concurrent identical searches (same normalized q + location) share one fetch + DB write
+_search_flight = SingleFlight("job search")
+
+
+# Searches cached per normalized (q, location); stale entries are served while refreshed in the background.
+# Dummy results (every provider failed) are not cached, so the next search tries the providers again.
+_search_cache = SearchCache(
+    name="job search cache", cacheable=lambda jobs: not any(j.get("source") == "mock" for j in jobs),
+)
+
+
+def _search_key(q_norm: str, loc_norm: str, radius_km: float | None = None) -> tuple[str, str, float | None]:
+    return " ".join(q_norm.lower().split()), " ".join(loc_norm.lower().split()), radius_km
+
+
+def _refresh_search(q_norm: str, loc_norm: str, radius_km: float | None = None) -> list[dict]:
+    """Background revalidation of a cached search: own DB session, same single-flight as request-path fetches."""
+    db = get_db_session()
+    try:
+        return _search_flight.do(
+            _search_key(q_norm, loc_norm, radius_km), lambda: _fetch_search_jobs(db, q_norm, loc_norm, radius_km)
+        )
+    finally:
+        db.close()
+
+
+@timing.timed("job_search")
+def _job_search_workflow(
+    db: Session, q: str, location: str, user_id: int | None, radius_km: float | None = None,
+) -> list[JobSearchResultResponse]:
+    """
+    1) Same-day reuse: if DB has search_sessions for (q, location) today, return those jobs (no scrape).
+    2) Else data/jobs.json (filter by q/location); if none, filter by query only; upsert and save session.
+    3) Else jobs stored by earlier searches (FTS5 MATCH on the jobs table, ranked by bm25); save session.
+    4) Else SerpAPI/Adzuna; upsert and save session.
+    5) If still no jobs, return dummy jobs. Location = user-entered (e.g. Berlin) so results match their search.
+    Steps 1-5 are cached (stale-while-revalidate) and single-flight per (q, location, radius_km);
+    match scores are then computed per user. With radius_km (> 0) location filters become "within radius_km
+    of location" (geohash radius query; services/geo.py) when location is a known city.
+    """
+    logger.info("job search start: q=%r location=%r radius_km=%s user_id=%s", q, location, radius_km, user_id)
+    q_norm = (q or "").strip() or "Software Engineer"
+    # Use the user's entered location as-is (e.g. Berlin → list jobs in Berlin); empty = no location filter
+    loc_norm = (location or "").strip()
+
+    radius_km = radius_km if radius_km and radius_km > 0 else None
+    key = _search_key(q_norm, loc_norm, radius_km)
+    jobs = _search_cache.get_or_load(
+        key,
+        lambda: _search_flight.do(key, lambda: _fetch_search_jobs(db, q_norm, loc_norm, radius_km)),
+        refresh=lambda: _refresh_search(q_norm, loc_norm, radius_km),
+    )
+    out = _score_jobs(db, jobs, user_id)
     logger.info("job search done: returning %d jobs", len(out))
     return out
 
@@ -305,6 +457,7 @@ def _job_search_workflow(db: Session, q: str, location: str, user_id: int | None
 def jobs_search_get(
     q: str = "",
     location: str = "",
+    radius_km: float | None = None,
     db: Session = Depends(get_db),
     user: User | None = Depends(get_current_user_optional),
 ) -> list[JobSearchResultResponse]:
@@ -312,9 +465,10 @@ def jobs_search_get(
     Job Search & Discovery: GET /jobs/search.
     Backend fetches jobs via SerpAPI, normalizes, stores in DB, computes match_score per user, returns list with reasons.
     Optional auth: if logged in, match_score uses latest resume. Never raises: returns [] on failure.
+    radius_km: only jobs within this many km of location (when location is a known city).
     """
     try:
-        return _job_search_workflow(db, q, location, user.id if user else None)
+        return _job_search_workflow(db, q, location, user.id if user else None, radius_km)
     except Exception as e:
         logger.exception("jobs_search_get failed: %s", e)
         return []
@@ -331,12 +485,67 @@ def jobs_search_post(
         q = (body.job_title or "").strip() or "Software Engineer"
         # Use the user's entered location as-is (e.g. Berlin); empty = no location filter
         location = (body.location or "").strip()
-        return _job_search_workflow(db, q, location, user.id if user else None)
+        return _job_search_workflow(db, q, location, user.id if user else None, body.radius_km)
     except Exception as e:
         logger.exception("jobs_search_post failed: %s", e)
         return []
 
 
+# Keyword fallback for /recommend: the resume's most frequent keywords form the BM25 query
+_RECOMMEND_KEYWORD_TERMS = 20
+
+
+@router.get("/recommend", response_model=list[JobSearchResultResponse])
+def jobs_recommend(
+    limit: int = 20,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> list[JobSearchResultResponse]:
+    """
+    Jobs from data/jobs.json closest to the user's latest resume by offline semantic similarity
+    (services/semantic.py). match_score is the similarity (0-100); reasons add the keyword overlap.
+    Until the prebuilt semantic index is loaded (or without numpy), the best BM25 matches for the
+    resume's top keywords are returned with their keyword match scores. Returns [] without a resume or jobs.
+    """
+    r = db.query(Resume).filter(Resume.user_id == user.id).order_by(Resume.created_at.desc()).first()
+    if not r or not (r.resume_text or "").strip():
+        return []
+    k = max(1, min(limit, 100))
+    profile = get_resume_profile(r.resume_text, resume_id=r.id, user_id=user.id)
+    try:
+        all_jobs, job_index = load_jobs_with_index()
+        index = get_semantic_index(all_jobs)
+        if index is not None:
+            hits = index.search(r.resume_text, k)
+        else:
+            query = " ".join(word for word, _ in profile.counts.most_common(_RECOMMEND_KEYWORD_TERMS))
+            hits = [(pos, None) for pos in job_index.bm25.top_k(query, range(len(all_jobs)), k)]
+    except Exception as e:
+        logger.warning("jobs_recommend: recommendation search failed: %s", e)
+        return []
+    jobs = [_json_job_result(all_jobs[pos], pos + 1) for pos, _ in hits]
+    keyword_matches = compute_match_batch(profile, jobs)
+    if index is None:
+        return [
+            JobSearchResultResponse(**j, match_score=score, reasons=reasons)
+            for j, (score, reasons) in zip(jobs, keyword_matches)
+        ]
+    return [
+        JobSearchResultResponse(
+            **j,
+            match_score=round(max(similarity, 0.0) * 100, 1),
+            reasons=["Similar to your resume (semantic match)"] + reasons,
+        )
+        for j, (_, similarity), (_, reasons) in zip(jobs, hits, keyword_matches)
+    ]
+
+
+@router.get("/cache/stats")
+def jobs_cache_stats(user: User = Depends(get_current_user)):
+    """Search result cache counters: hits, misses, stale (served while refreshing), entries. Requires login."""
+    return _search_cache.stats()
+
+
 @router.get("/list", response_model=list[JobResponse])
 def jobs_list(db: Session = Depends(get_db), user: User = Depends(get_current_user)) -> list[JobResponse]:
     """Return jobs the user has an application (redirect/shortlist) for. Returns [] if none or on DB error."""
@@ -354,18 +563,10 @@ def jobs_list(db: Session = Depends(get_db), user: User = Depends(get_current_us
 
 @router.post("/save", response_model=JobResponse)
 def jobs_save(body: JobCreate, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    """Save a job to the database. Does not submit applications."""
-    job = Job(
-        title=body.title,
-        company=body.company,
-        location=body.location,
-        description=body.description,
-        apply_url=body.apply_url,
-        source=body.source,
-    )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
+    """Save a job to the database (existing row if title+company already stored). Does not submit applications."""
+    job = _upsert_job(db, body.model_dump(), body.source)
+    if job is None:
+        raise HTTPException(status_code=500, detail="Could not save job")
     return JobResponse.model_validate(job)
 
 
@@ -383,19 +584,11 @@ def jobs_action(
     job = db.query(Job).filter(Job.id == job_id).first()
 
     if not job and body.job:
-        # Mock search result: create job in DB then application
+        # Mock search result: create job in DB (or reuse title+company match) then application
         j = body.job
-        job = Job(
-            title=j.title,
-            company=j.company,
-            location=j.location,
-            description=j.description,
-            apply_url=j.apply_url,
-            source=j.source or "frontend",
-        )
-        db.add(job)
-        db.commit()
-        db.refresh(job)
+        job = _upsert_job(db, j.model_dump(), j.source or "frontend")
+        if job is None:
+            raise HTTPException(status_code=500, detail="Could not save job")
         job_id = job.id
     elif not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -23,7 +23,7 @@ from schemas.resume import (
 from routers.auth import get_current_user
 from models.user import User
 from services.resume_ai import improve_resume, generate_resume as ai_generate_resume, evaluate_resume as ai_evaluate_resume
-from services.job_match import compute_match
+from services.job_match import compute_match, invalidate_resume_profiles
 
 router = APIRouter()
 RESUME_AI_LIMITS = {"free": 2, "pro": 20, "premium": None}
@@ -40,6 +40,7 @@ def resume_save(body: ResumeCreate, db: Session = Depends(get_db), user: User =
     db.add(r)
     db.commit()
     db.refresh(r)
+    invalidate_resume_profiles(user.id)
     return ResumeResponse.model_validate(r)
 
 
@@ -70,6 +71,7 @@ async def resume_upload(
     db.add(r)
     db.commit()
     db.refresh(r)
+    invalidate_resume_profiles(user.id)
     return {"ok": True, "filename": file.filename}
 
 
@@ -117,6 +119,7 @@ def resume_improve(
     db.add(r)
     db.commit()
     db.refresh(r)
+    invalidate_resume_profiles(user.id)
 
     month = datetime.utcnow().strftime("%Y-%m")
     usage_row = (
@@ -215,6 +218,7 @@ def resume_evaluate(
         db.add(r)
         db.commit()
         db.refresh(r)
+        invalidate_resume_profiles(user.id)
         resume_id = r.id
     return ResumeEvaluateResponse(
         overall_score=result.get("overall_score", 0),
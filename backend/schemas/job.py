@@ -11,6 +11,8 @@ class JobSearchBody(BaseModel):
     job_title: str | None = None
     location: str | None = None
     remote: bool | None = None
+    # Only jobs within this many km of location (when location is a known city)
+    radius_km: float | None = None
 
 
 class JobCreate(BaseModel):
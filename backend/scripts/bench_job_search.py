@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmark the job search workflow stage by stage as the corpus and database grow.
+Run from repo root:
+  python backend/scripts/bench_job_search.py [--sizes 10000,100000,1000000] [--queries 200] [--out bench.json]
+
+For each size, synthetic data is generated once into --data-dir/<size> (scripts/synth_data.py; --regenerate
+to redo it) and every run works on a fresh copy of its database. Each size runs in its own process so peak
+RSS is per size. Per query the stages of _fetch_search_jobs + _job_search_workflow are timed separately:
+same-day lookup, JSON load, filter_jobs, upsert, session save, compute_match (resume profile + batch
+scoring), serialization (response models -> JSON). The search cache and single-flight are bypassed, so every
+query pays every stage. One-off costs (cold corpus load, near-duplicate index build) are reported as setup.
+
+Output is JSON: per size, count/mean/p50/p95/p99/max in milliseconds per stage, setup timings and peak RSS,
+plus run metadata (git commit, Python, CPU count, relevant env), so runs can be diffed.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add backend to path so we can import from services
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+STAGES = ["same_day_lookup", "json_load", "filter_jobs", "upsert", "session_save", "compute_match", "serialization"]
+# Env settings that change what is measured; recorded with every run
+_ENV_KEYS = ["JOB_STORE", "JOB_CORPUS_BINARY", "JOB_FILTER_MODE", "JOB_RANKING_ENGINE", "JOB_DEDUPE_MODE",
+             "JOB_DB_SEARCH"]
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(p / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: list[float]) -> dict:
+    """Timing samples (seconds) -> stats in milliseconds."""
+    values = sorted(s * 1000.0 for s in samples)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def run_size(size: int, queries: int, seed: int) -> dict:
+    """Child process: time every stage for `queries` searches against the data in JOB_DATA_DIR / DATABASE_URL."""
+    from pydantic import TypeAdapter
+
+    from db import SessionLocal, ensure_tables
+    from models.user import User
+    from routers.jobs import (
+        _bulk_upsert_jobs, _get_same_day_session_jobs, _get_user_resume_profile, _json_job_result,
+        _save_search_session,
+    )
+    from schemas.job import JobSearchResultResponse
+    from services.job_match import compute_match_batch
+    from services.job_signatures import backfill_signatures
+    from services.job_storage import filter_jobs, filter_jobs_query_only, load_jobs_with_index
+    from synth_data import LOCATIONS, ROLES, SKILLS
+
+    ensure_tables()
+    db = SessionLocal()
+    setup: dict[str, float] = {}
+    started = time.perf_counter()
+    all_jobs, _ = load_jobs_with_index()
+    setup["json_load_cold_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+    started = time.perf_counter()
+    backfill_signatures()
+    setup["dedupe_signature_backfill_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+    setup["rss_after_setup_mb"] = peak_rss_mb()
+    user_ids = [uid for (uid,) in db.query(User.id)]
+    serializer = TypeAdapter(list[JobSearchResultResponse])
+
+    rng = random.Random(seed)
+    timings: dict[str, list[float]] = {name: [] for name in STAGES + ["total"]}
+    history: list[tuple[str, str]] = []
+    same_day_hits = 0
+    results_total = 0
+    for _ in range(queries):
+        if history and rng.random() < 0.25:
+            # Repeat an earlier search so same-day reuse is exercised too
+            q, loc = rng.choice(history)
+        else:
+            q = rng.choice([rng.choice(ROLES), rng.choice(SKILLS), f"{rng.choice(SKILLS)} {rng.choice(ROLES).split()[-1]}"])
+            loc = rng.choice(LOCATIONS + [""])
+            history.append((q, loc))
+        t0 = time.perf_counter()
+        if _get_same_day_session_jobs(db, q, loc):
+            same_day_hits += 1
+        t1 = time.perf_counter()
+        jobs, index = load_jobs_with_index()
+        t2 = time.perf_counter()
+        filtered = filter_jobs(jobs, q, loc, index=index) or filter_jobs_query_only(jobs, q, index=index)
+        results = [_json_job_result(j, i + 1) for i, j in enumerate(filtered)]
+        t3 = time.perf_counter()
+        job_ids = _bulk_upsert_jobs(db, [(r, r["source"] or "json") for r in results])
+        t4 = time.perf_counter()
+        stored = [jid for jid in job_ids if jid is not None]
+        if stored:
+            _save_search_session(db, q, loc, stored)
+        t5 = time.perf_counter()
+        profile = _get_user_resume_profile(db, rng.choice(user_ids) if user_ids else None)
+        matches = compute_match_batch(profile, results)
+        t6 = time.perf_counter()
+        serializer.dump_json([
+            JobSearchResultResponse(**r, match_score=score, reasons=reasons) for r, (score, reasons) in zip(results, matches)
+        ])
+        t7 = time.perf_counter()
+
+        laps = dict(zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4, t6 - t5, t7 - t6)))
+        laps["total"] = t7 - t0
+        for name, seconds in laps.items():
+            timings[name].append(seconds)
+        results_total += len(results)
+    db.close()
+    return {
+        "size": size,
+        "corpus_jobs": len(all_jobs),
+        "queries": queries,
+        "same_day_hits": same_day_hits,
+        "mean_results": round(results_total / queries, 1) if queries else 0.0,
+        "setup": setup,
+        "stages": {name: summarize(samples) for name, samples in timings.items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_backend, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_summary(run: dict) -> None:
+    print(f"\n{run['size']} jobs: {run['queries']} queries, {run['same_day_hits']} same-day hits, "
+          f"peak RSS {run['peak_rss_mb']} MB, cold load {run['setup']['json_load_cold_ms']:.0f} ms, "
+          f"signature backfill {run['setup']['dedupe_signature_backfill_ms']:.0f} ms", file=sys.stderr)
+    print(f"  {'stage':<16} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}", file=sys.stderr)
+    for name, s in run["stages"].items():
+        print(f"  {name:<16} {s['p50_ms']:>10.2f} {s['p95_ms']:>10.2f} {s['p99_ms']:>10.2f} {s['max_ms']:>10.2f}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stage-by-stage job search benchmark at corpus scale")
+    parser.add_argument("--sizes", default="10000,100000", help="comma-separated corpus sizes (jobs)")
+    parser.add_argument("--queries", type=int, default=200, help="searches per size")
+    parser.add_argument("--users", type=int, default=100, help="users with resumes in the generated database")
+    parser.add_argument("--data-dir", default="/tmp/pathpilot-bench", help="generated data, one subdirectory per size")
+    parser.add_argument("--regenerate", action="store_true", help="regenerate data even if it exists")
+    parser.add_argument("--binary", action="store_true", help="generate jobs.bin too (memory-mapped corpus)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_size(args.child, args.queries, args.seed)))
+        return
+
+    runs = []
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        data = Path(args.data_dir) / str(size)
+        if args.regenerate or not (data / "jobs.json").exists() or not (data / "pathpilot.db").exists():
+            cmd = [sys.executable, str(_backend / "scripts" / "synth_data.py"), "--jobs", str(size),
+                   "--users", str(args.users), "--out", str(data), "--seed", str(args.seed)]
+            subprocess.run(cmd + (["--binary"] if args.binary else []), check=True, stdout=sys.stderr)
+        # Every run starts from the generated database, not from the previous run's sessions and upserts
+        run_db = data / "bench-run.db"
+        shutil.copyfile(data / "pathpilot.db", run_db)
+        env = dict(os.environ, JOB_DATA_DIR=str(data.resolve()), DATABASE_URL=f"sqlite:///{run_db.resolve()}")
+        print(f"Benchmarking {size} jobs ({args.queries} queries)", file=sys.stderr)
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", str(size), "--queries", str(args.queries), "--seed", str(args.seed)],
+            env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr)
+            sys.exit(f"benchmark for {size} jobs failed")
+        run = json.loads(proc.stdout.strip().splitlines()[-1])
+        _print_summary(run)
+        runs.append(run)
+
+    report = {
+        "benchmark": "job_search",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "env": {key: os.environ[key] for key in _ENV_KEYS if key in os.environ},
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+        print(f"\nWrote {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
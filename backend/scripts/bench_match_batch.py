@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark compute_match_batch (resume vs job keyword scoring) on synthetic search results.
+Run from repo root:
+  python backend/scripts/bench_match_batch.py [--sizes 100,2000] [--repeat 20]
+
+For each size, N jobs from scripts/synth_data.py are scored against a synthetic resume. "cold" clears the
+job keyword cache before every run (first time these jobs are seen); "warm" scores the same result list
+again (a repeated or cached search). Prints the median seconds per call.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path so we can import from services
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+
+def _median_seconds(fn, repeat: int, before=None) -> float:
+    samples = []
+    for _ in range(repeat):
+        if before:
+            before()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="compute_match_batch benchmark")
+    parser.add_argument("--sizes", default="100,2000", help="comma-separated result list sizes (jobs)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from services.job_match import ResumeProfile, _job_keywords, compute_match_batch
+    from synth_data import generate_jobs, resume_text
+
+    profile = ResumeProfile(resume_text(random.Random(args.seed)))
+    print(f"{'jobs':>6} {'cold s':>10} {'warm s':>10}")
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        jobs = list(generate_jobs(size, args.seed))
+        cold = _median_seconds(lambda: compute_match_batch(profile, jobs), args.repeat, before=_job_keywords.cache_clear)
+        compute_match_batch(profile, jobs)
+        warm = _median_seconds(lambda: compute_match_batch(profile, jobs), args.repeat)
+        print(f"{size:>6} {cold:>10.4f} {warm:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Build backend/data/jobs.bin: the memory-mapped columnar job corpus (services/job_corpus.py) with its
+search index, from the current jobs.json / jobs.jsonl. The API maps it instead of parsing the file
+for as long as the file is unchanged.
+Run from repo root: python backend/scripts/build_job_corpus.py [--no-compress]
+fetch_jobs_to_json.py runs this step itself after saving.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path so we can import from services
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+_env = _backend / ".env"
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_env)
+except ImportError:
+    pass
+
+from services.job_corpus import JobCorpus, zstd_available
+from services.job_storage import build_binary_corpus, get_jobs_path
+
+
+def main():
+    compress = "--no-compress" not in sys.argv[1:]
+    if compress and not zstd_available():
+        print("zstandard is not installed; descriptions are stored uncompressed (pip install zstandard)")
+    started = time.perf_counter()
+    path = build_binary_corpus(compress=compress)
+    corpus = JobCorpus(path)
+    print(
+        f"Wrote {len(corpus)} jobs from {get_jobs_path()} to {path} "
+        f"({path.stat().st_size / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
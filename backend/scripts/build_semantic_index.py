@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Build the offline semantic job index (services/semantic.py) from backend/data/jobs.json
+and save it to backend/data/semantic_index.npz (or SEMANTIC_INDEX_PATH).
+Run from repo root: python backend/scripts/build_semantic_index.py
+fetch_jobs_to_json.py runs this step itself after saving jobs.json.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path so we can import from services
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+_env = _backend / ".env"
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_env)
+except ImportError:
+    pass
+
+from services.job_storage import load_jobs_from_json, get_jobs_path
+from services.semantic import SEMANTIC_INDEX_PATH, build_semantic_index, semantic_available
+
+
+def main():
+    if not semantic_available():
+        print("numpy is not installed (pip install numpy); cannot build the semantic index")
+        sys.exit(1)
+    jobs = load_jobs_from_json()
+    if not jobs:
+        print(f"No jobs in {get_jobs_path()}. Run scripts/fetch_jobs_to_json.py first.")
+        sys.exit(1)
+    started = time.perf_counter()
+    index = build_semantic_index(jobs)
+    print(
+        f"Indexed {len(jobs)} jobs ({index.components.shape[0]} dims, {len(index.centroids)} lists) "
+        f"in {time.perf_counter() - started:.1f}s -> {SEMANTIC_INDEX_PATH}"
+    )
+
+
+if __name__ == "__main__":
+    main()
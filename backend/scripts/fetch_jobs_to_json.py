@@ -3,9 +3,27 @@
 Fetch jobs using SerpAPI or Adzuna (from .env) and save to backend/data/jobs.json.
 Run from repo root: python backend/scripts/fetch_jobs_to_json.py
 Or from backend: python scripts/fetch_jobs_to_json.py (after setting PYTHONPATH or installing).
+With --append, existing jobs are kept and new ones are checked against them (exact and near-duplicate).
+
+Searches and company fetches run concurrently (FETCH_WORKERS threads). Each provider has its own
+token-bucket rate limit and in-flight cap (FETCH_RATE_<PROVIDER>, FETCH_CONCURRENCY_<PROVIDER>);
+429s, 5xx and network errors are retried with exponential backoff (FETCH_MAX_RETRIES).
+Results are merged in list order, so jobs.json does not depend on which request finished first.
+
+With --paginate, SerpAPI searches follow next_page_token and Indeed companies follow next_start
+(SERPAPI_MAX_PAGES / SERPAPI_MAX_RESULTS, RAPIDAPI_MAX_PAGES / RAPIDAPI_MAX_RESULTS). Pages stream in
+from every task at once and jobs are added as they arrive, so their order in jobs.json (and which of
+two duplicates is kept) depends on timing.
 """
+import itertools
+import os
+import random
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Iterator
 
 # Add backend to path so we can import from services
 _backend = Path(__file__).resolve().parent.parent
@@ -20,9 +38,16 @@ try:
 except ImportError:
     pass
 
-from services.serpapi import search_jobs
-from services.job_storage import save_jobs_to_json, load_jobs_from_json, get_jobs_path
-from services.rapidapi_indeed import fetch_company_jobs
+from services.serpapi import (
+    SERPAPI_MAX_PAGES, SERPAPI_MAX_RESULTS, provider_order, search_jobs_mock, search_provider, serpapi_page,
+)
+from services.job_storage import save_jobs_to_json, load_jobs_from_json, get_jobs_path, build_binary_corpus
+from services.rapidapi_indeed import RAPIDAPI_MAX_PAGES, RAPIDAPI_MAX_RESULTS, fetch_company_jobs, fetch_company_jobs_page
+from services.pagination import follow_pages, stream_merged
+from services.dedupe import DEDUPE_INDEX_PATH, NearDuplicateIndex, near_dedupe_enabled
+from services.semantic import SEMANTIC_INDEX_PATH, build_semantic_index, semantic_available
+from services.rate_limit import ProviderLimiter
+from services.gazetteer import geocode, location_id
 
 
 # (query, location) pairs to fetch. Uses SerpAPI first, then Adzuna, then mock.
@@ -36,54 +61,271 @@ SEARCH_PAIRS = [
 
 # Companies to fetch from RapidAPI Indeed (additional source).
 INDEED_COMPANIES = ["Ubisoft", "Google", "Microsoft", "Amazon", "Meta", "Apple", "Netflix"]
+INDEED_LOCALITY = "us"
 
+# Worker threads for the whole pipeline
+FETCH_WORKERS = int(os.environ.get("FETCH_WORKERS") or "8")
+# Retries per request after a 429, 5xx or network error; backoff doubles from FETCH_BACKOFF_BASE seconds
+FETCH_MAX_RETRIES = int(os.environ.get("FETCH_MAX_RETRIES") or "3")
+FETCH_BACKOFF_BASE = float(os.environ.get("FETCH_BACKOFF_BASE") or "1")
+# Default (requests/second, max in flight) per provider; override with FETCH_RATE_<NAME> / FETCH_CONCURRENCY_<NAME>
+PROVIDER_LIMITS = {
+    "serpapi": (1.0, 2),
+    "adzuna": (2.0, 4),
+    "rapidapi": (2.0, 4),
+}
 
-def _add_job(all_jobs: list[dict], seen: set, j: dict, source: str = "api") -> None:
+
+def _add_job(
+    all_jobs: list[dict], seen: set, j: dict, ids: Iterator[int], source: str = "api", near_dupes: NearDuplicateIndex | None = None,
+) -> None:
     title = (j.get("title") or "").strip()
     company = (j.get("company") or "").strip()
     key = (title.lower(), company.lower())
     if key in seen:
         return
+    description = (j.get("description") or "")[:1000]
+    job_id = next(ids)
+    # Same posting from another provider (reworded title, different whitespace or truncation)
+    if near_dupes is not None and near_dupes.check_and_add(str(job_id), title, company, description, j.get("location")):
+        return
     seen.add(key)
     all_jobs.append({
-        "id": len(all_jobs) + 1,
+        "id": job_id,
         "title": title or "Job",
         "company": company or "Company",
         "location": j.get("location"),
-        "description": (j.get("description") or "")[:1000],
+        "location_id": location_id(j.get("location")),
+        "description": description,
         "apply_url": j.get("apply_url") or "",
         "salary": j.get("salary"),
         "posted_date": j.get("posted_date"),
         "source": source,
     })
+    # Coordinates for radius search: the provider's (Adzuna), else the gazetteer city's
+    lat, lon = j.get("latitude"), j.get("longitude")
+    coords = (lat, lon) if isinstance(lat, (int, float)) and isinstance(lon, (int, float)) else geocode(j.get("location"))
+    if coords:
+        all_jobs[-1]["latitude"], all_jobs[-1]["longitude"] = coords
+
+
+def _load_existing(near_dupes: NearDuplicateIndex | None) -> tuple[list[dict], NearDuplicateIndex | None]:
+    """Jobs already in jobs.json, for --append, plus the saved near-duplicate index (rebuilt if it does not cover them)."""
+    existing = [dict(j) for j in load_jobs_from_json()]
+    for j in existing:
+        # Jobs saved before location ids existed
+        if "location_id" not in j:
+            j["location_id"] = location_id(j.get("location"))
+    if near_dupes is not None and len(near_dupes) != len(existing):
+        print(f"Near-duplicate index has {len(near_dupes)} jobs, jobs.json {len(existing)}; rebuilding it")
+        near_dupes = NearDuplicateIndex()
+        for j in existing:
+            near_dupes.add(str(j.get("id")), j.get("title") or "", j.get("company") or "", j.get("description"), j.get("location"))
+    return existing, near_dupes
+
+
+def _limiters() -> dict[str, ProviderLimiter]:
+    limiters = {}
+    for name, (rate, concurrency) in PROVIDER_LIMITS.items():
+        rate = float(os.environ.get(f"FETCH_RATE_{name.upper()}") or rate)
+        concurrency = int(os.environ.get(f"FETCH_CONCURRENCY_{name.upper()}") or concurrency)
+        limiters[name] = ProviderLimiter(name, rate, max_concurrency=concurrency)
+    return limiters
+
+
+def _retry_after(e: Exception) -> float | None:
+    """Seconds from a Retry-After header on an HTTP error, if any."""
+    response = getattr(e, "response", None)
+    try:
+        return float(response.headers.get("Retry-After")) if response is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(e: Exception) -> bool:
+    response = getattr(e, "response", None)
+    if response is not None:
+        return response.status_code == 429 or response.status_code >= 500
+    return True  # timeouts, connection errors
+
+
+def _with_retries(limiter: ProviderLimiter, label: str, fetch):
+    """Run fetch() under the provider's rate limit; retry retryable failures with jittered exponential backoff."""
+    for attempt in range(FETCH_MAX_RETRIES + 1):
+        try:
+            with limiter.request():
+                return fetch()
+        except Exception as e:
+            if attempt >= FETCH_MAX_RETRIES or not _is_retryable(e):
+                raise
+            retry_after = _retry_after(e)
+            if retry_after:
+                limiter.bucket.penalize(retry_after)
+            delay = retry_after or FETCH_BACKOFF_BASE * (2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"  retry {attempt + 1}/{FETCH_MAX_RETRIES} for {label} in {delay:.1f}s ({e})")
+            time.sleep(delay)
+
+
+def _fetch_search(limiters: dict[str, ProviderLimiter], q: str, loc: str) -> list[tuple[dict, str]]:
+    """SerpAPI first, then Adzuna (JOB_PROVIDER_ORDER), then mock: same fallback as search_jobs."""
+    for name in provider_order():
+        try:
+            raw = _with_retries(limiters[name], f"{name} q={q!r} location={loc!r}", lambda: search_provider(name, q, loc, raise_errors=True))
+        except Exception as e:
+            print(f"  {name} failed for q={q!r} location={loc!r}: {e}")
+            continue
+        if raw:
+            return [(j, _search_source(j)) for j in raw]
+    return [(j, _search_source(j)) for j in search_jobs_mock(q, loc)]
+
+
+def _search_source(j: dict) -> str:
+    apply_url = j.get("apply_url") or ""
+    return "serpapi" if apply_url.startswith("http") and "example.com" not in apply_url else "api"
+
+
+def _fetch_company(limiters: dict[str, ProviderLimiter], company: str, locality: str) -> list[tuple[dict, str]]:
+    raw = _with_retries(
+        limiters["rapidapi"],
+        f"Indeed company={company!r}",
+        lambda: fetch_company_jobs(company, locality=locality, start=1, raise_errors=True),
+    )
+    return [(j, "indeed") for j in raw]
+
+
+def _stream_search(limiters: dict[str, ProviderLimiter], q: str, loc: str):
+    """(job, source) as pages arrive: SerpAPI pages, else the next provider's single page, else mock."""
+    for name in provider_order():
+        label = f"{name} q={q!r} location={loc!r}"
+        count = 0
+        try:
+            if name == "serpapi":
+                pages = follow_pages(
+                    lambda token: _with_retries(
+                        limiters[name], label, lambda: serpapi_page(q, loc, page_token=token, raise_errors=True)
+                    ),
+                    max_pages=SERPAPI_MAX_PAGES,
+                    max_results=SERPAPI_MAX_RESULTS,
+                )
+            else:
+                pages = _with_retries(limiters[name], label, lambda: search_provider(name, q, loc, raise_errors=True))
+            for j in pages:
+                yield j, _search_source(j)
+                count += 1
+        except Exception as e:
+            # Keep the pages already streamed; only fall back if the provider gave nothing
+            print(f"  {name} failed for q={q!r} location={loc!r} after {count} results: {e}")
+        if count:
+            return
+    for j in search_jobs_mock(q, loc):
+        yield j, _search_source(j)
+
+
+def _stream_company(limiters: dict[str, ProviderLimiter], company: str, locality: str):
+    pages = follow_pages(
+        lambda start: _with_retries(
+            limiters["rapidapi"],
+            f"Indeed company={company!r} start={start or 1}",
+            lambda: fetch_company_jobs_page(company, locality=locality, start=start or 1, raise_errors=True),
+        ),
+        max_pages=RAPIDAPI_MAX_PAGES,
+        max_results=RAPIDAPI_MAX_RESULTS,
+    )
+    for j in pages:
+        yield j, "indeed"
+
+
+class _Progress:
+    """Thread-safe running totals, printed as each task finishes."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.results = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def task_done(self, label: str, count: int, error: Exception | None = None) -> None:
+        with self._lock:
+            self.done += 1
+            self.results += count
+            self.failed += error is not None
+            elapsed = time.monotonic() - self.started
+            rate = self.done / elapsed if elapsed > 0 else 0.0
+            eta = (self.total - self.done) / rate if rate else 0.0
+            outcome = f"failed ({error})" if error is not None else f"{count} results" if count else "No results"
+            print(
+                f"[{self.done}/{self.total}] {label}: {outcome} | {self.results} results, {self.failed} failed, "
+                f"{rate:.1f} tasks/s, ETA {eta:.0f}s"
+            )
+
+
+def _fetch_all() -> list[list[tuple[dict, str]]]:
+    """Run every search pair and Indeed company concurrently; (job, source) lists in task order."""
+    limiters = _limiters()
+    # (label, fetch) per task: search pairs first, then RapidAPI Indeed companies (additional source)
+    tasks = [
+        (f"q={q!r} location={loc!r}", lambda q=q, loc=loc: _fetch_search(limiters, q, loc))
+        for q, loc in SEARCH_PAIRS
+    ] + [
+        (f"Indeed company={c!r} locality={INDEED_LOCALITY!r}", lambda c=c: _fetch_company(limiters, c, INDEED_LOCALITY))
+        for c in INDEED_COMPANIES
+    ]
+    progress = _Progress(len(tasks))
+    results: list[list[tuple[dict, str]]] = [[] for _ in tasks]
+    print(f"Fetching {len(tasks)} searches/companies with {FETCH_WORKERS} workers")
+    with ThreadPoolExecutor(max_workers=max(1, FETCH_WORKERS), thread_name_prefix="fetch") as pool:
+        futures = {pool.submit(fetch): i for i, (_, fetch) in enumerate(tasks)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+                progress.task_done(tasks[i][0], len(results[i]))
+            except Exception as e:
+                progress.task_done(tasks[i][0], 0, e)
+    return results
+
+
+def _stream_all():
+    """(job, source) from every search pair and Indeed company, paginated, as pages arrive."""
+    limiters = _limiters()
+    labels = [f"q={q!r} location={loc!r}" for q, loc in SEARCH_PAIRS]
+    streams = [lambda q=q, loc=loc: _stream_search(limiters, q, loc) for q, loc in SEARCH_PAIRS]
+    labels += [f"Indeed company={c!r} locality={INDEED_LOCALITY!r}" for c in INDEED_COMPANIES]
+    streams += [lambda c=c: _stream_company(limiters, c, INDEED_LOCALITY) for c in INDEED_COMPANIES]
+    progress = _Progress(len(streams))
+    print(f"Streaming {len(streams)} paginated searches/companies with {FETCH_WORKERS} workers")
+    on_done = lambda i, count, error: progress.task_done(labels[i], count, error)
+    for _, item in stream_merged(streams, max_workers=FETCH_WORKERS, on_done=on_done):
+        yield item
 
 
 def main():
-    seen: set[tuple[str, str]] = set()  # (title.lower(), company.lower()) for dedupe
+    append = "--append" in sys.argv[1:]
+    paginate = "--paginate" in sys.argv[1:]
+    near_dupes = None
+    if near_dedupe_enabled():
+        near_dupes = NearDuplicateIndex.load() if append else NearDuplicateIndex()
     all_jobs: list[dict] = []
+    if append:
+        all_jobs, near_dupes = _load_existing(near_dupes)
+    # (title.lower(), company.lower()) for dedupe
+    seen: set[tuple[str, str]] = {((j.get("title") or "").lower(), (j.get("company") or "").lower()) for j in all_jobs}
+    if append:
+        print(f"Appending to {len(all_jobs)} existing jobs")
+    existing_count = len(all_jobs)
+    # New ids continue after the largest existing one (jobs may have been dropped or deduped, so not len + 1)
+    ids = itertools.count(max((j["id"] for j in all_jobs if isinstance(j.get("id"), int)), default=0) + 1)
 
-    for q, loc in SEARCH_PAIRS:
-        print(f"Fetching: q={q!r} location={loc!r}")
-        raw = search_jobs(q, loc)
-        for j in raw:
-            source = "serpapi" if (j.get("apply_url") or "").startswith("http") and "example.com" not in (j.get("apply_url") or "") else "api"
-            _add_job(all_jobs, seen, j, source=source)
-        if not raw:
-            print("  No results")
-        else:
-            print(f"  Got {len(raw)} results, total unique so far: {len(all_jobs)}")
-
-    # RapidAPI Indeed: company jobs (additional source)
-    locality = "us"
-    for company in INDEED_COMPANIES:
-        print(f"Fetching Indeed: company={company!r} locality={locality!r}")
-        raw = fetch_company_jobs(company, locality=locality, start=1)
-        for j in raw:
-            _add_job(all_jobs, seen, j, source="indeed")
-        if not raw:
-            print("  No results")
-        else:
-            print(f"  Got {len(raw)} results, total unique so far: {len(all_jobs)}")
+    if paginate:
+        for j, source in _stream_all():
+            _add_job(all_jobs, seen, j, ids, source=source, near_dupes=near_dupes)
+    else:
+        for items in _fetch_all():
+            for j, source in items:
+                _add_job(all_jobs, seen, j, ids, source=source, near_dupes=near_dupes)
+    print(f"{len(all_jobs) - existing_count} new unique jobs")
 
     if not all_jobs:
         print("No jobs collected. Check SERPAPI_KEY, ADZUNA_APP_ID/ADZUNA_APP_KEY, or RAPIDAPI_KEY in backend/.env")
@@ -92,9 +334,18 @@ def main():
     path = get_jobs_path()
     save_jobs_to_json(all_jobs)
     print(f"Saved {len(all_jobs)} jobs to {path}")
+    if near_dupes is not None:
+        near_dupes.save()
+        print(f"Saved near-duplicate index ({len(near_dupes)} jobs) -> {DEDUPE_INDEX_PATH}")
+    # Binary corpus the API memory-maps instead of parsing the file
+    print(f"Built binary corpus -> {build_binary_corpus()}")
     # Verify
     loaded = load_jobs_from_json()
     print(f"Verified: {len(loaded)} jobs in file.")
+    # Semantic index is built at ingest so the API loads it instead of building on first request
+    if semantic_available():
+        build_semantic_index(loaded)
+        print(f"Built semantic index -> {SEMANTIC_INDEX_PATH}")
 
 
 if __name__ == "__main__":
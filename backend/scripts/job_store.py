@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Manage the append-only JSONL job store (backend/data/jobs.jsonl + jobs.jsonl.idx).
+Run from repo root:
+  python backend/scripts/job_store.py migrate [--force]   # jobs.json -> jobs.jsonl (the API then reads jobs.jsonl)
+  python backend/scripts/job_store.py compact             # drop superseded/deleted lines
+  python backend/scripts/job_store.py stats
+  python backend/scripts/job_store.py get ID              # read one job by offset
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add backend to path so we can import from services
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+_env = _backend / ".env"
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_env)
+except ImportError:
+    pass
+
+from services.job_storage import JOBS_JSON_PATH, JOBS_JSONL_PATH, get_jsonl_store
+
+
+def migrate(force: bool) -> None:
+    store = get_jsonl_store()
+    if JOBS_JSONL_PATH.exists() and not force:
+        print(f"{JOBS_JSONL_PATH} already exists; use --force to merge {JOBS_JSON_PATH} into it")
+        sys.exit(1)
+    if not JOBS_JSON_PATH.exists():
+        print(f"No {JOBS_JSON_PATH} to migrate")
+        sys.exit(1)
+    count = store.migrate_from_json(JOBS_JSON_PATH)
+    print(f"Migrated {count} jobs from {JOBS_JSON_PATH} -> {JOBS_JSONL_PATH}")
+    print(f"{JOBS_JSON_PATH} is left in place; with JOB_STORE=auto (default) the API now reads {JOBS_JSONL_PATH.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONL job store maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_migrate = sub.add_parser("migrate", help="convert data/jobs.json to data/jobs.jsonl")
+    p_migrate.add_argument("--force", action="store_true", help="merge into an existing jobs.jsonl")
+    sub.add_parser("compact", help="rewrite jobs.jsonl with only the latest version of each live job")
+    sub.add_parser("stats", help="live jobs, lines and bytes")
+    p_get = sub.add_parser("get", help="print one job")
+    p_get.add_argument("id", type=int)
+    args = parser.parse_args()
+
+    store = get_jsonl_store()
+    if args.command == "migrate":
+        migrate(args.force)
+    elif args.command == "compact":
+        before, after = store.compact()
+        print(f"Compacted {JOBS_JSONL_PATH}: {before} -> {after} bytes")
+    elif args.command == "stats":
+        print(json.dumps(store.stats(), indent=2))
+    elif args.command == "get":
+        job = store.get(args.id)
+        if job is None:
+            print(f"No job with id {args.id}")
+            sys.exit(1)
+        print(json.dumps(job, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
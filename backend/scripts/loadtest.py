@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+HTTP load test of the API with a mix of realistic traffic, fully offline.
+Run from repo root:
+  python backend/scripts/loadtest.py [--target main|app] [--concurrency 1,8,32,64] [--duration 30]
+      [--mix search=50,apply=15,resume_improve=10,resume_evaluate=5,chat=15,login=5] [--workers 1]
+      [--data-dir /tmp/pathpilot-bench/100000] [--out loadtest.json] [--metrics-out metrics.txt]
+
+Starts scripts/provider_standin.py (provider and LLM latency via --provider-latency, passed through) and
+uvicorn with main:app (--target main) or app.main:app (--target app) on a scratch SQLite database, with the
+provider URLs pointed at the stand-in. --data-dir uses a corpus from scripts/synth_data.py (its database is
+copied, jobs.json served via JOB_DATA_DIR). Each virtual user registers, upgrades itself to premium (so plan
+limits do not turn into 403s) and then loops over the traffic mix. Each --concurrency level runs for
+--duration seconds, so the report shows where throughput stops growing and latency / errors climb.
+
+The report (JSON) has, per concurrency level, throughput and per-route count, requests/s, error rate,
+status counts and p50/p95/p99/max latency. The app variant has no resume evaluate route and its chat route
+is career guidance; its job search uses mock results (it calls SerpAPI through the serpapi package).
+With --target main, --metrics-out saves the server's /metrics after the last level (all workers merged).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add backend to path so we can import from scripts
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from scripts.bench_job_search import _git_commit, summarize
+from scripts.synth_data import LOCATIONS, ROLES, SKILLS, resume_text
+
+DEFAULT_MIX = "search=50,apply=15,resume_improve=10,resume_evaluate=5,chat=15,login=5"
+APPS = {"main": "main:app", "app": "app.main:app"}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip():
+            mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class Stats:
+    """Latency samples and status counts per route for one concurrency level."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, route: str, status: int | str, seconds: float) -> None:
+        self.latencies[route].append(seconds)
+        self.statuses[route][str(status)] += 1
+
+    def report(self, elapsed: float) -> dict:
+        routes = {}
+        total = errors = 0
+        for route, samples in sorted(self.latencies.items()):
+            statuses = self.statuses[route]
+            failed = sum(n for status, n in statuses.items() if not status.startswith(("2", "3")))
+            total += len(samples)
+            errors += failed
+            routes[route] = {
+                **summarize(samples),
+                "rps": round(len(samples) / elapsed, 2),
+                "error_rate": round(failed / len(samples), 4),
+                "statuses": dict(statuses),
+            }
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "routes": routes,
+        }
+
+
+class VirtualUser:
+    """One client session: own account and token, picks the next action from the traffic mix."""
+
+    def __init__(self, client, target: str, stats: Stats, rng: random.Random, uid: str):
+        self.client = client
+        self.target = target
+        self.stats = stats
+        self.rng = rng
+        self.email = f"load-{uid}@loadtest.example.com"
+        self.password = "load-test-password"
+        self.headers: dict[str, str] = {}
+        self.jobs: list[dict] = []
+        self.conversation_id: int | None = None
+
+    async def call(self, route: str, method: str, path: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            resp = await self.client.request(method, path, headers=self.headers, **kwargs)
+        except Exception as e:
+            self.stats.record(route, type(e).__name__, time.perf_counter() - started)
+            return None
+        self.stats.record(route, resp.status_code, time.perf_counter() - started)
+        return resp
+
+    async def setup(self) -> bool:
+        body = {"email": self.email, "password": self.password, "full_name": "Load Test"}
+        resp = await self.call("POST /api/auth/register", "POST", "/api/auth/register", json=body)
+        if resp is None or resp.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+        await self.call("POST /api/subscription/mock-set-plan", "POST", "/api/subscription/mock-set-plan", json={"plan": "premium"})
+        return True
+
+    async def login(self) -> None:
+        resp = await self.call("POST /api/auth/login", "POST", "/api/auth/login",
+                               json={"email": self.email, "password": self.password})
+        if resp is not None and resp.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+    async def search(self) -> None:
+        q = self.rng.choice([self.rng.choice(ROLES), f"{self.rng.choice(SKILLS)} developer"])
+        location = self.rng.choice(LOCATIONS)
+        if self.target == "main":
+            resp = await self.call("GET /api/jobs/search", "GET", "/api/jobs/search", params={"q": q, "location": location})
+        else:
+            resp = await self.call("POST /api/jobs/search", "POST", "/api/jobs/search",
+                                   json={"job_title": q, "location": location})
+        if resp is not None and resp.status_code == 200:
+            self.jobs = resp.json()[:20]
+
+    async def apply(self) -> None:
+        if not self.jobs:
+            await self.search()
+        if not self.jobs:
+            return
+        job = self.rng.choice(self.jobs)
+        if self.target == "main":
+            if job.get("id", 0) > 0:
+                await self.call("POST /api/apply/redirect", "POST", "/api/apply/redirect", json={"job_id": job["id"]})
+        else:
+            await self.call("POST /api/jobs/action", "POST", "/api/jobs/action",
+                            json={"job_id": 0, "action": "redirected", "job": job})
+
+    async def resume_improve(self) -> None:
+        body = {"resume_text": resume_text(self.rng), "job_description": f"{self.rng.choice(ROLES)} with {self.rng.choice(SKILLS)}"}
+        await self.call("POST /api/resume/improve", "POST", "/api/resume/improve", json=body)
+
+    async def resume_evaluate(self) -> None:
+        if self.target != "main":
+            return await self.resume_improve()
+        body = {"resume_text": resume_text(self.rng), "job_description": f"{self.rng.choice(ROLES)} role", "save": True}
+        await self.call("POST /api/resume/evaluate", "POST", "/api/resume/evaluate", json=body)
+
+    async def chat(self) -> None:
+        if self.target != "main":
+            await self.call("POST /api/chat/guidance", "POST", "/api/chat/guidance",
+                            json={"target_role": self.rng.choice(ROLES)})
+            return
+        body = {"message": f"How do I move into a {self.rng.choice(ROLES)} role?", "conversation_id": self.conversation_id}
+        resp = await self.call("POST /api/ai/chat", "POST", "/api/ai/chat", json=body)
+        if resp is not None and resp.status_code == 200:
+            self.conversation_id = resp.json().get("conversation_id")
+
+    async def run(self, mix: dict[str, float], deadline: float) -> None:
+        if not await self.setup():
+            return
+        actions = {"search": self.search, "apply": self.apply, "resume_improve": self.resume_improve,
+                   "resume_evaluate": self.resume_evaluate, "chat": self.chat, "login": self.login}
+        names = [n for n in mix if n in actions]
+        weights = [mix[n] for n in names]
+        while time.monotonic() < deadline:
+            await actions[self.rng.choices(names, weights)[0]]()
+
+
+async def run_level(base_url: str, target: str, concurrency: int, duration: float, mix: dict, seed: int, timeout: float) -> dict:
+    import httpx
+
+    stats = Stats()
+    rng = random.Random(seed + concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.monotonic()
+        deadline = started + duration
+        users = [
+            VirtualUser(client, target, stats, random.Random(rng.random()), f"c{concurrency}-{i}-{rng.randrange(10**9)}")
+            for i in range(concurrency)
+        ]
+        await asyncio.gather(*(u.run(mix, deadline) for u in users))
+        elapsed = time.monotonic() - started
+    return {"concurrency": concurrency, **stats.report(elapsed)}
+
+
+def _wait_http(url: str, proc: subprocess.Popen, timeout: float = 60.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"process for {url} exited with {proc.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise SystemExit(f"{url} did not come up within {timeout:.0f}s")
+
+
+def _print_level(level: dict) -> None:
+    print(f"\nconcurrency {level['concurrency']}: {level['requests']} requests, {level['throughput_rps']} req/s, "
+          f"error rate {level['error_rate']:.2%}", file=sys.stderr)
+    print(f"  {'route':<40} {'n':>6} {'req/s':>8} {'err':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}", file=sys.stderr)
+    for route, r in level["routes"].items():
+        print(f"  {route:<40} {r['count']:>6} {r['rps']:>8.1f} {r['error_rate']:>7.1%} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline HTTP load test with mixed traffic")
+    parser.add_argument("--target", choices=sorted(APPS), default="main", help="main.py or the backend/app variant")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated virtual-user counts, run in turn")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="action=weight,... (search, apply, resume_improve, "
+                                                           "resume_evaluate, chat, login)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--data-dir", help="synthetic corpus from scripts/synth_data.py (default: empty corpus)")
+    parser.add_argument("--provider-latency", action="append", default=None, metavar="[PROVIDER=]SPEC",
+                        help="stand-in latency, e.g. lognormal:400:0.5 or openai=lognormal:1500:0.4")
+    parser.add_argument("--provider-error-rate", action="append", default=None, metavar="[PROVIDER=]P")
+    parser.add_argument("--timeout", type=float, default=60.0, help="client timeout per request (seconds)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--metrics-out", help="write the server's /metrics text here after the run (--target main)")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    scratch = Path(tempfile.mkdtemp(prefix="pathpilot-load-"))
+    data_dir = Path(args.data_dir).resolve() if args.data_dir else scratch / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    db_path = scratch / "loadtest.db"
+    if args.data_dir and (data_dir / "pathpilot.db").exists():
+        shutil.copyfile(data_dir / "pathpilot.db", db_path)
+
+    standin_port, api_port = _free_port(), _free_port()
+    standin = f"http://127.0.0.1:{standin_port}"
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        JOB_DATA_DIR=str(data_dir),
+        SECRET_KEY="load-test-secret",
+        SERPAPI_SEARCH_URL=f"{standin}/serpapi/search.json", SERPAPI_KEY="standin",
+        ADZUNA_BASE_URL=f"{standin}/adzuna", ADZUNA_APP_ID="standin", ADZUNA_APP_KEY="standin",
+        RAPIDAPI_BASE=f"{standin}/rapidapi", RAPIDAPI_KEY="standin",
+        OPENAI_BASE_URL=f"{standin}/openai/v1", OPENAI_API_KEY="standin",
+        # Every uvicorn worker writes its metrics here, so /metrics covers all of them
+        METRICS_DIR=str(scratch / "metrics"),
+    )
+    # The app variant's SerpAPI client cannot be redirected; without a key it serves its mock results
+    if args.target == "app":
+        env.pop("SERPAPI_KEY")
+    standin_cmd = [sys.executable, str(_backend / "scripts" / "provider_standin.py"), "--port", str(standin_port),
+                   "--recordings", str(scratch / "recordings"), "--seed", str(args.seed)]
+    for spec in args.provider_latency or ["serpapi=lognormal:800:0.4", "adzuna=lognormal:400:0.4",
+                                          "rapidapi=lognormal:600:0.4", "openai=lognormal:1500:0.5"]:
+        standin_cmd += ["--latency", spec]
+    for spec in args.provider_error_rate or []:
+        standin_cmd += ["--error-rate", spec]
+    api_cmd = [sys.executable, "-m", "uvicorn", APPS[args.target], "--host", "127.0.0.1", "--port", str(api_port),
+               "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"]
+
+    procs = []
+    levels = []
+    try:
+        procs.append(subprocess.Popen(standin_cmd, cwd=_backend, env=env, stdout=subprocess.DEVNULL))
+        _wait_http(f"{standin}/_standin/stats", procs[-1])
+        procs.append(subprocess.Popen(api_cmd, cwd=_backend, env=env))
+        base_url = f"http://127.0.0.1:{api_port}"
+        _wait_http(f"{base_url}/health", procs[-1])
+        print(f"Load testing {APPS[args.target]} ({args.workers} worker(s)) at {base_url}, scratch {scratch}", file=sys.stderr)
+        for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            level = asyncio.run(run_level(base_url, args.target, concurrency, args.duration, mix, args.seed, args.timeout))
+            _print_level(level)
+            levels.append(level)
+        if args.metrics_out and args.target == "main":
+            import httpx
+
+            Path(args.metrics_out).write_text(httpx.get(f"{base_url}/metrics", timeout=10.0).text, encoding="utf-8")
+            print(f"Wrote {args.metrics_out}", file=sys.stderr)
+    finally:
+        for proc in reversed(procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if not args.keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "benchmark": "loadtest",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "target": APPS[args.target],
+        "workers": args.workers,
+        "duration_s": args.duration,
+        "mix": mix,
+        "data_dir": args.data_dir,
+        "provider_latency": args.provider_latency,
+        "cpu_count": os.cpu_count(),
+        "levels": levels,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+        print(f"\nWrote {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the job and LLM providers (SerpAPI, Adzuna, RapidAPI Indeed, OpenAI), so searches,
+benchmarks and load tests run offline with realistic latency and failures.
+
+Run from repo root:
+  python backend/scripts/provider_standin.py [--port 8900] [--latency lognormal:400:0.5] [--error-rate 0.02]
+  python backend/scripts/provider_standin.py --record     # forward misses to the real APIs and save them
+and point the backend at it (any non-empty key works):
+  SERPAPI_SEARCH_URL=http://127.0.0.1:8900/serpapi/search.json  SERPAPI_KEY=standin
+  ADZUNA_BASE_URL=http://127.0.0.1:8900/adzuna                  ADZUNA_APP_ID=standin ADZUNA_APP_KEY=standin
+  RAPIDAPI_BASE=http://127.0.0.1:8900/rapidapi                  RAPIDAPI_KEY=standin
+  OPENAI_BASE_URL=http://127.0.0.1:8900/openai/v1               OPENAI_API_KEY=standin
+
+Requests are matched to recordings (data/provider_recordings/<provider>.jsonl) by provider, path and query
+parameters without credentials (the chat messages and model for OpenAI). A miss is answered with a synthetic
+response derived from the request (--miss synth, default; paginated like the real APIs) or a 404 (--miss 404).
+
+--latency, --error-rate, --quota-rate and --quota take one value for every provider or PROVIDER=VALUE
+(repeatable). Latency specs, in milliseconds: N, fixed:N, uniform:LO:HI, lognormal:MEDIAN:SIGMA.
+--error-rate answers that fraction with a 500/502/503, --quota-rate with a 429 rate-limit error, and after
+--quota N requests a provider answers every request with its quota-exhausted 429.
+GET /_standin/stats returns per-provider counts; POST /_standin/reset clears them and the quota counters.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+# Add backend to path so we can import from services
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+RECORDINGS_DIR = _backend / "data" / "provider_recordings"
+PROVIDERS = ("serpapi", "adzuna", "rapidapi", "openai")
+# Real endpoints, used by --record to fill misses
+UPSTREAMS = {
+    "serpapi": "https://serpapi.com",
+    "adzuna": "https://api.adzuna.com/v1/api",
+    "rapidapi": "https://indeed12.p.rapidapi.com",
+    "openai": "https://api.openai.com/v1",
+}
+# Query parameters and headers that carry credentials: not part of the match key, never recorded
+_SECRET_PARAMS = {"api_key", "app_id", "app_key"}
+_FORWARD_HEADERS = ("authorization", "x-rapidapi-key", "x-rapidapi-host", "content-type")
+
+# Provider-specific bodies for 429s: (rate limited, quota exhausted)
+_QUOTA_BODIES = {
+    "serpapi": (
+        {"error": "Your searches per hour limit has been reached. Please try again later."},
+        {"error": "Your account has run out of searches."},
+    ),
+    "adzuna": (
+        {"exception": "AUTH_FAIL", "display": "Rate limit exceeded"},
+        {"exception": "AUTH_FAIL", "display": "Usage limits exceeded for this app_id"},
+    ),
+    "rapidapi": (
+        {"message": "You have exceeded the rate limit per second for your plan, BASIC, by the API provider"},
+        {"message": "You have exceeded the MONTHLY quota for Requests on your current plan, BASIC."},
+    ),
+    "openai": (
+        {"error": {"message": "Rate limit reached for requests", "type": "requests", "code": "rate_limit_exceeded"}},
+        {"error": {"message": "You exceeded your current quota.", "type": "insufficient_quota", "code": "insufficient_quota"}},
+    ),
+}
+
+_TITLES = ["Software Engineer", "Data Analyst", "Backend Developer", "Data Scientist", "Product Manager",
+           "DevOps Engineer", "Frontend Developer", "ML Engineer", "QA Engineer", "Site Reliability Engineer"]
+_COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises",
+              "Cyberdyne", "Soylent", "Vandelay Industries"]
+_CITIES = [("Denver, CO", 39.74, -104.99), ("Austin, TX", 30.27, -97.74), ("Seattle, WA", 47.61, -122.33),
+           ("New York, NY", 40.71, -74.01), ("Berlin, Germany", 52.52, 13.40), ("London, UK", 51.51, -0.13)]
+# Synthetic page size and page count per query
+SYNTH_PAGE_SIZE = 10
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Latency spec (milliseconds) -> sampler returning seconds."""
+    kind, _, rest = spec.partition(":")
+    if not rest:
+        ms = float(kind)
+        return lambda rng: ms / 1000.0
+    args = [float(a) for a in rest.split(":")]
+    if kind == "fixed":
+        return lambda rng: args[0] / 1000.0
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1]) / 1000.0
+    if kind == "lognormal":
+        # median * exp(sigma * N(0, 1))
+        return lambda rng: rng.lognormvariate(0.0, args[1]) * args[0] / 1000.0
+    raise ValueError(f"unknown latency spec {spec!r} (use N, fixed:N, uniform:LO:HI, lognormal:MEDIAN:SIGMA)")
+
+
+def per_provider(values: list[str] | None, parse: Callable[[str], Any], default: Any) -> dict[str, Any]:
+    """["SPEC", "serpapi=SPEC", ...] -> {provider: parsed}; a bare value applies to every provider."""
+    out = {name: default for name in PROVIDERS}
+    for value in values or []:
+        name, sep, spec = value.partition("=")
+        if not sep:
+            out = {n: parse(value) for n in PROVIDERS}
+        elif name in out:
+            out[name] = parse(spec)
+        else:
+            raise SystemExit(f"unknown provider {name!r} in {value!r} (one of {', '.join(PROVIDERS)})")
+    return out
+
+
+def request_key(provider: str, path: str, params: dict[str, Any], body: Any = None) -> str:
+    """Match key for a request: credentials dropped, parameters sorted; for OpenAI the model and messages."""
+    clean = {k: str(v) for k, v in sorted(params.items()) if k not in _SECRET_PARAMS}
+    if isinstance(body, dict):
+        clean["body"] = json.dumps({k: body.get(k) for k in ("model", "messages")}, sort_keys=True)
+    raw = json.dumps([provider, path, clean], sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class Recordings:
+    """Recorded (status, body) per request key, one JSONL file per provider; the last recording of a key wins."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.responses: dict[str, tuple[int, Any]] = {}
+        for name in PROVIDERS:
+            path = directory / f"{name}.jsonl"
+            if not path.exists():
+                continue
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        rec = json.loads(line)
+                        self.responses[rec["key"]] = (rec["status"], rec["body"])
+
+    def __len__(self) -> int:
+        return len(self.responses)
+
+    def get(self, key: str) -> tuple[int, Any] | None:
+        return self.responses.get(key)
+
+    def add(self, provider: str, key: str, request: dict, status: int, body: Any) -> None:
+        self.responses[key] = (status, body)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        rec = {"key": key, "request": request, "status": status, "body": body}
+        with open(self.directory / f"{provider}.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+def _synth_jobs(rng: random.Random, q: str, location: str, start: int, count: int) -> list[dict]:
+    jobs = []
+    for n in range(start, start + count):
+        title = f"{q.strip().title() or rng.choice(_TITLES)} {rng.choice(['', 'II', 'Senior', 'Lead'])}".strip()
+        city, lat, lon = rng.choice(_CITIES)
+        low = rng.randrange(60, 160) * 1000
+        jobs.append({
+            "n": n,
+            "title": title,
+            "company": rng.choice(_COMPANIES),
+            "location": location or city,
+            "lat": lat + rng.uniform(-0.2, 0.2),
+            "lon": lon + rng.uniform(-0.2, 0.2),
+            "description": f"{title} role #{n}. " + " ".join(rng.choice(_TITLES).lower() for _ in range(40)),
+            "salary": (low, low + rng.randrange(10, 60) * 1000),
+            "days": rng.randrange(1, 30),
+        })
+    return jobs
+
+
+def synth_response(provider: str, path: str, params: dict[str, Any], body: Any, key: str, pages: int) -> Any:
+    """A response in the provider's format, deterministic per request key."""
+    rng = random.Random(key)
+    if provider == "serpapi":
+        page = int((params.get("next_page_token") or "p0")[1:] or 0)
+        jobs = _synth_jobs(rng, params.get("q", ""), params.get("location", ""), page * SYNTH_PAGE_SIZE, SYNTH_PAGE_SIZE)
+        data = {
+            "search_metadata": {"status": "Success", "id": key[:24]},
+            "jobs_results": [{
+                "title": j["title"],
+                "company_name": j["company"],
+                "location": j["location"],
+                "description": j["description"],
+                "apply_options": [{"title": j["company"], "link": f"https://jobs.example.org/serpapi/{key[:8]}/{j['n']}"}],
+                "detected_extensions": {"posted_at": f"{j['days']} days ago", "salary": "%d–%d a year" % j["salary"]},
+            } for j in jobs],
+        }
+        if page + 1 < pages:
+            data["serpapi_pagination"] = {"next_page_token": f"p{page + 1}"}
+        return data
+    if provider == "adzuna":
+        per_page = int(params.get("results_per_page") or SYNTH_PAGE_SIZE)
+        page = int(path.rstrip("/").rsplit("/", 1)[-1] or 1)
+        jobs = _synth_jobs(rng, params.get("what", ""), params.get("where", ""), (page - 1) * per_page, per_page)
+        return {
+            "count": per_page * pages,
+            "results": [{
+                "title": j["title"],
+                "company": {"display_name": j["company"]},
+                "location": {"display_name": j["location"]},
+                "latitude": j["lat"],
+                "longitude": j["lon"],
+                "description": j["description"],
+                "redirect_url": f"https://jobs.example.org/adzuna/{key[:8]}/{j['n']}",
+                "salary_min": j["salary"][0],
+                "salary_max": j["salary"][1],
+                "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - j["days"] * 86400)),
+            } for j in jobs],
+        }
+    if provider == "rapidapi":
+        company = path.split("/company/", 1)[-1].split("/", 1)[0]
+        start = max(1, int(params.get("start") or 1))
+        jobs = _synth_jobs(rng, "", "", start, SYNTH_PAGE_SIZE)
+        last = start + SYNTH_PAGE_SIZE > pages * SYNTH_PAGE_SIZE
+        return {
+            "count": len(jobs),
+            "hits": [{
+                "title": j["title"],
+                "company_name": company,
+                "location": j["location"],
+                "description": j["description"],
+                "link": f"https://jobs.example.org/indeed/{key[:8]}/{j['n']}",
+                "formatted_relative_time": f"{j['days']} days ago",
+            } for j in jobs],
+            "next_start": None if last else start + SYNTH_PAGE_SIZE,
+            "prev_start": None if start == 1 else max(1, start - SYNTH_PAGE_SIZE),
+        }
+    # OpenAI chat completion
+    messages = (body or {}).get("messages") or [{}]
+    prompt = str(messages[-1].get("content") or "")
+    content = f"[Stand-in LLM] {len(prompt)} characters received. " + " ".join(
+        rng.choice(_TITLES).lower() for _ in range(min(200, int((body or {}).get("max_tokens") or 64) // 4))
+    )
+    return {
+        "id": f"chatcmpl-{key[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": (body or {}).get("model") or "gpt-4o-mini",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                  "total_tokens": (len(prompt) + len(content)) // 4},
+    }
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    latency = per_provider(args.latency, parse_latency, parse_latency("0"))
+    error_rate = per_provider(args.error_rate, float, 0.0)
+    quota_rate = per_provider(args.quota_rate, float, 0.0)
+    quota = per_provider(args.quota, int, None)
+    recordings = Recordings(Path(args.recordings))
+    rng = random.Random(args.seed)
+    stats: dict[str, Counter] = {name: Counter() for name in PROVIDERS}
+    app = FastAPI(title="Provider stand-in")
+
+    async def upstream(provider: str, request: Request, path: str, params: dict, body: Any) -> tuple[int, Any]:
+        import httpx
+
+        headers = {h: request.headers[h] for h in _FORWARD_HEADERS if h in request.headers}
+        async with httpx.AsyncClient(timeout=60) as client:
+            resp = await client.request(
+                request.method, UPSTREAMS[provider] + path, params=params, headers=headers,
+                json=body if request.method == "POST" else None,
+            )
+        try:
+            return resp.status_code, resp.json()
+        except ValueError:
+            return resp.status_code, {"error": resp.text[:500]}
+
+    async def handle(provider: str, request: Request, path: str) -> JSONResponse:
+        params = dict(request.query_params)
+        body = await request.json() if request.method == "POST" else None
+        counts = stats[provider]
+        counts["requests"] += 1
+        await asyncio.sleep(latency[provider](rng))
+
+        limit = quota[provider]
+        if limit is not None and counts["requests"] > limit:
+            counts["quota_exhausted"] += 1
+            return JSONResponse(_QUOTA_BODIES[provider][1], status_code=429)
+        roll = rng.random()
+        if roll < quota_rate[provider]:
+            counts["rate_limited"] += 1
+            return JSONResponse(_QUOTA_BODIES[provider][0], status_code=429, headers={"Retry-After": "1"})
+        if roll < quota_rate[provider] + error_rate[provider]:
+            counts["errors"] += 1
+            status = rng.choice([500, 502, 503])
+            return JSONResponse({"error": f"stand-in injected {status}"}, status_code=status)
+
+        key = request_key(provider, path, params, body)
+        recorded = recordings.get(key)
+        if recorded is not None:
+            counts["replayed"] += 1
+            return JSONResponse(recorded[1], status_code=recorded[0])
+        if args.record:
+            status, data = await upstream(provider, request, path, params, body)
+            safe_params = {k: v for k, v in params.items() if k not in _SECRET_PARAMS}
+            recordings.add(provider, key, {"method": request.method, "path": path, "params": safe_params}, status, data)
+            counts["recorded"] += 1
+            return JSONResponse(data, status_code=status)
+        if args.miss == "404":
+            counts["misses"] += 1
+            return JSONResponse({"error": "no recording for this request"}, status_code=404)
+        counts["synthesized"] += 1
+        return JSONResponse(synth_response(provider, path, params, body, key, args.synth_pages))
+
+    @app.get("/serpapi/{path:path}")
+    async def serpapi(path: str, request: Request):
+        return await handle("serpapi", request, "/" + path)
+
+    @app.get("/adzuna/{path:path}")
+    async def adzuna(path: str, request: Request):
+        return await handle("adzuna", request, "/" + path)
+
+    @app.get("/rapidapi/{path:path}")
+    async def rapidapi(path: str, request: Request):
+        return await handle("rapidapi", request, "/" + path)
+
+    @app.post("/openai/v1/{path:path}")
+    async def openai(path: str, request: Request):
+        return await handle("openai", request, "/" + path)
+
+    @app.get("/_standin/stats")
+    def get_stats():
+        return {"recordings": len(recordings), "providers": {name: dict(c) for name, c in stats.items()}}
+
+    @app.post("/_standin/reset")
+    def reset():
+        for c in stats.values():
+            c.clear()
+        return {"ok": True}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for SerpAPI, Adzuna, RapidAPI Indeed and OpenAI")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--recordings", default=str(RECORDINGS_DIR), help="directory of <provider>.jsonl recordings")
+    parser.add_argument("--record", action="store_true", help="forward misses to the real APIs and record them")
+    parser.add_argument("--miss", choices=["synth", "404"], default="synth", help="answer to an unrecorded request")
+    parser.add_argument("--synth-pages", type=int, default=3, help="pages per synthetic query before pagination ends")
+    parser.add_argument("--latency", action="append", metavar="[PROVIDER=]SPEC", help="response latency (ms)")
+    parser.add_argument("--error-rate", action="append", metavar="[PROVIDER=]P", help="fraction answered with 5xx")
+    parser.add_argument("--quota-rate", action="append", metavar="[PROVIDER=]P", help="fraction answered with 429")
+    parser.add_argument("--quota", action="append", metavar="[PROVIDER=]N", help="requests before the quota runs out")
+    parser.add_argument("--seed", type=int, default=None, help="seed for latency and error sampling")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(args)
+    print(f"Provider stand-in on http://{args.host}:{args.port} ({'recording' if args.record else 'replaying'}, "
+          f"misses -> {'upstream' if args.record else args.miss})")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic job corpus and database for benchmarks and load tests (nothing touches backend/data).
+Run from repo root:
+  python backend/scripts/synth_data.py --jobs 100000 --out /tmp/pathpilot-bench/100k [--users 100] [--binary]
+
+Writes OUT/jobs.json (realistic titles, companies, locations, descriptions, salaries, coordinates),
+OUT/pathpilot.db with the same jobs in the jobs table, users with resumes, and past search_sessions /
+job_matches (one session per 20 jobs, spread over the last 30 days), and with --binary OUT/jobs.bin.
+Point the backend at it with JOB_DATA_DIR=OUT and DATABASE_URL=sqlite:///OUT/pathpilot.db.
+Output is deterministic for a given --seed.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path so we can import from services
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+SENIORITY = ["", "", "Junior", "Senior", "Senior", "Lead", "Staff", "Principal"]
+ROLES = [
+    "Software Engineer", "Backend Engineer", "Frontend Developer", "Full Stack Developer", "Data Analyst",
+    "Data Scientist", "Data Engineer", "Machine Learning Engineer", "DevOps Engineer", "Site Reliability Engineer",
+    "Product Manager", "Product Designer", "QA Engineer", "Security Engineer", "Mobile Developer",
+    "Cloud Architect", "Business Analyst", "Engineering Manager", "Technical Writer", "Solutions Engineer",
+]
+SPECIALTIES = ["", "", "", "Python", "Java", "Go", "React", "iOS", "Android", "Payments", "Platform",
+               "Infrastructure", "Growth", "Analytics", "AI", "Kubernetes", "Data Platform", "Search"]
+SKILLS = ["python", "java", "go", "typescript", "react", "sql", "postgresql", "aws", "gcp", "azure", "docker",
+          "kubernetes", "terraform", "spark", "airflow", "pandas", "pytorch", "tensorflow", "fastapi", "django",
+          "graphql", "kafka", "redis", "linux", "ci/cd", "tableau", "excel", "figma", "swift", "kotlin"]
+COMPANY_HEADS = ["Blue", "North", "Bright", "Quantum", "Silver", "Green", "Atlas", "Nova", "Summit", "Harbor",
+                 "Red", "Iron", "Clear", "Open", "Swift", "Prime", "Cedar", "Pixel", "Vertex", "Lumen"]
+COMPANY_TAILS = ["Labs", "Systems", "Analytics", "Health", "Logistics", "Robotics", "Software", "Networks",
+                 "Capital", "Energy", "Media", "Foods", "Bank", "Cloud", "Games", "Bio", "Mobility", "Retail"]
+LOCATIONS = [
+    "New York, NY", "San Francisco, CA", "Seattle, WA", "Austin, TX", "Denver, CO", "Boston, MA", "Chicago, IL",
+    "Los Angeles, CA", "Atlanta, GA", "Miami, FL", "Portland, OR", "Raleigh, NC", "Salt Lake City, UT",
+    "Minneapolis, MN", "Phoenix, AZ", "Dallas, TX", "Washington, DC", "Pittsburgh, PA", "United States",
+    "London, UK", "Manchester, UK", "Edinburgh, UK", "Berlin, Germany", "Munich, Germany", "Hamburg, Germany",
+    "Amsterdam, Netherlands", "Paris, France", "Dublin, Ireland", "Madrid, Spain", "Stockholm, Sweden",
+    "Toronto, Canada", "Vancouver, Canada", "Sydney, Australia", "Bangalore, India", "Singapore", "Remote",
+]
+SENTENCES = [
+    "You will design, build and operate {skill} services used by millions of customers.",
+    "We are looking for a {title} to join our {team} team.",
+    "Experience with {skill} and {skill2} is required; {skill3} is a plus.",
+    "You will work closely with product, design and data teams to ship features every week.",
+    "Our stack includes {skill}, {skill2} and {skill3}, deployed on {cloud}.",
+    "{company} offers competitive pay, equity, and a flexible hybrid schedule.",
+    "Mentor engineers, review code and help shape the technical roadmap.",
+    "Strong communication skills and ownership of projects from idea to production.",
+    "Bachelor's degree in computer science or equivalent practical experience.",
+    "Benefits include health insurance, 401(k) matching, learning budget and parental leave.",
+]
+TEAMS = ["platform", "payments", "search", "growth", "data", "infrastructure", "mobile", "core", "ML", "security"]
+
+
+def _title(rng: random.Random) -> str:
+    return " ".join(p for p in (rng.choice(SENIORITY), rng.choice(SPECIALTIES), rng.choice(ROLES)) if p)
+
+
+def _company(rng: random.Random) -> str:
+    return f"{rng.choice(COMPANY_HEADS)} {rng.choice(COMPANY_TAILS)}"
+
+
+def _description(rng: random.Random, title: str, company: str) -> str:
+    skills = rng.sample(SKILLS, 3)
+    fields = {"title": title, "company": company, "team": rng.choice(TEAMS), "skill": skills[0],
+              "skill2": skills[1], "skill3": skills[2], "cloud": rng.choice(["AWS", "GCP", "Azure"])}
+    return " ".join(s.format(**fields) for s in rng.sample(SENTENCES, rng.randint(4, 8)))[:1000]
+
+
+def generate_jobs(count: int, seed: int = 0):
+    """count job dicts with unique (title, company), in the jobs.json format."""
+    from services.gazetteer import geocode, location_id
+
+    rng = random.Random(seed)
+    seen: set[tuple[str, str]] = set()
+    today = datetime.utcnow().date()
+    for i in range(1, count + 1):
+        title, company = _title(rng), _company(rng)
+        suffix = 2
+        while (title, company) in seen:
+            # Keep the (title, company) unique index of the jobs table satisfied
+            title, suffix = f"{title.rsplit(' #', 1)[0]} #{suffix}", suffix + 1
+        seen.add((title, company))
+        location = rng.choice(LOCATIONS)
+        low = rng.randrange(50, 180) * 1000
+        job = {
+            "id": i,
+            "title": title,
+            "company": company,
+            "location": location,
+            "location_id": location_id(location),
+            "description": _description(rng, title, company),
+            "apply_url": f"https://jobs.example.org/{i}",
+            "salary": f"${low:,} - ${low + rng.randrange(10, 80) * 1000:,}",
+            "posted_date": (today - timedelta(days=rng.randrange(60))).isoformat(),
+            "source": "bench",
+        }
+        coords = geocode(location)
+        if coords:
+            job["latitude"], job["longitude"] = coords
+        yield job
+
+
+def resume_text(rng: random.Random) -> str:
+    skills = ", ".join(rng.sample(SKILLS, rng.randint(5, 12)))
+    role = rng.choice(ROLES)
+    return (
+        f"{rng.choice(SENIORITY) or 'Experienced'} {role} with {rng.randint(1, 15)} years of experience.\n"
+        f"Skills: {skills}.\n"
+        f"Built and operated {rng.choice(TEAMS)} systems at {_company(rng)}; led projects with "
+        f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)}. Education: B.Sc. Computer Science."
+    )
+
+
+def write_jobs_json(path: Path, jobs) -> int:
+    """Stream jobs to a JSON array (the whole list is never held in memory)."""
+    count = 0
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for job in jobs:
+            f.write((",\n" if count else "") + json.dumps(job, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    os.replace(tmp, path)
+    return count
+
+
+def seed_database(out: Path, jobs: int, users: int, seed: int, batch: int = 5000) -> None:
+    """Jobs (same rows as jobs.json), users with resumes, and past search sessions with their matches."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{out / 'pathpilot.db'}"
+    from db import SessionLocal, ensure_tables
+    from models.job import Job
+    from models.resume import Resume
+    from models.search_session import JobMatch, SearchSession
+    from models.user import User
+
+    ensure_tables()
+    rng = random.Random(seed + 1)
+    db = SessionLocal()
+    try:
+        rows = []
+        for j in generate_jobs(jobs, seed):
+            rows.append({k: j[k] for k in ("title", "company", "location", "location_id", "description", "apply_url", "source")})
+            if len(rows) >= batch:
+                db.execute(Job.__table__.insert(), rows)
+                rows = []
+        if rows:
+            db.execute(Job.__table__.insert(), rows)
+        db.commit()
+
+        for u in range(1, users + 1):
+            user = User(email=f"bench{u}@example.org", hashed_password="!", plan="premium")
+            db.add(user)
+            db.flush()
+            db.add(Resume(user_id=user.id, resume_text=resume_text(rng)))
+        db.commit()
+
+        now = datetime.utcnow()
+        sessions = max(1, jobs // 20)
+        for start in range(0, sessions, batch):
+            chunk = []
+            for _ in range(start, min(sessions, start + batch)):
+                chunk.append({
+                    "query": rng.choice(ROLES),
+                    "location": rng.choice(LOCATIONS),
+                    # Strictly before today, so these never satisfy a same-day lookup
+                    "created_at": now - timedelta(days=rng.randint(1, 30), minutes=rng.randrange(1440)),
+                })
+            db.execute(SearchSession.__table__.insert(), chunk)
+        db.commit()
+        session_ids = [sid for (sid,) in db.query(SearchSession.id)]
+        matches = []
+        for sid in session_ids:
+            for jid in rng.sample(range(1, jobs + 1), min(20, jobs)):
+                matches.append({"search_session_id": sid, "job_id": jid, "created_at": now})
+            if len(matches) >= batch:
+                db.execute(JobMatch.__table__.insert(), matches)
+                matches = []
+        if matches:
+            db.execute(JobMatch.__table__.insert(), matches)
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic job corpus + database for benchmarks")
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--out", required=True, help="output directory (created)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--binary", action="store_true", help="also build jobs.bin (memory-mapped corpus)")
+    args = parser.parse_args()
+
+    out = Path(args.out).resolve()
+    out.mkdir(parents=True, exist_ok=True)
+    for name in ("pathpilot.db", "jobs.bin", "jobs.jsonl"):
+        (out / name).unlink(missing_ok=True)
+    os.environ["JOB_DATA_DIR"] = str(out)
+
+    started = time.monotonic()
+    count = write_jobs_json(out / "jobs.json", generate_jobs(args.jobs, args.seed))
+    print(f"Wrote {count} jobs -> {out / 'jobs.json'} ({time.monotonic() - started:.1f}s)")
+    started = time.monotonic()
+    seed_database(out, args.jobs, args.users, args.seed)
+    print(f"Seeded {out / 'pathpilot.db'}: {args.jobs} jobs, {args.users} users, "
+          f"{max(1, args.jobs // 20)} past search sessions ({time.monotonic() - started:.1f}s)")
+    if args.binary:
+        from services.job_storage import build_binary_corpus
+
+        print(f"Built binary corpus -> {build_binary_corpus()}")
+
+
+if __name__ == "__main__":
+    main()
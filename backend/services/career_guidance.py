@@ -36,7 +36,7 @@ def get_guidance(target_role: str) -> dict:
         "Be specific to the target role. Output only the JSON object, no markdown or explanation."
     )
     user = f"Target role: {target_role}. Give concrete, actionable guidance as JSON."
-    out = complete(system, user, max_tokens=1024)
+    out = complete(system, user, max_tokens=1024, feature="career_guidance")
     data = _extract_json(out)
     if data and isinstance(data, dict):
         return {
@@ -0,0 +1,243 @@
+"""
+Near-duplicate job detection: the same posting from SerpAPI, Adzuna and Indeed often differs only in
+title wording, whitespace or description truncation, so exact (title, company) keys miss it.
+
+Each job gets a MinHash signature over word 3-shingles of title + company + description. Signatures
+are split into LSH bands; jobs sharing any band bucket are candidates, and a candidate is a duplicate
+when the estimated Jaccard similarity reaches DEDUPE_THRESHOLD, both are in the same place (location_key)
+and the titles share at least DEDUPE_TITLE_THRESHOLD of their words. Shingles leave out the location, and
+company boilerplate dominates many descriptions, so the location and title checks are what keep
+"Senior Software Engineer, Munich" and "Software Engineer, Berlin" at the same company apart.
+The index saves to / loads from JSON so incremental ingests can check against earlier ones.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Iterable
+
+from services.gazetteer import location_id
+
+try:
+    import numpy as np
+except ImportError:  # signatures are computed in pure Python (same values, slower)
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = Path(os.environ.get("JOB_DATA_DIR") or Path(__file__).resolve().parent.parent / "data")
+DEDUPE_INDEX_PATH = Path(os.environ.get("DEDUPE_INDEX_PATH") or _DATA_DIR / "dedupe_index.json")
+
+# "near" = exact (title, company) plus MinHash/LSH near-duplicates; "exact" = (title, company) only
+JOB_DEDUPE_MODE = (os.environ.get("JOB_DEDUPE_MODE") or "near").strip().lower()
+# Min estimated Jaccard similarity of the shingle sets, and min word overlap of the titles
+DEDUPE_THRESHOLD = float(os.environ.get("DEDUPE_THRESHOLD") or "0.8")
+DEDUPE_TITLE_THRESHOLD = float(os.environ.get("DEDUPE_TITLE_THRESHOLD") or "0.8")
+# Signature length and LSH bands (num_perm / bands rows per band; 128/16 puts the LSH threshold near 0.7)
+DEDUPE_NUM_PERM = 128
+DEDUPE_BANDS = 16
+
+_SHINGLE_SIZE = 3
+_PRIME = 4294967311  # smallest prime above 2**32
+_SEED = 1729
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def near_dedupe_enabled() -> bool:
+    return JOB_DEDUPE_MODE == "near"
+
+
+def _permutations(num_perm: int) -> tuple[list[int], list[int]]:
+    """(a, b) of the hash functions (a*x + b) mod _PRIME; fixed seed, so persisted signatures stay comparable."""
+    rng = random.Random(_SEED)
+    return [rng.randrange(1, 1 << 32) for _ in range(num_perm)], [rng.randrange(0, 1 << 32) for _ in range(num_perm)]
+
+
+def _shingle_hashes(title: str, company: str, description: str | None) -> list[int]:
+    tokens = _TOKEN_RE.findall(f"{title} {company} {description or ''}".lower())
+    if len(tokens) < _SHINGLE_SIZE:
+        shingles = {" ".join(tokens)} if tokens else set()
+    else:
+        shingles = {" ".join(tokens[i:i + _SHINGLE_SIZE]) for i in range(len(tokens) - _SHINGLE_SIZE + 1)}
+    return [zlib.crc32(s.encode("utf-8")) for s in shingles]
+
+
+def title_words(title: str) -> frozenset[str]:
+    """Lowercased words of a title, as compared by the title-overlap check."""
+    return frozenset(_TOKEN_RE.findall((title or "").lower()))
+
+
+def location_key(location: str | None, loc_id: str | None = None) -> str:
+    """Place two postings must share to be merged: the gazetteer id of the location (loc_id when already known), else its words."""
+    return loc_id or location_id(location) or " ".join(_TOKEN_RE.findall((location or "").lower()))
+
+
+def pack_signature(sig: tuple[int, ...]) -> bytes:
+    return struct.pack(f"<{len(sig)}Q", *sig)
+
+
+def unpack_signature(data: bytes) -> tuple[int, ...]:
+    return struct.unpack(f"<{len(data) // 8}Q", data)
+
+
+class NearDuplicateIndex:
+    """MinHash signatures + LSH band buckets for a set of jobs, keyed by caller-chosen string keys."""
+
+    def __init__(
+        self,
+        threshold: float = DEDUPE_THRESHOLD,
+        title_threshold: float = DEDUPE_TITLE_THRESHOLD,
+        num_perm: int = DEDUPE_NUM_PERM,
+        bands: int = DEDUPE_BANDS,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.title_threshold = title_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._a, self._b = _permutations(num_perm)
+        if np is not None:
+            self._a_np = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_np = np.array(self._b, dtype=np.uint64)[:, None]
+        self.signatures: dict[str, tuple[int, ...]] = {}
+        self.titles: dict[str, frozenset[str]] = {}
+        self.locations: dict[str, str] = {}
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def signature(self, title: str, company: str, description: str | None) -> tuple[int, ...]:
+        hashes = _shingle_hashes(title, company, description)
+        if not hashes:
+            return (_PRIME,) * self.num_perm
+        if np is not None:
+            x = np.array(hashes, dtype=np.uint64)[None, :]
+            # a, x < 2**32 so a*x + b fits in uint64
+            return tuple(int(v) for v in ((self._a_np * x + self._b_np) % _PRIME).min(axis=1))
+        return tuple(min((a * x + b) % _PRIME for x in hashes) for a, b in zip(self._a, self._b))
+
+    def _band_keys(self, sig: tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows]
+
+    def band_buckets(self, sig: tuple[int, ...]) -> list[int]:
+        """One signed 64-bit hash per LSH band (band number included), for bucket lookups in a database."""
+        return [
+            int.from_bytes(hashlib.blake2b(struct.pack(f"<I{len(rows)}Q", band, *rows), digest_size=8).digest(), "little", signed=True)
+            for band, rows in self._band_keys(sig)
+        ]
+
+    def _similarity(self, sig: tuple[int, ...], other: tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(sig, other) if x == y) / self.num_perm
+
+    def _title_overlap(self, words: frozenset[str], other: frozenset[str]) -> float:
+        union = words | other
+        return len(words & other) / len(union) if union else 1.0
+
+    def find(
+        self, title: str, company: str, description: str | None, location: str | None = None, sig: tuple[int, ...] | None = None,
+    ) -> str | None:
+        """Key of the most similar indexed job that is a near-duplicate of this one, else None."""
+        sig = sig or self.signature(title, company, description)
+        keys = dict.fromkeys(key for bucket in self._band_keys(sig) for key in self._buckets.get(bucket, ()))
+        return self.best_match(
+            title, location_key(location), sig,
+            ((key, self.signatures[key], self.titles[key], self.locations[key]) for key in keys),
+        )
+
+    def best_match(
+        self, title: str, place: str, sig: tuple[int, ...], candidates: Iterable[tuple[Any, tuple[int, ...], frozenset[str], str]],
+    ) -> Any:
+        """
+        Key of the most similar (key, signature, title words, location_key) candidate that this job
+        (title, location_key place, signature) near-duplicates, else None.
+        """
+        words = title_words(title)
+        best, best_sim = None, 0.0
+        for key, other, other_words, other_place in candidates:
+            if other_place != place:
+                continue
+            sim = self._similarity(sig, other)
+            if sim >= self.threshold and sim > best_sim and self._title_overlap(words, other_words) >= self.title_threshold:
+                best, best_sim = key, sim
+        return best
+
+    def add(
+        self, key: str, title: str, company: str, description: str | None, location: str | None = None, sig: tuple[int, ...] | None = None,
+    ) -> None:
+        self._insert(key, sig or self.signature(title, company, description), title_words(title), location_key(location))
+
+    def _insert(self, key: str, sig: tuple[int, ...], words: frozenset[str], place: str) -> None:
+        if key in self.signatures:
+            self.remove(key)
+        self.signatures[key] = sig
+        self.titles[key] = words
+        self.locations[key] = place
+        for bucket in self._band_keys(sig):
+            self._buckets.setdefault(bucket, []).append(key)
+
+    def remove(self, key: str) -> None:
+        sig = self.signatures.pop(key, None)
+        self.titles.pop(key, None)
+        self.locations.pop(key, None)
+        if sig is None:
+            return
+        for bucket in self._band_keys(sig):
+            keys = self._buckets.get(bucket)
+            if keys and key in keys:
+                keys.remove(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def check_and_add(
+        self, key: str, title: str, company: str, description: str | None, location: str | None = None, sig: tuple[int, ...] | None = None,
+    ) -> str | None:
+        """Return the key this job duplicates; otherwise index it under key and return None."""
+        sig = sig or self.signature(title, company, description)
+        dup = self.find(title, company, description, location, sig)
+        if dup is None:
+            self._insert(key, sig, title_words(title), location_key(location))
+        return dup
+
+    def save(self, path: Path = DEDUPE_INDEX_PATH) -> None:
+        """Write signatures, title words and location keys as JSON (temp file + rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        data = {
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "jobs": [[key, list(sig), sorted(self.titles[key]), self.locations[key]] for key, sig in self.signatures.items()],
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        logger.info("dedupe: saved %d signatures to %s", len(self.signatures), path)
+
+    @classmethod
+    def load(cls, path: Path = DEDUPE_INDEX_PATH, **kwargs) -> "NearDuplicateIndex":
+        """Index from save(); an empty one if the file is missing or unreadable. Entries saved without a location are skipped."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(**kwargs)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("dedupe: could not load %s: %s", path, e)
+            return cls(**kwargs)
+        index = cls(num_perm=data.get("num_perm", DEDUPE_NUM_PERM), bands=data.get("bands", DEDUPE_BANDS), **kwargs)
+        for entry in data.get("jobs", []):
+            if len(entry) == 4 and len(entry[1]) == index.num_perm:
+                key, sig, words, place = entry
+                index._insert(str(key), tuple(sig), frozenset(words), place)
+        return index
+
@@ -0,0 +1,491 @@
+"""
+Offline gazetteer: countries, regions (US states, Canadian provinces, Australian states) and major job-market
+cities with coordinates and aliases. Compiled at import into an alias -> place ids dict.
+
+Canonical location ids are paths, country / region / city ("us", "us/co", "us/co/denver", "de/berlin"), so
+"is this job inside the searched area" is a prefix check and a location index only needs one posting list
+per id (every job is posted under its place and each ancestor). "remote" is its own top-level id.
+
+resolve_location() reads free-text provider locations ("Denver, CO", "Berlin, Germany", "London, United
+Kingdom (+1 other)", "Remote - US"): comma-separated segments are matched word by word against the
+aliases (longest phrase first), and the most specific place consistent with the most segments wins, ties
+going to the rightmost segment ("Paris, TX" is Texas). One- and two-letter aliases (state and country
+codes) only count as a whole segment, so "de" matches "Berlin, DE" but not "Denver". A code that is both a
+country and a US state ("de", "ca", "in") means the country unless another segment is in the US
+("Dover, DE", "DE, US").
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+
+from services.geo import GeoIndex
+
+# Bump when the tables or resolution rules change (stored location indexes are rebuilt)
+GAZETTEER_VERSION = 2
+
+# id|name|lat,lon|aliases (the name is always an alias)
+_PLACES = """
+remote|Remote||anywhere,work from home,wfh,remote first,fully remote
+us|United States|39.83,-98.58|usa,us,u s,u s a,united states of america,america
+gb|United Kingdom|54.0,-2.0|uk,u k,gb,great britain,britain,england,scotland,wales,northern ireland
+de|Germany|51.17,10.45|de,deutschland
+at|Austria|47.52,14.55|at,osterreich
+ch|Switzerland|46.82,8.23|ch,schweiz,suisse,svizzera
+fr|France|46.23,2.21|fr
+nl|Netherlands|52.13,5.29|nl,the netherlands,holland,nederland
+be|Belgium|50.50,4.47|be,belgie,belgique
+ie|Ireland|53.41,-8.24|ie,republic of ireland
+es|Spain|40.46,-3.75|es,espana
+it|Italy|41.87,12.57|it,italia
+pt|Portugal|39.40,-8.22|pt
+pl|Poland|51.92,19.15|pl,polska
+se|Sweden|60.13,18.64|se,sverige
+dk|Denmark|56.26,9.50|dk,danmark
+no|Norway|60.47,8.47|no,norge
+fi|Finland|61.92,25.75|fi,suomi
+cz|Czechia|49.82,15.47|cz,czech republic
+ca|Canada|56.13,-106.35|ca
+mx|Mexico|23.63,-102.55|mx
+br|Brazil|-14.24,-51.93|br,brasil
+au|Australia|-25.27,133.78|au
+nz|New Zealand|-40.90,174.89|nz
+in|India|20.59,78.96|in
+sg|Singapore|1.35,103.82|sg
+jp|Japan|36.20,138.25|jp
+ae|United Arab Emirates|23.42,53.85|ae,uae
+za|South Africa|-30.56,22.94|za
+il|Israel|31.05,34.85|il
+us/al|Alabama||al
+us/ak|Alaska||ak
+us/az|Arizona||az
+us/ar|Arkansas||ar
+us/ca|California||ca,calif
+us/co|Colorado||co
+us/ct|Connecticut||ct
+us/de|Delaware||de
+us/dc|District of Columbia||dc,d c
+us/fl|Florida||fl
+us/ga|Georgia||ga
+us/hi|Hawaii||hi
+us/id|Idaho||id
+us/il|Illinois||il
+us/in|Indiana||in
+us/ia|Iowa||ia
+us/ks|Kansas||ks
+us/ky|Kentucky||ky
+us/la|Louisiana||la
+us/me|Maine||me
+us/md|Maryland||md
+us/ma|Massachusetts||ma
+us/mi|Michigan||mi
+us/mn|Minnesota||mn
+us/ms|Mississippi||ms
+us/mo|Missouri||mo
+us/mt|Montana||mt
+us/ne|Nebraska||ne
+us/nv|Nevada||nv
+us/nh|New Hampshire||nh
+us/nj|New Jersey||nj
+us/nm|New Mexico||nm
+us/ny|New York State||ny,new york state
+us/nc|North Carolina||nc
+us/nd|North Dakota||nd
+us/oh|Ohio||oh
+us/ok|Oklahoma||ok
+us/or|Oregon||or
+us/pa|Pennsylvania||pa
+us/ri|Rhode Island||ri
+us/sc|South Carolina||sc
+us/sd|South Dakota||sd
+us/tn|Tennessee||tn
+us/tx|Texas||tx
+us/ut|Utah||ut
+us/vt|Vermont||vt
+us/va|Virginia||va
+us/wa|Washington State||wa,washington
+us/wv|West Virginia||wv
+us/wi|Wisconsin||wi
+us/wy|Wyoming||wy
+ca/ab|Alberta||ab
+ca/bc|British Columbia||bc
+ca/mb|Manitoba||mb
+ca/nb|New Brunswick||nb
+ca/nl|Newfoundland and Labrador||nl,newfoundland
+ca/ns|Nova Scotia||ns
+ca/on|Ontario||on
+ca/pe|Prince Edward Island||pe,pei
+ca/qc|Quebec||qc
+ca/sk|Saskatchewan||sk
+au/nsw|New South Wales||nsw
+au/vic|Victoria||vic
+au/qld|Queensland||qld
+au/wa|Western Australia||
+au/sa|South Australia||
+au/act|Australian Capital Territory||
+us/ny/new-york|New York|40.71,-74.01|new york city,nyc,manhattan,brooklyn
+us/ca/san-francisco|San Francisco|37.77,-122.42|sf,san francisco bay area,bay area
+us/ca/los-angeles|Los Angeles|34.05,-118.24|
+us/ca/san-jose|San Jose|37.34,-121.89|
+us/ca/san-diego|San Diego|32.72,-117.16|
+us/ca/palo-alto|Palo Alto|37.44,-122.14|
+us/ca/mountain-view|Mountain View|37.39,-122.08|
+us/ca/sunnyvale|Sunnyvale|37.37,-122.04|
+us/ca/santa-clara|Santa Clara|37.35,-121.96|
+us/ca/menlo-park|Menlo Park|37.45,-122.18|
+us/ca/cupertino|Cupertino|37.32,-122.03|
+us/ca/oakland|Oakland|37.80,-122.27|
+us/ca/irvine|Irvine|33.68,-117.83|
+us/ca/sacramento|Sacramento|38.58,-121.49|
+us/wa/seattle|Seattle|47.61,-122.33|
+us/wa/redmond|Redmond|47.67,-122.12|
+us/wa/bellevue|Bellevue|47.61,-122.20|
+us/or/portland|Portland|45.52,-122.68|
+us/tx/austin|Austin|30.27,-97.74|
+us/tx/dallas|Dallas|32.78,-96.80|
+us/tx/houston|Houston|29.76,-95.37|
+us/tx/san-antonio|San Antonio|29.42,-98.49|
+us/tx/plano|Plano|33.02,-96.70|
+us/tx/fort-worth|Fort Worth|32.76,-97.33|
+us/co/denver|Denver|39.74,-104.99|
+us/co/boulder|Boulder|40.01,-105.27|
+us/co/aurora|Aurora|39.73,-104.83|
+us/co/englewood|Englewood|39.65,-104.99|
+us/co/colorado-springs|Colorado Springs|38.83,-104.82|
+us/ut/salt-lake-city|Salt Lake City|40.76,-111.89|slc
+us/az/phoenix|Phoenix|33.45,-112.07|
+us/az/scottsdale|Scottsdale|33.49,-111.93|
+us/nv/las-vegas|Las Vegas|36.17,-115.14|
+us/il/chicago|Chicago|41.88,-87.63|
+us/mn/minneapolis|Minneapolis|44.98,-93.27|
+us/mo/st-louis|St. Louis|38.63,-90.20|st louis,saint louis
+us/mo/kansas-city|Kansas City|39.10,-94.58|
+us/mi/detroit|Detroit|42.33,-83.05|
+us/mi/ann-arbor|Ann Arbor|42.28,-83.74|
+us/oh/columbus|Columbus|39.96,-83.00|
+us/oh/cleveland|Cleveland|41.50,-81.69|
+us/oh/cincinnati|Cincinnati|39.10,-84.51|
+us/in/indianapolis|Indianapolis|39.77,-86.16|
+us/wi/milwaukee|Milwaukee|43.04,-87.91|
+us/wi/madison|Madison|43.07,-89.40|
+us/ga/atlanta|Atlanta|33.75,-84.39|
+us/fl/miami|Miami|25.76,-80.19|
+us/fl/tampa|Tampa|27.95,-82.46|
+us/fl/orlando|Orlando|28.54,-81.38|
+us/fl/jacksonville|Jacksonville|30.33,-81.66|
+us/nc/charlotte|Charlotte|35.23,-80.84|
+us/nc/raleigh|Raleigh|35.78,-78.64|
+us/nc/durham|Durham|35.99,-78.90|
+us/tn/nashville|Nashville|36.16,-86.78|
+us/va/arlington|Arlington|38.88,-77.10|
+us/va/reston|Reston|38.96,-77.36|
+us/va/richmond|Richmond|37.54,-77.44|
+us/dc/washington|Washington, D.C.|38.91,-77.04|washington dc,washington d c
+us/md/baltimore|Baltimore|39.29,-76.61|
+us/de/wilmington|Wilmington|39.74,-75.55|
+us/de/dover|Dover|39.16,-75.52|
+us/pa/philadelphia|Philadelphia|39.95,-75.17|philly
+us/pa/pittsburgh|Pittsburgh|40.44,-80.00|
+us/nj/newark|Newark|40.74,-74.17|
+us/nj/jersey-city|Jersey City|40.73,-74.08|
+us/nj/hamilton-township|Hamilton Township|40.21,-74.68|
+us/nj/princeton|Princeton|40.36,-74.67|
+us/ma/boston|Boston|42.36,-71.06|
+us/ma/cambridge|Cambridge|42.37,-71.11|
+us/ct/stamford|Stamford|41.05,-73.54|
+us/ri/providence|Providence|41.82,-71.41|
+us/la/new-orleans|New Orleans|29.95,-90.07|
+us/ok/oklahoma-city|Oklahoma City|35.47,-97.52|
+us/ne/omaha|Omaha|41.26,-95.93|
+us/ky/louisville|Louisville|38.25,-85.76|
+us/hi/honolulu|Honolulu|21.31,-157.86|
+us/ak/anchorage|Anchorage|61.22,-149.90|
+us/id/boise|Boise|43.62,-116.20|
+us/nm/albuquerque|Albuquerque|35.08,-106.65|
+us/sc/charleston|Charleston|32.78,-79.93|
+ca/on/toronto|Toronto|43.65,-79.38|
+ca/on/ottawa|Ottawa|45.42,-75.70|
+ca/on/waterloo|Waterloo|43.46,-80.52|
+ca/qc/montreal|Montreal|45.50,-73.57|
+ca/bc/vancouver|Vancouver|49.28,-123.12|
+ca/ab/calgary|Calgary|51.05,-114.07|
+ca/ab/edmonton|Edmonton|53.55,-113.49|
+ca/mb/winnipeg|Winnipeg|49.90,-97.14|
+au/nsw/sydney|Sydney|-33.87,151.21|
+au/vic/melbourne|Melbourne|-37.81,144.96|
+au/qld/brisbane|Brisbane|-27.47,153.03|
+au/wa/perth|Perth|-31.95,115.86|
+au/sa/adelaide|Adelaide|-34.93,138.60|
+au/act/canberra|Canberra|-35.28,149.13|
+gb/london|London|51.51,-0.13|greater london,city of london
+gb/manchester|Manchester|53.48,-2.24|
+gb/birmingham|Birmingham|52.49,-1.89|
+gb/leeds|Leeds|53.80,-1.55|
+gb/glasgow|Glasgow|55.86,-4.25|
+gb/edinburgh|Edinburgh|55.95,-3.19|
+gb/bristol|Bristol|51.45,-2.59|
+gb/liverpool|Liverpool|53.41,-2.98|
+gb/cambridge|Cambridge|52.21,0.12|
+gb/oxford|Oxford|51.75,-1.26|
+gb/reading|Reading|51.45,-0.97|
+gb/newcastle|Newcastle upon Tyne|54.98,-1.62|newcastle
+gb/sheffield|Sheffield|53.38,-1.47|
+gb/nottingham|Nottingham|52.95,-1.15|
+gb/belfast|Belfast|54.60,-5.93|
+gb/cardiff|Cardiff|51.48,-3.18|
+gb/brighton|Brighton|50.82,-0.14|
+gb/milton-keynes|Milton Keynes|52.04,-0.76|
+de/berlin|Berlin|52.52,13.40|
+de/munich|Munich|48.14,11.58|munchen,muenchen
+de/hamburg|Hamburg|53.55,9.99|
+de/frankfurt|Frankfurt am Main|50.11,8.68|frankfurt
+de/cologne|Cologne|50.94,6.96|koln,koeln
+de/stuttgart|Stuttgart|48.78,9.18|
+de/dusseldorf|Dusseldorf|51.23,6.77|duesseldorf
+de/leipzig|Leipzig|51.34,12.37|
+de/dresden|Dresden|51.05,13.74|
+de/nuremberg|Nuremberg|49.45,11.08|nurnberg,nuernberg
+de/hanover|Hanover|52.38,9.73|hannover
+de/bremen|Bremen|53.08,8.80|
+de/essen|Essen|51.46,7.01|
+de/dortmund|Dortmund|51.51,7.47|
+de/karlsruhe|Karlsruhe|49.01,8.40|
+de/mannheim|Mannheim|49.49,8.47|
+de/bonn|Bonn|50.74,7.10|
+de/potsdam|Potsdam|52.39,13.06|
+de/heidelberg|Heidelberg|49.40,8.67|
+at/vienna|Vienna|48.21,16.37|wien
+at/graz|Graz|47.07,15.44|
+at/linz|Linz|48.31,14.29|
+at/salzburg|Salzburg|47.81,13.04|
+at/innsbruck|Innsbruck|47.27,11.40|
+ch/zurich|Zurich|47.38,8.54|
+ch/geneva|Geneva|46.20,6.14|geneve,genf
+ch/basel|Basel|47.56,7.59|
+ch/bern|Bern|46.95,7.45|berne
+ch/lausanne|Lausanne|46.52,6.63|
+fr/paris|Paris|48.86,2.35|
+fr/lyon|Lyon|45.76,4.84|
+fr/marseille|Marseille|43.30,5.37|
+fr/toulouse|Toulouse|43.60,1.44|
+fr/nice|Nice|43.70,7.27|
+fr/bordeaux|Bordeaux|44.84,-0.58|
+fr/lille|Lille|50.63,3.06|
+fr/nantes|Nantes|47.22,-1.55|
+nl/amsterdam|Amsterdam|52.37,4.90|
+nl/rotterdam|Rotterdam|51.92,4.48|
+nl/the-hague|The Hague|52.08,4.30|den haag
+nl/utrecht|Utrecht|52.09,5.12|
+nl/eindhoven|Eindhoven|51.44,5.47|
+be/brussels|Brussels|50.85,4.35|bruxelles,brussel
+be/antwerp|Antwerp|51.22,4.40|antwerpen
+be/ghent|Ghent|51.05,3.72|gent
+ie/dublin|Dublin|53.35,-6.26|
+ie/cork|Cork|51.90,-8.47|
+es/madrid|Madrid|40.42,-3.70|
+es/barcelona|Barcelona|41.39,2.17|
+es/valencia|Valencia|39.47,-0.38|
+es/malaga|Malaga|36.72,-4.42|
+it/milan|Milan|45.46,9.19|milano
+it/rome|Rome|41.90,12.50|roma
+it/turin|Turin|45.07,7.69|torino
+pt/lisbon|Lisbon|38.72,-9.14|lisboa
+pt/porto|Porto|41.15,-8.61|
+pl/warsaw|Warsaw|52.23,21.01|warszawa
+pl/krakow|Krakow|50.06,19.94|
+pl/wroclaw|Wroclaw|51.11,17.04|
+se/stockholm|Stockholm|59.33,18.07|
+se/gothenburg|Gothenburg|57.71,11.97|goteborg
+dk/copenhagen|Copenhagen|55.68,12.57|kobenhavn
+no/oslo|Oslo|59.91,10.75|
+fi/helsinki|Helsinki|60.17,24.94|
+cz/prague|Prague|50.08,14.44|praha
+mx/mexico-city|Mexico City|19.43,-99.13|cdmx,ciudad de mexico
+mx/guadalajara|Guadalajara|20.66,-103.35|
+br/sao-paulo|Sao Paulo|-23.55,-46.63|
+br/rio-de-janeiro|Rio de Janeiro|-22.91,-43.17|
+nz/auckland|Auckland|-36.85,174.76|
+nz/wellington|Wellington|-41.29,174.78|
+in/bangalore|Bangalore|12.97,77.59|bengaluru
+in/mumbai|Mumbai|19.08,72.88|bombay
+in/delhi|Delhi|28.70,77.10|new delhi
+in/hyderabad|Hyderabad|17.39,78.49|
+in/chennai|Chennai|13.08,80.27|
+in/pune|Pune|18.52,73.86|
+in/gurgaon|Gurgaon|28.46,77.03|gurugram
+in/noida|Noida|28.54,77.39|
+sg/singapore|Singapore|1.29,103.85|
+jp/tokyo|Tokyo|35.68,139.69|
+jp/osaka|Osaka|34.69,135.50|
+ae/dubai|Dubai|25.20,55.27|
+ae/abu-dhabi|Abu Dhabi|24.45,54.38|
+za/cape-town|Cape Town|-33.92,18.42|
+za/johannesburg|Johannesburg|-26.20,28.05|
+il/tel-aviv|Tel Aviv|32.09,34.78|tel aviv yafo
+"""
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_PARENS_RE = re.compile(r"\([^)]*\)")
+_SEGMENT_RE = re.compile(r"[,;/|]|\s-\s")
+# Aliases this short only match a whole segment ("CO" in "Denver, CO", not "co" inside other text)
+_SEGMENT_ONLY_LEN = 2
+
+
+@dataclass(frozen=True, slots=True)
+class Place:
+    id: str
+    name: str
+    kind: str  # "country", "region", "city" or "remote"
+    lat: float | None
+    lon: float | None
+
+    @property
+    def country(self) -> str | None:
+        return None if self.kind == "remote" else self.id.split("/", 1)[0]
+
+
+def _fold(text: str) -> str:
+    """Lowercase ASCII with accents stripped (Zürich -> zurich)."""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+
+
+def _words(text: str) -> tuple[str, ...]:
+    return tuple(w for w in _WORD_RE.findall(_fold(text)) if not w.isdigit())
+
+
+def _compile() -> tuple[dict[str, Place], dict[tuple[str, ...], list[str]], int]:
+    places: dict[str, Place] = {}
+    aliases: dict[tuple[str, ...], list[str]] = {}
+    for line in _PLACES.strip().splitlines():
+        place_id, name, coords, alias_text = line.split("|")
+        lat, lon = (float(c) for c in coords.split(",")) if coords else (None, None)
+        if place_id == "remote":
+            kind = "remote"
+        elif "/" not in place_id:
+            kind = "country"
+        else:
+            kind = "city" if coords else "region"
+        places[place_id] = Place(place_id, name, kind, lat, lon)
+        for alias in [name, *alias_text.split(",")]:
+            words = _words(alias)
+            if words and place_id not in aliases.get(words, ()):
+                aliases.setdefault(words, []).append(place_id)
+    return places, aliases, max(len(words) for words in aliases)
+
+
+_places, _aliases, _max_alias_words = _compile()
+
+
+def get_place(place_id: str | None) -> Place | None:
+    return _places.get(place_id) if place_id else None
+
+
+def place_ancestors(place_id: str | None) -> list[str]:
+    """The id and every enclosing area: "us/co/denver" -> ["us", "us/co", "us/co/denver"]."""
+    if not place_id:
+        return []
+    parts = place_id.split("/")
+    return ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def within(place_id: str | None, area_id: str | None) -> bool:
+    """True if place_id is area_id or inside it."""
+    if not place_id or not area_id:
+        return False
+    return place_id == area_id or place_id.startswith(area_id + "/")
+
+
+def _segment_matches(words: tuple[str, ...]) -> list[list[str]]:
+    """Place-id candidate lists for the alias phrases in one segment, longest phrase first, left to right."""
+    if len(words) == 1 and len(words[0]) <= _SEGMENT_ONLY_LEN:
+        ids = _aliases.get(words)
+        return [ids] if ids else []
+    found: list[list[str]] = []
+    i = 0
+    while i < len(words):
+        for n in range(min(_max_alias_words, len(words) - i), 0, -1):
+            phrase = words[i:i + n]
+            if n == 1 and len(phrase[0]) <= _SEGMENT_ONLY_LEN:
+                continue
+            ids = _aliases.get(phrase)
+            if ids:
+                found.append(ids)
+                i += n
+                break
+        else:
+            i += 1
+    return found
+
+
+def _without_unsupported_regions(groups: list[list[str]]) -> list[list[str]]:
+    """
+    Drop a region from a candidate list that also holds a country ("de": Germany or Delaware) unless another
+    segment lies in the region's country; "DE" alone or in "Berlin, DE" is Germany, "Dover, DE" Delaware.
+    """
+    out: list[list[str]] = []
+    for g, ids in enumerate(groups):
+        countries = {place_id for place_id in ids if "/" not in place_id}
+        if countries:
+            ids = [
+                place_id for place_id in ids
+                if place_id.split("/", 1)[0] in countries
+                or any(within(o, place_id.split("/", 1)[0]) for h, other in enumerate(groups) if h != g for o in other)
+            ]
+        out.append(ids)
+    return out
+
+
+@lru_cache(maxsize=65536)
+def resolve_location(text: str | None) -> Place | None:
+    """Most specific gazetteer place for a free-text location, or None if nothing in it is known."""
+    if not text:
+        return None
+    groups: list[list[str]] = []
+    for segment in _SEGMENT_RE.split(_PARENS_RE.sub(" ", text)):
+        words = _words(segment)
+        if words:
+            groups.extend(_segment_matches(words))
+    groups = _without_unsupported_regions(groups)
+    best, best_rank = None, None
+    for g, ids in enumerate(groups):
+        for order, place_id in enumerate(ids):
+            support = sum(1 for other in groups if any(within(place_id, area) for area in other))
+            # More agreeing segments, then later segment, then more specific, then earlier in the table
+            rank = (support, g, place_id.count("/"), -order)
+            if best_rank is None or rank > best_rank:
+                best, best_rank = place_id, rank
+    return _places[best] if best else None
+
+
+def location_id(text: str | None) -> str | None:
+    """Canonical location id for free text ("Denver, CO" -> "us/co/denver"), or None."""
+    place = resolve_location(text)
+    return place.id if place else None
+
+
+def place_coords(place_id: str | None) -> tuple[float, float] | None:
+    """(lat, lon) of a city id; None for countries and regions (a centroid is no use for a radius), remote or unknown ids."""
+    place = get_place(place_id)
+    return (place.lat, place.lon) if place and place.kind == "city" else None
+
+
+def geocode(text: str | None) -> tuple[float, float] | None:
+    """(lat, lon) of a location that resolves to a city, else None."""
+    return place_coords(location_id(text))
+
+
+_city_geo: GeoIndex[str] | None = None
+
+
+def cities_within(lat: float, lon: float, radius_km: float) -> list[tuple[str, float]]:
+    """(city id, distance_km) for gazetteer cities within radius_km, nearest first."""
+    global _city_geo
+    if _city_geo is None:
+        geo: GeoIndex[str] = GeoIndex()
+        for place in _places.values():
+            if place.kind == "city":
+                geo.add(place.id, place.lat, place.lon)
+        _city_geo = geo
+    return sorted(_city_geo.within(lat, lon, radius_km), key=lambda item: item[1])
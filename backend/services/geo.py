@@ -0,0 +1,119 @@
+"""
+Spatial index for radius search: points bucketed by geohash cell.
+
+A radius query enumerates the geohash cells covering the circle's bounding box and checks the haversine
+distance only for points in those cells, so the work is proportional to the points nearby rather than to
+the whole set. Cells are precision-4 geohashes (about 39 x 20 km); very large radii fall back to a scan.
+"""
+from __future__ import annotations
+
+import math
+from typing import Generic, Hashable, Iterator, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 4
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Past this many covering cells a radius query scans every bucket instead
+_MAX_CELLS = 4096
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _bits(precision: int) -> tuple[int, int]:
+    """(latitude bits, longitude bits) of a geohash; longitude takes the odd extra bit."""
+    total = 5 * precision
+    return total // 2, total - total // 2
+
+
+def _cell_index(lat: float, lon: float, precision: int) -> tuple[int, int]:
+    lat_bits, lon_bits = _bits(precision)
+    lat_i = min((1 << lat_bits) - 1, int((lat + 90.0) / 180.0 * (1 << lat_bits)))
+    lon_i = min((1 << lon_bits) - 1, int((lon + 180.0) / 360.0 * (1 << lon_bits)))
+    return max(0, lat_i), max(0, lon_i)
+
+
+def _encode_index(lat_i: int, lon_i: int, precision: int) -> str:
+    """Geohash string for a cell: longitude and latitude bits interleaved (longitude first), 5 bits per char."""
+    lat_bits, lon_bits = _bits(precision)
+    code, chars = 0, []
+    for n in range(5 * precision):
+        # Even bit positions (from the top) are longitude bits
+        if n % 2 == 0:
+            lon_bits -= 1
+            bit = (lon_i >> lon_bits) & 1
+        else:
+            lat_bits -= 1
+            bit = (lat_i >> lat_bits) & 1
+        code = (code << 1) | bit
+        if n % 5 == 4:
+            chars.append(_BASE32[code])
+            code = 0
+    return "".join(chars)
+
+
+def geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    return _encode_index(*_cell_index(lat, lon, precision), precision)
+
+
+def covering_cells(lat: float, lon: float, radius_km: float, precision: int = GEOHASH_PRECISION) -> list[str] | None:
+    """Geohash cells covering the circle's bounding box; None if there would be more than _MAX_CELLS."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    lat_lo, lat_hi = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    if lat_lo <= -90.0 or lat_hi >= 90.0:
+        lon_lo, lon_hi = -180.0, 180.0
+    else:
+        # Widest longitude span is at the latitude nearest a pole
+        widest = max(abs(lat_lo), abs(lat_hi))
+        dlon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(widest))))
+        lon_lo, lon_hi = (-180.0, 180.0) if dlon >= 180.0 else (lon - dlon, lon + dlon)
+    _, lon_bits = _bits(precision)
+    lat_i0, _ = _cell_index(lat_lo, 0.0, precision)
+    lat_i1, _ = _cell_index(lat_hi, 0.0, precision)
+    lon_cells = 1 << lon_bits
+    lon_i0 = math.floor((lon_lo + 180.0) / 360.0 * lon_cells)
+    lon_i1 = math.floor((lon_hi + 180.0) / 360.0 * lon_cells)
+    lon_i1 = min(lon_i1, lon_i0 + lon_cells - 1)
+    if (lat_i1 - lat_i0 + 1) * (lon_i1 - lon_i0 + 1) > _MAX_CELLS:
+        return None
+    # Longitude indexes wrap across the antimeridian
+    return [
+        _encode_index(lat_i, lon_i % lon_cells, precision)
+        for lat_i in range(lat_i0, lat_i1 + 1)
+        for lon_i in range(lon_i0, lon_i1 + 1)
+    ]
+
+
+class GeoIndex(Generic[K]):
+    """Keys with a (lat, lon), bucketed by geohash cell."""
+
+    def __init__(self, precision: int = GEOHASH_PRECISION):
+        self.precision = precision
+        self.points: dict[K, tuple[float, float]] = {}
+        self._buckets: dict[str, list[K]] = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def add(self, key: K, lat: float, lon: float) -> None:
+        if key in self.points:
+            return
+        self.points[key] = (lat, lon)
+        self._buckets.setdefault(geohash(lat, lon, self.precision), []).append(key)
+
+    def within(self, lat: float, lon: float, radius_km: float) -> Iterator[tuple[K, float]]:
+        """(key, distance_km) for every point within radius_km of (lat, lon), in no particular order."""
+        cells = covering_cells(lat, lon, radius_km, self.precision)
+        buckets = self._buckets.values() if cells is None else (self._buckets.get(c, ()) for c in cells)
+        for keys in buckets:
+            for key in keys:
+                plat, plon = self.points[key]
+                d = haversine_km(lat, lon, plat, plon)
+                if d <= radius_km:
+                    yield key, d
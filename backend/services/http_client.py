@@ -0,0 +1,116 @@
+"""
+Shared HTTP clients for job providers (SerpAPI, Adzuna, RapidAPI Indeed).
+One pooled httpx client per provider, so connections (DNS, TCP, TLS) are kept alive across requests.
+Each provider gets its own pool, which caps connections per host. Async clients are bound to the
+event loop that created them, so they are kept per loop. main.py's lifespan closes everything on shutdown.
+"""
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Pool limits per provider host
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("HTTP_MAX_CONNECTIONS_PER_HOST") or "10")
+HTTP_MAX_KEEPALIVE_PER_HOST = int(os.environ.get("HTTP_MAX_KEEPALIVE_PER_HOST") or "5")
+# Seconds an idle pooled connection is kept open
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY") or "30")
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT") or "5")
+# HTTP/2 needs the optional h2 package (pip install httpx[http2]); HTTP2=0 turns it off
+HTTP2_ENABLED = (os.environ.get("HTTP2") or "1").strip() != "0" and importlib.util.find_spec("h2") is not None
+
+_lock = threading.Lock()
+_sync_clients: dict[str, Any] = {}
+# event loop -> {provider name -> httpx.AsyncClient}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _client_kwargs(timeout: float) -> dict[str, Any]:
+    import httpx
+
+    return {
+        "timeout": httpx.Timeout(timeout, connect=min(timeout, HTTP_CONNECT_TIMEOUT)),
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_PER_HOST,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "http2": HTTP2_ENABLED,
+    }
+
+
+def get_client(name: str, timeout: float):
+    """Return the shared httpx.Client for a provider, creating it on first use. Raises ImportError without httpx."""
+    client = _sync_clients.get(name)
+    if client is not None and not client.is_closed:
+        return client
+    import httpx
+
+    with _lock:
+        client = _sync_clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.Client(**_client_kwargs(timeout))
+            _sync_clients[name] = client
+            logger.info("http_client: opened %s pool (http2=%s)", name, HTTP2_ENABLED)
+        return client
+
+
+def get_async_client(name: str, timeout: float):
+    """Return the shared httpx.AsyncClient for a provider on the running event loop. Raises ImportError without httpx."""
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_client_kwargs(timeout))
+            clients[name] = client
+            logger.info("http_client: opened async %s pool (http2=%s)", name, HTTP2_ENABLED)
+        return client
+
+
+def close_clients() -> None:
+    """Close the sync clients. Async clients are left to aclose_clients (they need their event loop)."""
+    with _lock:
+        clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning("http_client: close failed: %s", e)
+
+
+async def aclose_clients() -> None:
+    """
+    Close every pooled client: sync ones directly, async ones on the loop that owns them. A loop that is
+    stopped but not closed is run (in a worker thread) just long enough to close its clients; clients of a
+    closed loop can no longer be closed cleanly and are logged.
+    """
+    close_clients()
+    with _lock:
+        owned = [(loop, list(clients.values())) for loop, clients in _async_clients.items()]
+        _async_clients.clear()
+    current = asyncio.get_running_loop()
+    for loop, clients in owned:
+        open_clients = [c for c in clients if not c.is_closed]
+        if loop.is_closed():
+            if open_clients:
+                logger.warning("http_client: %d async client(s) belong to a closed event loop; not closed", len(open_clients))
+            continue
+        for client in open_clients:
+            try:
+                if loop is current:
+                    await client.aclose()
+                elif loop.is_running():
+                    future = asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                    await asyncio.wait_for(asyncio.wrap_future(future), timeout=5)
+                else:
+                    await asyncio.wait_for(asyncio.to_thread(loop.run_until_complete, client.aclose()), timeout=5)
+            except Exception as e:
+                logger.warning("http_client: async close failed: %s", e)
@@ -0,0 +1,414 @@
+"""
+Binary columnar job corpus (data/jobs.bin), memory-mapped read-only.
+
+Layout: magic, header length, JSON header, then 8-byte aligned sections. Each job field is a column:
+a flags byte per row (missing / value / null) plus either an int64 array or a string table (uint64
+offsets into one UTF-8 blob). The description column can be zstd-compressed in blocks of rows.
+The search index is stored too: inverted postings (sorted token table -> uint32 positions) for text,
+location and canonical location ids, coordinate postings ("lat,lon" -> positions, for radius search) and
+BM25 postings (term -> doc ids + term frequencies, doc lengths). The text and location token tables carry
+a suffix array (SubstringIndex) so the tokens containing a query word are found by binary search.
+
+Opening the file reads only the header; rows, postings and BM25 statistics are read from the mapping
+on access (JobRow is a lazy Mapping), so cold load is cheap and several uvicorn workers share the
+same page-cache pages. Build it with scripts/build_job_corpus.py (fetch_jobs_to_json.py does too).
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from services.gazetteer import GAZETTEER_VERSION
+from services.job_match import BM25Index
+
+try:
+    import zstandard
+except ImportError:  # descriptions are stored uncompressed
+    zstandard = None
+
+MAGIC = b"PPJOBS1\0"
+_ALIGN = 8
+# Rows per compressed description block, and decompressed blocks kept per corpus
+BLOCK_ROWS = 64
+_BLOCK_CACHE_SIZE = 32
+COMPRESSED_COLUMNS = ("description",)
+
+_MISSING, _VALUE, _NULL = 0, 1, 2
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+# --- writing ---
+
+
+class _Writer:
+    """Collects aligned sections; section refs are [offset, nbytes, typecode] relative to the data start."""
+
+    def __init__(self) -> None:
+        self.parts: list[bytes] = []
+        self.size = 0
+
+    def add(self, data: bytes | array, typecode: str = "B") -> list:
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        ref = [self.size, len(raw), typecode]
+        pad = -len(raw) % _ALIGN
+        self.parts.append(raw + b"\0" * pad)
+        self.size += len(raw) + pad
+        return ref
+
+    def string_table(self, values: Iterable[bytes]) -> dict[str, list]:
+        offsets = array("Q", [0])
+        blob = bytearray()
+        for v in values:
+            blob += v
+            offsets.append(len(blob))
+        return {"offsets": self.add(offsets, "Q"), "data": self.add(blob)}
+
+    def postings(self, postings: dict[str, list[int]], substrings: "SubstringIndex | None" = None) -> dict[str, Any]:
+        """Token table, offsets and positions; with substrings (built over the same tokens) its suffix array too."""
+        tokens = sorted(postings, key=lambda t: t.encode("utf-8"))
+        offsets = array("Q", [0])
+        positions = array("I")
+        for t in tokens:
+            positions.extend(postings[t])
+            offsets.append(len(positions))
+        out = {
+            "tokens": self.string_table(t.encode("utf-8") for t in tokens),
+            "offsets": self.add(offsets, "Q"),
+            "positions": self.add(positions, "I"),
+        }
+        if substrings is not None:
+            out["suffix_tokens"] = self.add(array("I", substrings.suffix_tokens), "I")
+            out["suffix_starts"] = self.add(array("I", substrings.suffix_starts), "I")
+        return out
+
+
+class SubstringIndex:
+    """
+    Suffix array over a byte-sorted token table: every (token, start) suffix in byte order. The tokens
+    containing a string are the suffixes that start with it, one binary-search range, so a query word is
+    expanded in O(log suffixes + matches) rather than by testing every token.
+    """
+
+    def __init__(self, tokens: Sequence[bytes], suffix_tokens: Sequence[int], suffix_starts: Sequence[int]):
+        self.tokens = tokens
+        self.suffix_tokens = suffix_tokens
+        self.suffix_starts = suffix_starts
+
+    @classmethod
+    def build(cls, tokens: Sequence[bytes]) -> "SubstringIndex":
+        """tokens must be in byte order (the order postings() writes them)."""
+        keys = [t[k:] for t in tokens for k in range(len(t))]
+        token_ids = array("I", (i for i, t in enumerate(tokens) for _ in t))
+        starts = array("I", (k for t in tokens for k in range(len(t))))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        return cls(tokens, array("I", (token_ids[s] for s in order)), array("I", (starts[s] for s in order)))
+
+    def containing(self, text: str) -> list[str]:
+        """Tokens that contain text, in table order."""
+        key = text.encode("utf-8")
+        n = len(key)
+
+        def prefix(s: int) -> bytes:
+            start = self.suffix_starts[s]
+            return self.tokens[self.suffix_tokens[s]][start:start + n]
+
+        suffixes = range(len(self.suffix_tokens))
+        lo = bisect_left(suffixes, key, key=prefix)
+        hi = bisect_right(suffixes, key, lo=lo, key=prefix)
+        return [self.tokens[i].decode("utf-8") for i in sorted(set(self.suffix_tokens[lo:hi]))]
+
+
+def coord_token(coords: tuple[float, float]) -> str:
+    """Token for a (lat, lon) in coord_postings (repr round-trips floats exactly)."""
+    return f"{coords[0]!r},{coords[1]!r}"
+
+
+def parse_coord_token(token: str) -> tuple[float, float]:
+    lat, lon = token.split(",")
+    return float(lat), float(lon)
+
+
+def _column_kind(values: list[Any]) -> str:
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return "int"
+    if all(isinstance(v, str) for v in present):
+        return "str"
+    return "json"
+
+
+def write_corpus(path: Path, jobs: Sequence[Mapping], index: Any, source_key: tuple[int, int] | None, compress: bool = True) -> None:
+    """
+    Write jobs plus their search index (a job_storage.JobIndex built over the same list) to path.
+    compress: zstd-compress COMPRESSED_COLUMNS when the zstandard package is installed.
+    """
+    compress = compress and zstandard is not None
+    w = _Writer()
+    names: list[str] = []
+    for j in jobs:
+        for k in j:
+            if k not in names:
+                names.append(k)
+    columns: dict[str, Any] = {}
+    for name in names:
+        flags = array("B", (_VALUE if name in j and j[name] is not None else _NULL if name in j else _MISSING for j in jobs))
+        values = [j.get(name) for j in jobs]
+        kind = _column_kind(values)
+        col: dict[str, Any] = {"kind": kind, "flags": w.add(flags)}
+        if kind == "int":
+            col["values"] = w.add(array("q", (v or 0 for v in values)), "q")
+        else:
+            encoded = [
+                b"" if v is None else (v if kind == "str" else json.dumps(v, ensure_ascii=False)).encode("utf-8")
+                for v in values
+            ]
+            if compress and name in COMPRESSED_COLUMNS:
+                offsets = array("Q", [0])
+                for v in encoded:
+                    offsets.append(offsets[-1] + len(v))
+                compressor = zstandard.ZstdCompressor(level=9)
+                blocks = [compressor.compress(b"".join(encoded[i:i + BLOCK_ROWS])) for i in range(0, len(encoded), BLOCK_ROWS)]
+                col["block_rows"] = BLOCK_ROWS
+                col["offsets"] = w.add(offsets, "Q")
+                col["blocks"] = w.string_table(blocks)
+            else:
+                col.update(w.string_table(encoded))
+        columns[name] = col
+
+    bm25 = index.bm25
+    bm25_section = w.postings({term: docs for term, (docs, _) in bm25.postings.items()})
+    terms_sorted = sorted(bm25.postings, key=lambda t: t.encode("utf-8"))
+    bm25_section["tfs"] = w.add(array("I", (c for t in terms_sorted for c in bm25.postings[t][1])), "I")
+    bm25_section["doc_len"] = w.add(array("I", bm25.doc_len), "I")
+    bm25_section.update({"total_len": bm25.total_len, "k1": bm25.k1, "b": bm25.b})
+
+    header = json.dumps({
+        "rows": len(jobs),
+        "source_key": list(source_key) if source_key else None,
+        "columns": columns,
+        "text_postings": w.postings(index.text_postings, index.text_substrings),
+        "location_postings": w.postings(index.location_postings, index.location_substrings),
+        "place_postings": w.postings(index.place_postings),
+        "coord_postings": w.postings({coord_token(c): positions for c, positions in index.coord_postings.items()}),
+        "gazetteer_version": GAZETTEER_VERSION,
+        "bm25": bm25_section,
+    }).encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        f.write(b"\0" * (-(len(MAGIC) + 8 + len(header)) % _ALIGN))
+        for part in w.parts:
+            f.write(part)
+    os.replace(tmp_path, path)
+
+
+# --- reading ---
+
+
+class _StringTable:
+    def __init__(self, corpus: "JobCorpus", ref: dict[str, list]):
+        self.offsets = corpus._section(ref["offsets"])
+        self.data = corpus._section(ref["data"])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def bytes_at(self, i: int) -> bytes:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    __getitem__ = bytes_at
+
+
+class _MappedPostings(Mapping):
+    """token -> ascending positions (a read-only sequence of ints) from the mapped token table."""
+
+    def __init__(self, corpus: "JobCorpus", ref: dict[str, Any]):
+        self.tokens = _StringTable(corpus, ref["tokens"])
+        self.offsets = corpus._section(ref["offsets"])
+        self.positions = corpus._section(ref["positions"])
+        # None for files written before the suffix array was stored (and for postings without one)
+        self.substrings = (
+            SubstringIndex(self.tokens, corpus._section(ref["suffix_tokens"]), corpus._section(ref["suffix_starts"]))
+            if "suffix_tokens" in ref else None
+        )
+
+    def find(self, token: str) -> int:
+        """Index of token in the sorted table, or -1."""
+        key = token.encode("utf-8")
+        lo, hi = 0, len(self.tokens)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.tokens.bytes_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self.tokens) and self.tokens.bytes_at(lo) == key else -1
+
+    def __getitem__(self, token: str):
+        i = self.find(token)
+        if i < 0:
+            raise KeyError(token)
+        return self.positions[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.tokens.bytes_at(i).decode("utf-8") for i in range(len(self.tokens)))
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+
+class MappedBM25(BM25Index):
+    """BM25 over mapped postings; scoring and top_k() are job_match.BM25Index's (read-only: no add())."""
+
+    def __init__(self, corpus: "JobCorpus", ref: dict[str, Any]):
+        self.mapped_postings = _MappedPostings(corpus, ref)
+        self.tfs = corpus._section(ref["tfs"])
+        self.doc_len = corpus._section(ref["doc_len"])
+        self.total_len = ref["total_len"]
+        self.k1 = ref["k1"]
+        self.b = ref["b"]
+
+    def posting(self, term: str) -> tuple[Sequence[int], Sequence[int]] | None:
+        i = self.mapped_postings.find(term)
+        if i < 0:
+            return None
+        lo, hi = self.mapped_postings.offsets[i], self.mapped_postings.offsets[i + 1]
+        return self.mapped_postings.positions[lo:hi], self.tfs[lo:hi]
+
+
+class JobRow(Mapping):
+    """One job, decoded field by field from the mapped corpus. Use dict(row) for a mutable copy."""
+
+    __slots__ = ("_corpus", "_i")
+
+    def __init__(self, corpus: "JobCorpus", i: int):
+        self._corpus = corpus
+        self._i = i
+
+    def __getitem__(self, key: str) -> Any:
+        return self._corpus._value(key, self._i)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self._corpus._value(key, self._i)
+        except KeyError:
+            return default
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, col in self._corpus._columns.items() if col["flags"][self._i] != _MISSING)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"JobRow({dict(self)!r})"
+
+
+class JobCorpus(Sequence):
+    """Read-only, memory-mapped jobs.bin: a sequence of JobRow plus the stored search index."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a job corpus file")
+        header_len = int.from_bytes(self._mm[len(MAGIC):len(MAGIC) + 8], "little")
+        start = len(MAGIC) + 8
+        self.header = json.loads(self._mm[start:start + header_len])
+        self._data_start = start + header_len + (-(start + header_len) % _ALIGN)
+        self._view = memoryview(self._mm)
+        self.rows = self.header["rows"]
+        self.source_key = tuple(self.header["source_key"]) if self.header.get("source_key") else None
+        self._columns: dict[str, dict[str, Any]] = {}
+        for name, ref in self.header["columns"].items():
+            col: dict[str, Any] = {"kind": ref["kind"], "flags": self._section(ref["flags"])}
+            if ref["kind"] == "int":
+                col["values"] = self._section(ref["values"])
+            elif "blocks" in ref:
+                col["offsets"] = self._section(ref["offsets"])
+                col["blocks"] = _StringTable(self, ref["blocks"])
+                col["block_rows"] = ref["block_rows"]
+            else:
+                col["table"] = _StringTable(self, ref)
+            self._columns[name] = col
+        self.text_postings = _MappedPostings(self, self.header["text_postings"])
+        self.location_postings = _MappedPostings(self, self.header["location_postings"])
+        # Canonical location id -> positions; files from before the gazetteer have none (version None)
+        self.gazetteer_version = self.header.get("gazetteer_version")
+        self.place_postings = _MappedPostings(self, self.header["place_postings"]) if "place_postings" in self.header else {}
+        # "lat,lon" -> positions; None for files written before coordinates were stored
+        self.coord_postings = _MappedPostings(self, self.header["coord_postings"]) if "coord_postings" in self.header else None
+        self.bm25 = MappedBM25(self, self.header["bm25"])
+        self._block_lock = threading.Lock()
+        self._blocks: OrderedDict[tuple[str, int], bytes] = OrderedDict()
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    def _section(self, ref: list) -> memoryview:
+        offset, nbytes, typecode = ref
+        start = self._data_start + offset
+        return self._view[start:start + nbytes].cast(typecode)
+
+    def _block(self, name: str, col: dict[str, Any], block: int) -> bytes:
+        key = (name, block)
+        with self._block_lock:
+            data = self._blocks.get(key)
+            if data is not None:
+                self._blocks.move_to_end(key)
+                return data
+        if self._decompressor is None:
+            raise RuntimeError(f"{self.path} has zstd-compressed {name}; pip install zstandard")
+        data = self._decompressor.decompress(col["blocks"].bytes_at(block))
+        with self._block_lock:
+            self._blocks[key] = data
+            while len(self._blocks) > _BLOCK_CACHE_SIZE:
+                self._blocks.popitem(last=False)
+        return data
+
+    def _value(self, name: str, i: int) -> Any:
+        col = self._columns.get(name)
+        if col is None:
+            raise KeyError(name)
+        flag = col["flags"][i]
+        if flag == _MISSING:
+            raise KeyError(name)
+        if flag == _NULL:
+            return None
+        kind = col["kind"]
+        if kind == "int":
+            return col["values"][i]
+        if "blocks" in col:
+            block = i // col["block_rows"]
+            base = col["offsets"][block * col["block_rows"]]
+            raw = self._block(name, col, block)[col["offsets"][i] - base:col["offsets"][i + 1] - base]
+        else:
+            raw = col["table"].bytes_at(i)
+        text = raw.decode("utf-8")
+        return text if kind == "str" else json.loads(text)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [JobRow(self, j) for j in range(*i.indices(self.rows))]
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError(i)
+        return JobRow(self, i)
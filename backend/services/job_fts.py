@@ -0,0 +1,145 @@
+"""
+Full-text search over the jobs table with SQLite FTS5.
+
+jobs_fts is an external-content FTS5 table over jobs (title, company, location, description), kept in
+sync by insert/update/delete triggers, so jobs stored by past searches are searchable without calling a
+provider. Queries are ranked by bm25() with title and company weighted above the description. A location
+in the gazetteer filters on jobs.location_id (the area and everything inside it); any other location is
+a column filter inside the same MATCH. A radius search keeps jobs whose location_id is a gazetteer city
+within the radius. On databases without FTS5 (other dialects, SQLite builds
+without it) ensure_job_fts() does nothing and search_stored_jobs() returns [].
+"""
+import logging
+import os
+import re
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models.job import Job
+from services.gazetteer import cities_within, geocode, location_id
+
+logger = logging.getLogger(__name__)
+
+# "fts" = search stored jobs before calling providers; "off" = skip that step
+JOB_DB_SEARCH = (os.environ.get("JOB_DB_SEARCH") or "fts").strip().lower()
+# Max rows returned, and min matches for the stored results to be served instead of calling providers
+JOB_DB_SEARCH_LIMIT = int(os.environ.get("JOB_DB_SEARCH_LIMIT") or "100")
+JOB_DB_SEARCH_MIN_RESULTS = int(os.environ.get("JOB_DB_SEARCH_MIN_RESULTS") or "5")
+
+# bm25() column weights, in jobs_fts column order (title, company, location, description)
+_BM25_WEIGHTS = "10.0, 5.0, 0.0, 1.0"
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, location, description,
+        content='jobs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+    END""",
+    # Bulk upserts rewrite title on conflict; only reindex when an indexed column really changed
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE ON jobs
+    WHEN old.title IS NOT new.title OR old.company IS NOT new.company
+        OR old.location IS NOT new.location OR old.description IS NOT new.description
+    BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+        INSERT INTO jobs_fts(rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END""",
+]
+
+_available: bool | None = None
+
+
+def ensure_job_fts(conn: Connection) -> bool:
+    """Create jobs_fts and its triggers if missing; a newly created table is filled from jobs. Returns availability."""
+    global _available
+    if conn.dialect.name != "sqlite":
+        _available = False
+        return False
+    try:
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")).first()
+        for stmt in _DDL:
+            conn.execute(text(stmt))
+        if not exists:
+            conn.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+            logger.info("job_fts: created jobs_fts and indexed existing jobs")
+        conn.commit()
+        _available = True
+    except Exception as e:
+        # e.g. "no such module: fts5"
+        logger.warning("job_fts: full-text search unavailable: %s", e)
+        conn.rollback()
+        _available = False
+    return _available
+
+
+def fts_enabled() -> bool:
+    return JOB_DB_SEARCH == "fts" and bool(_available)
+
+
+def _match_group(tokens: list[str]) -> str:
+    return " AND ".join('"%s"' % t.replace('"', '""') for t in tokens)
+
+
+def build_match_query(q: str, location: str = "") -> str | None:
+    """
+    FTS5 MATCH expression: every query word in title/company/description, and every location word in
+    location. Words are quoted, so user input cannot inject FTS syntax. None if q has no words.
+    """
+    q_tokens = _TOKEN_RE.findall((q or "").lower())
+    if not q_tokens:
+        return None
+    expr = "{title company description} : (%s)" % _match_group(q_tokens)
+    loc_tokens = _TOKEN_RE.findall((location or "").lower())
+    if loc_tokens:
+        expr += " AND location : (%s)" % _match_group(loc_tokens)
+    return expr
+
+
+def search_stored_jobs(
+    db: Session, q: str, location: str = "", limit: int = JOB_DB_SEARCH_LIMIT, radius_km: float | None = None,
+) -> list[Job]:
+    """
+    Stored jobs matching q (and location, or within radius_km of it), best bm25 rank first.
+    Mock rows are excluded; [] when FTS is off.
+    """
+    if not fts_enabled():
+        return []
+    center = geocode(location) if location and radius_km and radius_km > 0 else None
+    place = None if center else location_id(location) if location else None
+    match = build_match_query(q, "" if place or center else location)
+    if match is None:
+        return []
+    params = {"match": match, "limit": limit}
+    if center:
+        params["cities"] = [city_id for city_id, _ in cities_within(center[0], center[1], radius_km)]
+        location_filter = "AND jobs.location_id IN :cities "
+    elif place:
+        params.update(place=place, place_prefix=place + "/%")
+        location_filter = "AND (jobs.location_id = :place OR jobs.location_id LIKE :place_prefix) "
+    else:
+        location_filter = ""
+    stmt = text(
+        "SELECT jobs.* FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid "
+        f"WHERE jobs_fts MATCH :match AND (jobs.source IS NULL OR jobs.source != 'mock') {location_filter}"
+        f"ORDER BY bm25(jobs_fts, {_BM25_WEIGHTS}) LIMIT :limit"
+    )
+    if center:
+        stmt = stmt.bindparams(bindparam("cities", expanding=True))
+    try:
+        return list(db.query(Job).from_statement(stmt).params(**params))
+    except Exception as e:
+        logger.warning("job_fts: search failed for q=%r location=%r: %s", q, location, e)
+        db.rollback()
+        return []
+
@@ -1,11 +1,32 @@
 """
 Match score and reasons for job discovery.
 Uses user's latest resume text (keywords) vs job title/description.
+A resume's keywords are computed once per version (ResumeProfile) and cached across jobs and requests;
+a job's keywords are cached on its (title, description), so repeat searches skip re-tokenizing them.
 """
 from __future__ import annotations
 
+import bisect
+import functools
+import hashlib
+import heapq
+import math
+import os
 import re
-from typing import Any
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Iterable, Sequence
+
+from services import metrics, timing
+
+# Max cached resume profiles (least recently used are evicted)
+RESUME_PROFILE_CACHE_SIZE = int(os.environ.get("RESUME_PROFILE_CACHE_SIZE") or "1024")
+# Max cached job keyword sets (keyed on title + description)
+JOB_KEYWORD_CACHE_SIZE = int(os.environ.get("JOB_KEYWORD_CACHE_SIZE") or "16384")
+
+# Okapi BM25 parameters (term-frequency saturation, length normalization)
+BM25_K1 = float(os.environ.get("BM25_K1") or "1.2")
+BM25_B = float(os.environ.get("BM25_B") or "0.75")
 
 
 def _normalize_text(text: str | None) -> str:
@@ -14,41 +35,232 @@ def _normalize_text(text: str | None) -> str:
     return re.sub(r"\s+", " ", text.lower().strip())
 
 
-def _extract_keywords(text: str, min_len: int = 3) -> set[str]:
-    """Simple word tokenization; drop very short and common words."""
-    stop = {"the", "and", "for", "with", "you", "your", "this", "that", "are", "was", "have", "has", "from", "can", "will", "all", "any", "not", "but", "its", "may", "new", "one", "our", "out", "use", "via"}
+_STOP_WORDS = {"the", "and", "for", "with", "you", "your", "this", "that", "are", "was", "have", "has", "from", "can", "will", "all", "any", "not", "but", "its", "may", "new", "one", "our", "out", "use", "via"}
+
+
+def _keyword_tokens(text: str, min_len: int = 3) -> list[str]:
+    """Keyword tokens in order (with repeats); drop very short and common words."""
     normalized = _normalize_text(text)
     words = re.findall(r"[a-z0-9]+", normalized)
-    return {w for w in words if len(w) >= min_len and w not in stop}
+    return [w for w in words if len(w) >= min_len and w not in _STOP_WORDS]
+
+
+def _extract_keywords(text: str, min_len: int = 3) -> set[str]:
+    """Simple word tokenization; drop very short and common words."""
+    return set(_keyword_tokens(text, min_len))
+
+
+@functools.lru_cache(maxsize=JOB_KEYWORD_CACHE_SIZE)
+def _job_keywords(title: str, description: str) -> frozenset[str]:
+    """Keywords of a job's title + description (cached: search results repeat across requests)."""
+    return frozenset(_extract_keywords(f"{title} {description}"))
+
+
+class ResumeProfile:
+    """Keyword profile of one resume version: keyword set plus per-keyword counts."""
+
+    __slots__ = ("keywords", "counts")
+
+    def __init__(self, text: str):
+        self.counts = Counter(_keyword_tokens(text))
+        self.keywords = frozenset(self.counts)
+
+
+# (resume_id, content sha1) -> profile, LRU-bounded; user_id <-> cached keys for invalidation (kept in step with evictions)
+_profile_lock = threading.Lock()
+_profiles: OrderedDict[tuple[int | None, str], ResumeProfile] = OrderedDict()
+_profile_keys_by_user: dict[int, set[tuple[int | None, str]]] = {}
+_profile_user_by_key: dict[tuple[int | None, str], int] = {}
+
+
+def _forget_profile_key(key: tuple[int | None, str]) -> None:
+    """Drop key from its user's key set (and the set once empty). Caller holds _profile_lock."""
+    user_id = _profile_user_by_key.pop(key, None)
+    if user_id is None:
+        return
+    keys = _profile_keys_by_user.get(user_id)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del _profile_keys_by_user[user_id]
+
+
+def get_resume_profile(resume_text: str | None, resume_id: int | None = None, user_id: int | None = None) -> ResumeProfile | None:
+    """
+    Return the cached profile for this resume version (keyed on resume id + content hash), building it on first use.
+    None if the resume is empty.
+    """
+    if not resume_text or not resume_text.strip():
+        return None
+    key = (resume_id, hashlib.sha1(resume_text.encode("utf-8")).hexdigest())
+    with _profile_lock:
+        profile = _profiles.get(key)
+        if profile is not None:
+            _profiles.move_to_end(key)
+    metrics.cache_lookup("resume profiles", "miss" if profile is None else "hit")
+    if profile is not None:
+        return profile
+    profile = ResumeProfile(resume_text)
+    with _profile_lock:
+        _profiles[key] = profile
+        if user_id is not None:
+            _profile_keys_by_user.setdefault(user_id, set()).add(key)
+            _profile_user_by_key[key] = user_id
+        while len(_profiles) > RESUME_PROFILE_CACHE_SIZE:
+            evicted, _ = _profiles.popitem(last=False)
+            _forget_profile_key(evicted)
+    return profile
 
 
-def compute_match(resume_text: str | None, job_title: str, job_description: str | None) -> tuple[float, list[str]]:
+def invalidate_resume_profiles(user_id: int) -> None:
+    """Drop cached profiles for a user's older resume versions (call when a newer version is saved)."""
+    with _profile_lock:
+        for key in _profile_keys_by_user.pop(user_id, ()):
+            _profiles.pop(key, None)
+            _profile_user_by_key.pop(key, None)
+
+
+@timing.timed("match")
+def compute_match(resume: str | ResumeProfile | None, job_title: str, job_description: str | None) -> tuple[float, list[str]]:
     """
     Return (match_score 0-100, reasons).
+    resume is the resume text or a precomputed ResumeProfile (preferred when scoring many jobs).
     If no resume, returns (0, []).
     """
-    if not resume_text or not resume_text.strip():
+    if isinstance(resume, str):
+        resume = ResumeProfile(resume) if resume.strip() else None
+    if resume is None:
         return 0.0, []
 
-    resume_kw = _extract_keywords(resume_text)
-    job_text = f"{job_title} {job_description or ''}"
-    job_kw = _extract_keywords(job_text)
+    return _score(resume.keywords, _job_keywords(job_title or "", job_description or ""))
 
-    if not job_kw:
-        return 0.0, []
 
+def compute_keyword_match(resume: ResumeProfile, job_title: str, job_description: str | None) -> tuple[float, list[str]]:
+    """
+    (match_score 0-100, up to 5 matched keywords in alphabetical order): the compute_match score with the
+    keywords themselves instead of reason sentences (app/services/job_match.py persists the same score).
+    """
+    score, _, sample = _overlap(resume.keywords, _job_keywords(job_title or "", job_description or ""))
+    return score, sample
+
+
+def _overlap(resume_kw: frozenset[str], job_kw: frozenset[str]) -> tuple[float, float, list[str]]:
+    """(score, overlap ratio, first 5 matched keywords)."""
+    if not job_kw:
+        return 0.0, 0.0, []
     overlap = resume_kw & job_kw
-    ratio = len(overlap) / len(job_kw) if job_kw else 0
+    ratio = len(overlap) / len(job_kw)
     # Score 0-100: overlap ratio and absolute overlap count
     score = min(100.0, (ratio * 60) + (min(len(overlap), 15) * 2.5))
+    return round(score, 1), ratio, heapq.nsmallest(5, overlap)
+
+
+def _score(resume_kw: frozenset[str], job_kw: frozenset[str]) -> tuple[float, list[str]]:
+    score, ratio, sample = _overlap(resume_kw, job_kw)
+    return score, _match_reasons(sample, ratio)
+
 
+def _match_reasons(sample: list[str], ratio: float) -> list[str]:
     reasons: list[str] = []
-    if overlap:
-        sample = sorted(overlap)[:5]
+    if sample:
         reasons.append(f"Your resume matches keywords: {', '.join(sample)}")
     if ratio >= 0.2:
         reasons.append("Strong keyword alignment with job description")
     if ratio >= 0.1:
         reasons.append("Some skills match the role")
+    return reasons
+
+
+@timing.timed("match_batch")
+def compute_match_batch(resume: str | ResumeProfile | None, jobs: Iterable[dict[str, Any]]) -> list[tuple[float, list[str]]]:
+    """
+    compute_match for many jobs (dicts with title, description) at once; same (score, reasons) per job.
+    The resume profile is resolved once and job keywords come from the _job_keywords cache.
+    """
+    jobs = list(jobs)
+    if isinstance(resume, str):
+        resume = ResumeProfile(resume) if resume.strip() else None
+    if resume is None:
+        return [(0.0, []) for _ in jobs]
+    resume_kw = resume.keywords
+    return [_score(resume_kw, _job_keywords(j.get("title") or "", j.get("description") or "")) for j in jobs]
+
+
+class BM25Index:
+    """
+    BM25 statistics over a job corpus: postings (term -> ascending doc ids plus the term frequency in
+    each) and document lengths. Built once when the corpus loads, one add() per document.
+    Document ids are insertion order (= position in the loaded job list).
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, tuple[list[int], list[int]]] = {}
+        self.doc_len: list[int] = []
+        self.total_len = 0
+
+    @staticmethod
+    def tokenize(text: str) -> list[str]:
+        # min_len 2 keeps short skills (ml, ai, qa, ui) that the keyword scorer drops
+        return _keyword_tokens(text, min_len=2)
+
+    def add(self, text: str) -> int:
+        """Index one document; returns its id."""
+        doc_id = len(self.doc_len)
+        tf = Counter(self.tokenize(text))
+        for term, count in tf.items():
+            docs, tfs = self.postings.setdefault(term, ([], []))
+            docs.append(doc_id)
+            tfs.append(count)
+        length = sum(tf.values())
+        self.doc_len.append(length)
+        self.total_len += length
+        return doc_id
+
+    def posting(self, term: str) -> tuple[Sequence[int], Sequence[int]] | None:
+        """(doc ids, term frequencies) for term, or None when no document contains it."""
+        return self.postings.get(term)
+
+    def idf(self, term: str) -> float:
+        n = len(self.doc_len)
+        posting = self.posting(term)
+        df = len(posting[0]) if posting else 0
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
 
-    return round(score, 1), reasons
+    def top_k(self, query: str, doc_ids: Iterable[int], k: int) -> list[int]:
+        """
+        The k best-scoring doc ids for query among doc_ids (ties keep corpus order).
+        Scores accumulate term by term from the postings; a term whose posting list is longer than
+        doc_ids is probed by binary search instead of walked.
+        """
+        terms = set(self.tokenize(query))
+        doc_ids = list(doc_ids)
+        if not terms:
+            return doc_ids[:k]
+        allowed = set(doc_ids)
+        avgdl = self.total_len / len(self.doc_len) if len(self.doc_len) else 0.0
+        k1, b, doc_len = self.k1, self.b, self.doc_len
+        scores: dict[int, float] = {}
+        for term in terms:
+            posting = self.posting(term)
+            if not posting:
+                continue
+            docs, tfs = posting
+            idf = self.idf(term)
+            if len(docs) <= len(allowed):
+                hits = [(d, tfs[i]) for i, d in enumerate(docs) if d in allowed]
+            else:
+                hits = []
+                for d in allowed:
+                    i = bisect.bisect_left(docs, d)
+                    if i < len(docs) and docs[i] == d:
+                        hits.append((d, tfs[i]))
+            for d, f in hits:
+                norm = k1 * (1 - b + b * (doc_len[d] / avgdl if avgdl else 0.0))
+                scores[d] = scores.get(d, 0.0) + idf * f * (k1 + 1) / (f + norm)
+        best = [-neg_id for _, neg_id in heapq.nlargest(k, ((s, -d) for d, s in scores.items()))]
+        if len(best) < k:
+            # Matches without any query term (e.g. a substring hit) follow, in corpus order
+            best += heapq.nsmallest(k - len(best), (d for d in allowed if d not in scores))
+        return best
@@ -0,0 +1,129 @@
+"""
+Near-duplicate lookups against stored jobs (services/dedupe.py MinHash/LSH), persisted next to the jobs table.
+
+job_signatures holds each stored job's MinHash signature and job_lsh_bands one row per LSH band bucket.
+Both are written when jobs are stored (routers/jobs.py), so a lookup reads only the bucket rows of the
+new job's bands and the signatures of those candidates: nothing is loaded up front, nothing is held per
+worker. Jobs stored before these tables existed are signed by a background backfill started with the
+app (start_backfill); until it reaches them they are not found as near-duplicates.
+"""
+import logging
+import threading
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models.job import Job
+from models.job_signature import JobLshBand, JobSignature
+from services.dedupe import NearDuplicateIndex, location_key, near_dedupe_enabled, pack_signature, title_words, unpack_signature
+
+logger = logging.getLogger(__name__)
+
+# Hashing and matching parameters only (permutations, bands, thresholds); holds no jobs
+_minhash = NearDuplicateIndex()
+
+# Ids per IN (...) query, and jobs signed per backfill transaction
+_IN_CHUNK = 500
+_BACKFILL_BATCH = 500
+
+
+def signature(title: str, company: str, description: str | None) -> tuple[int, ...]:
+    return _minhash.signature(title, company, description)
+
+
+def _chunks(values: list) -> list[list]:
+    return [values[i:i + _IN_CHUNK] for i in range(0, len(values), _IN_CHUNK)]
+
+
+def find_near_duplicates(db: Session, jobs: list[tuple[str, str | None, tuple[int, ...]]]) -> list[int | None]:
+    """For each (title, location, signature), the id of the most similar stored job it near-duplicates, else None."""
+    buckets = [_minhash.band_buckets(sig) for _, _, sig in jobs]
+    ids_by_bucket: dict[int, list[int]] = {}
+    for chunk in _chunks(sorted({b for bs in buckets for b in bs})):
+        for bucket, job_id in db.query(JobLshBand.bucket, JobLshBand.job_id).filter(JobLshBand.bucket.in_(chunk)):
+            ids_by_bucket.setdefault(bucket, []).append(job_id)
+    candidates: dict[int, tuple[tuple[int, ...], frozenset[str], str]] = {}
+    for chunk in _chunks(sorted({job_id for ids in ids_by_bucket.values() for job_id in ids})):
+        rows = (
+            db.query(JobSignature.job_id, JobSignature.signature, Job.title, Job.location, Job.location_id)
+            .join(Job, Job.id == JobSignature.job_id)
+            .filter(JobSignature.job_id.in_(chunk))
+        )
+        for job_id, data, title, location, loc_id in rows:
+            candidates[job_id] = (unpack_signature(data), title_words(title), location_key(location, loc_id))
+    out: list[int | None] = []
+    for (title, location, sig), bs in zip(jobs, buckets):
+        ids = sorted({job_id for b in bs for job_id in ids_by_bucket.get(b, ()) if job_id in candidates})
+        out.append(_minhash.best_match(title, location_key(location), sig, ((job_id, *candidates[job_id]) for job_id in ids)))
+    return out
+
+
+def _insert_ignore(db: Session, model, rows: list[dict]) -> None:
+    """INSERT rows, skipping ones whose primary key is already stored (executemany)."""
+    insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(db.get_bind().dialect.name)
+    if insert is None:
+        key_columns = list(model.__table__.primary_key.columns)
+        existing = {
+            tuple(r)
+            for chunk in _chunks(sorted({r["job_id"] for r in rows}))
+            for r in db.query(*key_columns).filter(model.job_id.in_(chunk))
+        }
+        rows = [r for r in rows if tuple(r[c.name] for c in key_columns) not in existing]
+        if rows:
+            db.execute(model.__table__.insert(), rows)
+        return
+    db.execute(insert(model).on_conflict_do_nothing(), rows)
+
+
+def store_signatures(db: Session, rows: list[tuple[int, tuple[int, ...]]]) -> bool:
+    """
+    Persist (job id, signature) pairs and their band buckets; jobs that already have a signature keep it.
+    Commits; on error logs, rolls back and returns False.
+    """
+    if not rows:
+        return True
+    try:
+        _insert_ignore(db, JobSignature, [{"job_id": job_id, "signature": pack_signature(sig)} for job_id, sig in rows])
+        _insert_ignore(db, JobLshBand, [
+            {"bucket": bucket, "job_id": job_id} for job_id, sig in rows for bucket in _minhash.band_buckets(sig)
+        ])
+        db.commit()
+        return True
+    except Exception as e:
+        logger.warning("job_signatures: could not store %d signatures: %s", len(rows), e)
+        db.rollback()
+        return False
+
+
+def backfill_signatures() -> int:
+    """Sign stored jobs that have no signature yet, in batches. Returns how many were signed."""
+    from db import get_db_session
+
+    db = get_db_session()
+    signed = 0
+    try:
+        while True:
+            rows = (
+                db.query(Job.id, Job.title, Job.company, Job.description)
+                .outerjoin(JobSignature, JobSignature.job_id == Job.id)
+                .filter(JobSignature.job_id.is_(None))
+                .order_by(Job.id)
+                .limit(_BACKFILL_BATCH)
+                .all()
+            )
+            if not rows or not store_signatures(db, [(job_id, signature(t, c, d)) for job_id, t, c, d in rows]):
+                break
+            signed += len(rows)
+    except Exception as e:
+        logger.warning("job_signatures: backfill stopped after %d jobs: %s", signed, e)
+    finally:
+        db.close()
+    if signed:
+        logger.info("job_signatures: signed %d stored jobs", signed)
+    return signed
+
+
+def start_backfill() -> None:
+    """Run backfill_signatures in a daemon thread (near-duplicate mode only); lookups work meanwhile."""
+    if near_dedupe_enabled():
+        threading.Thread(target=backfill_signatures, name="job-signature-backfill", daemon=True).start()
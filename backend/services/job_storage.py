@@ -1,80 +1,480 @@
 """
 Job JSON storage: load/save jobs to data/jobs.json. Used so Job Finder and Assisted Apply
 serve real job data with application links from a single JSON file.
+Once data/jobs.jsonl exists (scripts/job_store.py migrate) the append-only JSONL store is used
+instead: saves append only changed jobs and single jobs are read by offset (services/jsonl_store.py).
+Either way, a data/jobs.bin built from the current file (scripts/build_job_corpus.py) is memory-mapped
+in its place, rows and search index included, instead of parsing the file (services/job_corpus.py).
 """
 import json
 import logging
+import os
+import re
+import threading
 from pathlib import Path
 
+from services.job_match import BM25Index
+from services.jsonl_store import JsonlJobStore
+from services.job_corpus import JobCorpus, SubstringIndex, parse_coord_token, write_corpus
+from services.gazetteer import GAZETTEER_VERSION, geocode, location_id, place_ancestors, place_coords, within
+from services.geo import GeoIndex, haversine_km
+from services import timing
+
 logger = logging.getLogger(__name__)
 
-# Path: backend/data/jobs.json
-_JOBS_DIR = Path(__file__).resolve().parent.parent / "data"
+# Path: backend/data/jobs.json (JOB_DATA_DIR moves the whole data dir, e.g. to a benchmark corpus)
+_JOBS_DIR = Path(os.environ.get("JOB_DATA_DIR") or Path(__file__).resolve().parent.parent / "data")
 JOBS_JSON_PATH = _JOBS_DIR / "jobs.json"
+JOBS_JSONL_PATH = _JOBS_DIR / "jobs.jsonl"
+JOBS_BIN_PATH = _JOBS_DIR / "jobs.bin"
+
+# Corpus format: "json" = jobs.json rewritten on every save; "jsonl" = append-only jobs.jsonl with an
+# offset index; "auto" = jsonl once jobs.jsonl exists, else json
+JOB_STORE = (os.environ.get("JOB_STORE") or "auto").strip().lower()
+
+# "auto": memory-map data/jobs.bin when it was built from the current corpus file; "off": always parse the file
+JOB_CORPUS_BINARY = (os.environ.get("JOB_CORPUS_BINARY") or "auto").strip().lower()
 
 # Max jobs to return from JSON per search (limit response size)
 MAX_JOBS_FROM_JSON = 100
 
+# "index": narrow q/location to inverted-index candidates (same results as the scan);
+# "substring": original linear scan over every job
+JOB_FILTER_MODE = (os.environ.get("JOB_FILTER_MODE") or "index").strip().lower()
+
+# Which matches filter_jobs returns: "bm25" = the MAX_JOBS_FROM_JSON best by BM25 against q;
+# "keyword" = the first MAX_JOBS_FROM_JSON in file order (original)
+JOB_RANKING_ENGINE = (os.environ.get("JOB_RANKING_ENGINE") or "bm25").strip().lower()
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _use_jsonl() -> bool:
+    return JOB_STORE == "jsonl" or (JOB_STORE == "auto" and JOBS_JSONL_PATH.exists())
+
+
+_jsonl_store = JsonlJobStore(JOBS_JSONL_PATH)
+
+
+def get_jsonl_store() -> JsonlJobStore:
+    return _jsonl_store
+
 
 def get_jobs_path() -> Path:
-    """Return the path to jobs.json. Ensures data dir exists."""
+    """Return the path to the job corpus (jobs.jsonl when the JSONL store is in use, else jobs.json). Ensures data dir exists."""
     _JOBS_DIR.mkdir(parents=True, exist_ok=True)
-    return JOBS_JSON_PATH
+    return JOBS_JSONL_PATH if _use_jsonl() else JOBS_JSON_PATH
 
 
-def load_jobs_from_json() -> list[dict]:
-    """
-    Load jobs from data/jobs.json. Each job dict has: id, title, company, location,
-    description, apply_url, salary, posted_date, source.
-    Returns [] if file missing, invalid, or empty.
-    """
-    path = get_jobs_path()
-    if not path.exists():
-        return []
+def _file_key(st: os.stat_result) -> tuple[int, int]:
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_jobs_file(path: Path) -> tuple[tuple[int, int] | None, list[dict]]:
+    """Parse jobs.json (or jobs.jsonl); return (mtime/size key of the file actually read, job dicts)."""
+    if path == JOBS_JSONL_PATH:
+        try:
+            key = _file_key(os.stat(path))
+            return key, _jsonl_store.load_all()
+        except FileNotFoundError:
+            return None, []
+        except OSError as e:
+            logger.warning("job_storage: could not load %s: %s", path, e)
+            return None, []
     try:
         with open(path, "r", encoding="utf-8") as f:
+            key = _file_key(os.fstat(f.fileno()))
             data = json.load(f)
+    except FileNotFoundError:
+        return None, []
     except (json.JSONDecodeError, OSError) as e:
         logger.warning("job_storage: could not load %s: %s", path, e)
-        return []
+        return None, []
     if not isinstance(data, list):
-        return []
-    return [j for j in data if isinstance(j, dict)]
+        return key, []
+    return key, [j for j in data if isinstance(j, dict)]
+
+
+# Process-level corpus cache: path -> (((mtime_ns, size) of the file, of jobs.bin or None), jobs, index).
+# Guarded by _corpus_lock so concurrent requests in FastAPI's threadpool load a changed file once, not once each.
+_corpus_lock = threading.Lock()
+_corpus_cache: dict[str, tuple[tuple, list[dict], "JobIndex"]] = {}
+
+
+def _binary_key() -> tuple[int, int] | None:
+    if JOB_CORPUS_BINARY == "off":
+        return None
+    try:
+        return _file_key(os.stat(JOBS_BIN_PATH))
+    except OSError:
+        return None
+
+
+def _load_binary_corpus(source_key: tuple[int, int]) -> JobCorpus | None:
+    """Mapped jobs.bin if it was built from the corpus file as it is now, else None."""
+    try:
+        corpus = JobCorpus(JOBS_BIN_PATH)
+    except (OSError, ValueError) as e:
+        logger.warning("job_storage: could not map %s: %s", JOBS_BIN_PATH, e)
+        return None
+    if corpus.source_key != source_key:
+        logger.info("job_storage: %s is older than the corpus file; parsing the file instead", JOBS_BIN_PATH)
+        return None
+    return corpus
+
+
+def _load_corpus() -> tuple[list[dict], "JobIndex"]:
+    path = get_jobs_path()
+    try:
+        source_key = _file_key(os.stat(path))
+    except OSError:
+        return [], JobIndex([])
+    key = (source_key, _binary_key())
+    cached = _corpus_cache.get(str(path))
+    if cached and cached[0] == key:
+        return cached[1], cached[2]
+    with _corpus_lock:
+        cached = _corpus_cache.get(str(path))
+        if cached and cached[0] == key:
+            return cached[1], cached[2]
+        corpus = _load_binary_corpus(source_key) if key[1] is not None else None
+        if corpus is not None:
+            _corpus_cache[str(path)] = (key, corpus, JobIndex.from_corpus(corpus))
+            logger.info("job_storage: mapped %d jobs from %s", len(corpus), JOBS_BIN_PATH)
+            return corpus, _corpus_cache[str(path)][2]
+        read_key, jobs = _read_jobs_file(path)
+        index = JobIndex(jobs)
+        if read_key is not None:
+            _corpus_cache[str(path)] = ((read_key, key[1]), jobs, index)
+            logger.info("job_storage: loaded %d jobs from %s", len(jobs), path)
+        return jobs, index
+
+
+def build_binary_corpus(compress: bool = True) -> Path:
+    """Write data/jobs.bin (rows + search index) from the current jobs.json / jobs.jsonl. Returns its path."""
+    path = get_jobs_path()
+    read_key, jobs = _read_jobs_file(path)
+    write_corpus(JOBS_BIN_PATH, jobs, JobIndex(jobs), read_key, compress=compress)
+    invalidate_jobs_cache()
+    logger.info("job_storage: wrote %d jobs to %s", len(jobs), JOBS_BIN_PATH)
+    return JOBS_BIN_PATH
+
+
+def invalidate_jobs_cache() -> None:
+    """Drop the cached corpus so the next load re-reads the corpus file."""
+    with _corpus_lock:
+        _corpus_cache.pop(str(get_jobs_path()), None)
+
+
+def corpus_key(jobs: list[dict]) -> tuple[int, int] | None:
+    """
+    (mtime_ns, size) of the corpus file that jobs (a load_jobs_from_json() result) was read from, as kept
+    by the corpus cache; None if jobs is not the cached corpus. Derived indexes are matched on it.
+    """
+    cached = _corpus_cache.get(str(get_jobs_path()))
+    return cached[0][0] if cached is not None and cached[1] is jobs else None
+
+
+def load_jobs_from_json() -> list[dict]:
+    """
+    Load jobs from data/jobs.json. Each job dict has: id, title, company, location,
+    description, apply_url, salary, posted_date, source.
+    Returns [] if file missing, invalid, or empty.
+    The list is cached per process until the file's mtime or size changes; treat it as read-only.
+    """
+    return _load_corpus()[0]
 
 
 def save_jobs_to_json(jobs: list[dict]) -> bool:
-    """Save job list to data/jobs.json. Each job must have id, title, company, apply_url, etc."""
+    """
+    Save job list to data/jobs.json. Each job must have id, title, company, apply_url, etc.
+    With the JSONL store, only new or changed jobs (and deletions of jobs not in the list) are appended.
+    """
     path = get_jobs_path()
+    if path == JOBS_JSONL_PATH:
+        try:
+            appended = _jsonl_store.replace_all(jobs)
+            logger.info("job_storage: saved %d jobs to %s (%d lines appended)", len(jobs), path, appended)
+            return True
+        except OSError as e:
+            logger.warning("job_storage: could not save %s: %s", path, e)
+            return False
+        finally:
+            invalidate_jobs_cache()
+    tmp_path = path.with_name(path.name + ".tmp")
     try:
-        with open(path, "w", encoding="utf-8") as f:
+        # Write then rename so concurrent readers never parse a half-written file
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(jobs, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
         logger.info("job_storage: saved %d jobs to %s", len(jobs), path)
         return True
     except OSError as e:
         logger.warning("job_storage: could not save %s: %s", path, e)
         return False
+    finally:
+        invalidate_jobs_cache()
+
+
+def append_jobs(jobs: list[dict]) -> list[int]:
+    """
+    Add or update jobs without rewriting the corpus (JSONL store; jobs.json is rewritten).
+    Matched by id, else (title, company); new jobs get the next id. Returns ids aligned with jobs.
+    """
+    if _use_jsonl():
+        try:
+            return _jsonl_store.merge(jobs)
+        finally:
+            invalidate_jobs_cache()
+    current = [dict(j) for j in load_jobs_from_json()]
+    by_id = {j.get("id"): j for j in current}
+    by_key = {((j.get("title") or "").strip().lower(), (j.get("company") or "").strip().lower()): j for j in current}
+    next_id = max((j["id"] for j in current if isinstance(j.get("id"), int)), default=0) + 1
+    ids: list[int] = []
+    for j in jobs:
+        existing = by_id.get(j.get("id")) or by_key.get(((j.get("title") or "").strip().lower(), (j.get("company") or "").strip().lower()))
+        if existing is not None:
+            existing.update({**j, "id": existing["id"]})
+        else:
+            existing = {**j, "id": j["id"] if isinstance(j.get("id"), int) else next_id}
+            current.append(existing)
+            by_id[existing["id"]] = existing
+            by_key[((existing.get("title") or "").strip().lower(), (existing.get("company") or "").strip().lower())] = existing
+        next_id = max(next_id, existing["id"] + 1)
+        ids.append(existing["id"])
+    save_jobs_to_json(current)
+    return ids
+
+
+def get_job(job_id: int) -> dict | None:
+    """One job by id: a single seek with the JSONL store, else a lookup in the loaded corpus."""
+    if _use_jsonl():
+        return _jsonl_store.get(job_id)
+    return next((j for j in load_jobs_from_json() if j.get("id") == job_id), None)
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def job_location_id(j: dict) -> str | None:
+    """Canonical gazetteer id of a job's location: the location_id stored at ingest, else resolved from location."""
+    return j.get("location_id") or location_id(j.get("location"))
+
+
+def job_coords(j: dict) -> tuple[float, float] | None:
+    """(lat, lon) of a job: provider coordinates when stored at ingest, else its gazetteer city; None if unknown."""
+    lat, lon = j.get("latitude"), j.get("longitude")
+    if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
+        return float(lat), float(lon)
+    return place_coords(job_location_id(j))
+
+
+class JobIndex:
+    """
+    Inverted index over a loaded job list: token -> ascending positions in the list.
+    Title, company and description share one posting table; location has its own, each with a suffix
+    array over its tokens (SubstringIndex) for substring lookups, and place_postings maps each canonical
+    location id (services/gazetteer.py) to the jobs in that area.
+    Also holds the corpus BM25 statistics used to rank matches, and coord_postings (job coordinates ->
+    positions) with a geohash index over those coordinates (services/geo.py) for radius queries. Both are
+    built with the index (under _corpus_lock when the corpus loads), so a radius query never scans the corpus.
+    """
+
+    def __init__(self, jobs: list[dict]):
+        self.jobs = jobs
+        self.text_postings: dict[str, list[int]] = {}
+        self.location_postings: dict[str, list[int]] = {}
+        self.place_postings: dict[str, list[int]] = {}
+        # Jobs share coordinates (one point per city), so points map to position lists
+        self.coord_postings: dict[tuple[float, float], list[int]] = {}
+        self.bm25 = BM25Index()
+        for pos, j in enumerate(jobs):
+            self._index(pos, j)
+        self.text_substrings = self._substrings(self.text_postings)
+        self.location_substrings = self._substrings(self.location_postings)
+        self.geo = self._geo_index(self.coord_postings)
+
+    @classmethod
+    def from_corpus(cls, corpus: JobCorpus) -> "JobIndex":
+        """Index backed by the postings and BM25 statistics stored in a mapped jobs.bin."""
+        index = cls.__new__(cls)
+        index.jobs = corpus
+        index.text_postings = corpus.text_postings
+        index.location_postings = corpus.location_postings
+        index.bm25 = corpus.bm25
+        # Files written before suffix arrays were stored get them built here, once
+        index.text_substrings = corpus.text_postings.substrings or cls._substrings(corpus.text_postings)
+        index.location_substrings = corpus.location_postings.substrings or cls._substrings(corpus.location_postings)
+        if corpus.gazetteer_version == GAZETTEER_VERSION and corpus.coord_postings is not None:
+            index.place_postings = corpus.place_postings
+            index.coord_postings = {parse_coord_token(t): corpus.coord_postings[t] for t in corpus.coord_postings}
+        else:
+            # Built with other gazetteer tables (or without coordinates): re-resolve each job's place
+            index.place_postings = {}
+            index.coord_postings = {}
+            for pos in range(len(corpus)):
+                j = corpus[pos]
+                for place_id in place_ancestors(job_location_id(j)):
+                    index.place_postings.setdefault(place_id, []).append(pos)
+                coords = job_coords(j)
+                if coords is not None:
+                    index.coord_postings.setdefault(coords, []).append(pos)
+        index.geo = cls._geo_index(index.coord_postings)
+        return index
+
+    def _index(self, pos: int, j: dict) -> None:
+        title = j.get("title") or ""
+        text = f"{title} {j.get('company') or ''} {j.get('description') or ''}"
+        for token in set(_tokenize(text)):
+            self.text_postings.setdefault(token, []).append(pos)
+        for token in set(_tokenize(j.get("location") or "")):
+            self.location_postings.setdefault(token, []).append(pos)
+        for place_id in place_ancestors(job_location_id(j)):
+            self.place_postings.setdefault(place_id, []).append(pos)
+        coords = job_coords(j)
+        if coords is not None:
+            self.coord_postings.setdefault(coords, []).append(pos)
+        # Title counted twice so a title hit outranks a passing mention in the description
+        self.bm25.add(f"{title} {text}")
+
+    @staticmethod
+    def _substrings(postings) -> SubstringIndex:
+        return SubstringIndex.build(sorted(t.encode("utf-8") for t in postings))
+
+    @staticmethod
+    def _geo_index(coord_postings) -> GeoIndex[tuple[float, float]]:
+        geo: GeoIndex[tuple[float, float]] = GeoIndex()
+        for coords in coord_postings:
+            geo.add(coords, *coords)
+        return geo
+
+    def near(self, lat: float, lon: float, radius_km: float) -> list[int]:
+        """Ascending positions of jobs within radius_km of (lat, lon)."""
+        return sorted(pos for coords, _ in self.geo.within(lat, lon, radius_km) for pos in self.coord_postings[coords])
+
+    def _intersect(self, substrings: SubstringIndex, postings, text: str) -> set[int] | None:
+        """
+        Positions with, for every token of text, some indexed word containing it: a superset of the jobs
+        where text occurs as a substring. filter_jobs matches q as a substring, so "engineer" must also find
+        "engineering" and "engineers" (and the first / last word of a phrase may be cut mid-word).
+        None if text has no tokens.
+        """
+        tokens = set(_tokenize(text))
+        if not tokens:
+            return None
+        sets: list[set[int]] = []
+        for token in tokens:
+            words = substrings.containing(token)
+            if not words:
+                return set()
+            if len(words) == 1:
+                sets.append(set(postings[words[0]]))
+            else:
+                sets.append(set().union(*(postings[w] for w in words)))
+        sets.sort(key=len)
+        result = sets[0]
+        for other in sets[1:]:
+            if not result:
+                break
+            result &= other
+        return result
+
+    def candidates(
+        self, q_norm: str, loc_norm: str, loc_place: str | None = None, near: tuple[float, float, float] | None = None,
+    ) -> list[int] | None:
+        """
+        Ascending positions that may match q/location (a superset; the caller verifies every candidate).
+        With loc_place (the canonical id of loc_norm) the location part is one place_postings lookup;
+        with near = (lat, lon, radius_km) it is a geohash radius query instead.
+        None means the index cannot narrow the search (no q/location tokens) and the caller should scan.
+        """
+        if not q_norm and not loc_norm:
+            return None
+        result: set[int] | None = None
+        if q_norm:
+            result = self._intersect(self.text_substrings, self.text_postings, q_norm)
+            if result is None:
+                return None
+        if near or loc_place:
+            by_place = self.near(*near) if near else self.place_postings.get(loc_place, ())
+            if result is None:
+                return list(by_place)
+            result.intersection_update(by_place)
+        elif loc_norm:
+            loc_result = self._intersect(self.location_substrings, self.location_postings, loc_norm)
+            if loc_result is None:
+                return None
+            result = loc_result if result is None else result & loc_result
+        return sorted(result or ())
+
+
+@timing.timed("json_load")
+def load_jobs_with_index() -> tuple[list[dict], JobIndex]:
+    """Load jobs from data/jobs.json with the inverted index used by filter_jobs (both cached together)."""
+    return _load_corpus()
 
 
 # Default location when user does not specify one (consistent across search)
 DEFAULT_LOCATION = "United States"
 
 
-def filter_jobs(jobs: list[dict], q: str, location: str) -> list[dict]:
+def _job_matches(
+    j: dict, q_norm: str, loc_norm: str, loc_place: str | None = None, near: tuple[float, float, float] | None = None,
+) -> bool:
+    """
+    q in title/company/description (substring). Location: the job lies within near = (lat, lon, radius_km)
+    for a radius search, else its canonical place lies inside loc_place when the searched location is in the
+    gazetteer, else the original substring check.
     """
-    Filter jobs by query (title, company, description) and location (substring, case-insensitive).
+    if q_norm:
+        title = (j.get("title") or "").lower()
+        company = (j.get("company") or "").lower()
+        desc = (j.get("description") or "").lower()
+        if q_norm not in title and q_norm not in company and q_norm not in desc:
+            return False
+    if near:
+        coords = job_coords(j)
+        return coords is not None and haversine_km(near[0], near[1], *coords) <= near[2]
+    if loc_place:
+        return within(job_location_id(j), loc_place)
+    if loc_norm and loc_norm not in (j.get("location") or "").lower():
+        return False
+    return True
+
+
+@timing.timed("filter")
+def filter_jobs(
+    jobs: list[dict], q: str, location: str, index: JobIndex | None = None, radius_km: float | None = None,
+) -> list[dict]:
+    """
+    Filter jobs by query (title, company, description; substring, case-insensitive) and location
+    (gazetteer area, e.g. "Germany" matches "Munich"; substring when the location is not in the gazetteer).
+    With radius_km and a location that geocodes to a city, location means "within radius_km of that city".
     If q/location empty, no filter on that field. Returns up to MAX_JOBS_FROM_JSON.
+    With an index built over the same list (and JOB_FILTER_MODE=index), only posting-list
+    candidates are checked; otherwise every job is scanned. With an index and JOB_RANKING_ENGINE=bm25,
+    the best BM25 matches for q are returned instead of the first ones in file order.
     """
     q_norm = (q or "").strip().lower()
     loc_norm = (location or "").strip().lower()
+    loc_place = location_id(loc_norm) if loc_norm else None
+    center = geocode(loc_norm) if loc_norm and radius_km and radius_km > 0 else None
+    near = (center[0], center[1], float(radius_km)) if center else None
+    indexed = index is not None and index.jobs is jobs
+    positions: list[int] | None = None
+    if indexed and JOB_FILTER_MODE == "index":
+        positions = index.candidates(q_norm, loc_norm, loc_place, near)
+    if indexed and q_norm and JOB_RANKING_ENGINE == "bm25":
+        matching = [
+            pos for pos in (range(len(jobs)) if positions is None else positions)
+            if _job_matches(jobs[pos], q_norm, loc_norm, loc_place, near)
+        ]
+        return [jobs[pos] for pos in index.bm25.top_k(q_norm, matching, MAX_JOBS_FROM_JSON)]
+    candidates = jobs if positions is None else (jobs[pos] for pos in positions)
     out: list[dict] = []
-    for j in jobs:
-        title = (j.get("title") or "").lower()
-        company = (j.get("company") or "").lower()
-        desc = (j.get("description") or "").lower()
-        loc = (j.get("location") or "").lower()
-        if q_norm and q_norm not in title and q_norm not in company and q_norm not in desc:
-            continue
-        if loc_norm and loc_norm not in loc:
+    for j in candidates:
+        if not _job_matches(j, q_norm, loc_norm, loc_place, near):
             continue
         out.append(j)
         if len(out) >= MAX_JOBS_FROM_JSON:
@@ -82,6 +482,6 @@ def filter_jobs(jobs: list[dict], q: str, location: str) -> list[dict]:
     return out
 
 
-def filter_jobs_query_only(jobs: list[dict], q: str) -> list[dict]:
+def filter_jobs_query_only(jobs: list[dict], q: str, index: JobIndex | None = None) -> list[dict]:
     """Filter jobs by query only (ignore location). Use when location filter returns nothing so we still show jobs."""
-    return filter_jobs(jobs, q, "")
+    return filter_jobs(jobs, q, "", index=index)
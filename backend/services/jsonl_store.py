@@ -0,0 +1,263 @@
+"""
+Append-only JSONL job store: one job per line in data/jobs.jsonl. Saving a changed job appends a new
+line (the last line for an id wins); {"id": n, "deleted": true} removes a job. Nothing is rewritten
+until compact().
+
+A sidecar offset index (jobs.jsonl.idx, one "id offset length live" line per data line) maps each id to
+its latest line, so get() is a seek and one line parse. The index is appended after the data, so after
+a crash it can only lag; a lagging index is caught up by scanning the data file's tail, and an index
+that does not match the data (e.g. compacted by another process) is rebuilt.
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+def _dump_line(record: dict) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _job_key(j: dict) -> tuple[str, str]:
+    return (j.get("title") or "").strip().lower(), (j.get("company") or "").strip().lower()
+
+
+class JsonlJobStore:
+    def __init__(self, path: Path):
+        self.path = path
+        self.index_path = path.with_name(path.name + ".idx")
+        self._lock = threading.RLock()
+        # id -> (offset, length) of the latest live line; None until loaded
+        self._offsets: dict[int, tuple[int, int]] | None = None
+        # (inode, bytes of the data file the offsets cover)
+        self._covered: tuple[int, int] = (0, 0)
+
+    # --- index ---
+
+    def _read_index_file(self) -> tuple[dict[int, tuple[int, int]], int]:
+        offsets: dict[int, tuple[int, int]] = {}
+        covered = 0
+        try:
+            with open(self.index_path, "r", encoding="ascii") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 4:
+                        continue
+                    job_id, offset, length, live = (int(p) for p in parts)
+                    if live:
+                        offsets[job_id] = (offset, length)
+                    else:
+                        offsets.pop(job_id, None)
+                    covered = max(covered, offset + length)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("jsonl_store: unreadable index %s (%s); rebuilding", self.index_path, e)
+            return {}, 0
+        return offsets, covered
+
+    def _scan(self, start: int) -> Iterator[tuple[int, int, dict]]:
+        """(offset, length, record) for each complete line from byte start."""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # partial last line of an interrupted append
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    logger.warning("jsonl_store: skipping bad line at offset %d in %s", offset, self.path)
+                    offset += len(raw)
+                    continue
+                if isinstance(record, dict) and isinstance(record.get("id"), int):
+                    yield offset, len(raw), record
+                offset += len(raw)
+
+    def _catch_up(self, offsets: dict[int, tuple[int, int]], start: int) -> int:
+        """Index data lines from byte start (appending them to the index file); returns bytes covered."""
+        covered = start
+        lines = []
+        for offset, length, record in self._scan(start):
+            live = not record.get("deleted")
+            if live:
+                offsets[record["id"]] = (offset, length)
+            else:
+                offsets.pop(record["id"], None)
+            lines.append(f"{record['id']} {offset} {length} {int(live)}\n")
+            covered = offset + length
+        if lines:
+            with open(self.index_path, "a", encoding="ascii") as f:
+                f.writelines(lines)
+        return covered
+
+    def _ensure_index(self, rebuild: bool = False) -> dict[int, tuple[int, int]]:
+        """Offsets for the current data file. Caller holds the lock."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._offsets, self._covered = {}, (0, 0)
+            return self._offsets
+        if not rebuild and self._offsets is not None and self._covered == (st.st_ino, st.st_size):
+            return self._offsets
+        offsets, covered = ({}, 0) if rebuild else self._read_index_file()
+        if covered > st.st_size:
+            offsets, covered = {}, 0
+        if covered == 0:
+            # Fresh index: start the file over instead of appending to a stale one
+            open(self.index_path, "w").close()
+        covered = self._catch_up(offsets, covered)
+        self._offsets, self._covered = offsets, (st.st_ino, covered)
+        return offsets
+
+    # --- reads ---
+
+    def get(self, job_id: int) -> dict | None:
+        """One job by id, read by seeking to its latest line."""
+        with self._lock:
+            for attempt in range(2):
+                loc = self._ensure_index(rebuild=attempt > 0).get(job_id)
+                if loc is None:
+                    return None
+                try:
+                    with open(self.path, "rb") as f:
+                        f.seek(loc[0])
+                        record = json.loads(f.read(loc[1]))
+                    if isinstance(record, dict) and record.get("id") == job_id:
+                        return record
+                except (OSError, ValueError):
+                    pass
+                logger.warning("jsonl_store: index entry for id=%s does not match %s; rebuilding", job_id, self.path)
+        return None
+
+    def ids(self) -> list[int]:
+        with self._lock:
+            return list(self._ensure_index())
+
+    def load_all(self) -> list[dict]:
+        """Every live job (latest version), in order of first appearance. Reads the file sequentially."""
+        jobs: dict[int, dict] = {}
+        try:
+            for _, _, record in self._scan(0):
+                if record.get("deleted"):
+                    jobs.pop(record["id"], None)
+                else:
+                    jobs[record["id"]] = record
+        except FileNotFoundError:
+            return []
+        return list(jobs.values())
+
+    # --- writes ---
+
+    def _append(self, records: list[dict]) -> None:
+        """Append lines to the data file, then to the index. Caller holds the lock."""
+        if not records:
+            return
+        offsets = self._ensure_index()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        index_lines = []
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            for record in records:
+                line = _dump_line(record)
+                f.write(line)
+                live = not record.get("deleted")
+                if live:
+                    offsets[record["id"]] = (offset, len(line))
+                else:
+                    offsets.pop(record["id"], None)
+                index_lines.append(f"{record['id']} {offset} {len(line)} {int(live)}\n")
+                offset += len(line)
+        with open(self.index_path, "a", encoding="ascii") as f:
+            f.writelines(index_lines)
+        self._covered = (os.stat(self.path).st_ino, offset)
+
+    def merge(self, jobs: Iterable[dict]) -> list[int]:
+        """
+        Upsert jobs: same id, else same (title, company), updates that job's fields; otherwise a new id is assigned.
+        Only new or changed jobs are appended. Returns the ids, aligned with jobs.
+        """
+        with self._lock:
+            current = {j["id"]: j for j in self.load_all()}
+            by_key = {_job_key(j): job_id for job_id, j in current.items()}
+            next_id = max(current, default=0) + 1
+            out: list[int] = []
+            changed: list[dict] = []
+            for j in jobs:
+                job_id = j.get("id") if isinstance(j.get("id"), int) else by_key.get(_job_key(j))
+                if job_id is None:
+                    job_id, next_id = next_id, next_id + 1
+                next_id = max(next_id, job_id + 1)
+                record = {**current.get(job_id, {}), **j, "id": job_id}
+                if current.get(job_id) != record:
+                    changed.append(record)
+                    current[job_id] = record
+                    by_key[_job_key(record)] = job_id
+                out.append(job_id)
+            self._append(changed)
+            return out
+
+    def replace_all(self, jobs: list[dict]) -> int:
+        """Make the store hold exactly jobs: append changed/new ones and deletions. Returns lines appended."""
+        with self._lock:
+            current = {j["id"]: j for j in self.load_all()}
+            next_id = max(current, default=0) + 1
+            records: list[dict] = []
+            keep: set[int] = set()
+            for j in jobs:
+                if not isinstance(j.get("id"), int):
+                    j = {**j, "id": next_id}
+                next_id = max(next_id, j["id"] + 1)
+                keep.add(j["id"])
+                if current.get(j["id"]) != j:
+                    records.append(j)
+            records.extend({"id": job_id, "deleted": True} for job_id in current if job_id not in keep)
+            self._append(records)
+            return len(records)
+
+    def compact(self) -> tuple[int, int]:
+        """Rewrite the file with only live lines (temp files + rename). Returns (bytes before, bytes after)."""
+        with self._lock:
+            jobs = self.load_all()
+            before = self.path.stat().st_size if self.path.exists() else 0
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_index = self.index_path.with_name(self.index_path.name + ".tmp")
+            offset = 0
+            with open(tmp_path, "wb") as f, open(tmp_index, "w", encoding="ascii") as idx:
+                for j in jobs:
+                    line = _dump_line(j)
+                    f.write(line)
+                    idx.write(f"{j['id']} {offset} {len(line)} 1\n")
+                    offset += len(line)
+            os.replace(tmp_path, self.path)
+            os.replace(tmp_index, self.index_path)
+            self._offsets = None
+            self._ensure_index()
+            logger.info("jsonl_store: compacted %s from %d to %d bytes (%d jobs)", self.path, before, offset, len(jobs))
+            return before, offset
+
+    def migrate_from_json(self, json_path: Path) -> int:
+        """Load a jobs.json array into this store (merged by id). Returns jobs read."""
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        jobs = [j for j in data if isinstance(j, dict)] if isinstance(data, list) else []
+        self.merge(jobs)
+        return len(jobs)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            live = len(self._ensure_index())
+            lines = 0
+            if self.path.exists():
+                with open(self.path, "rb") as f:
+                    lines = sum(1 for _ in f)
+            return {
+                "live_jobs": live,
+                "lines": lines,
+                "superseded_lines": max(0, lines - live),
+                "bytes": self.path.stat().st_size if self.path.exists() else 0,
+            }
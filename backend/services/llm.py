@@ -1,9 +1,12 @@
 """
 LLM calls (OpenAI-compatible). Uses OPENAI_API_KEY from env. Mock when no key or on error.
+feature (e.g. "resume_ai", "career_chat") labels the call's latency and token metrics.
 """
 import os
 import logging
 
+from services import metrics, timing
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,47 +17,59 @@ def _get_config() -> tuple[str | None, str | None, str]:
     return key or None, base_url, model
 
 
-def complete(system: str, user: str, max_tokens: int = 1024) -> str:
+@timing.timed("llm")
+def complete(system: str, user: str, max_tokens: int = 1024, feature: str = "other") -> str:
     """Single completion. Returns plain text."""
     api_key, base_url, model = _get_config()
-    if not api_key:
-        logger.debug("OPENAI_API_KEY not set; using mock LLM")
-        return _mock_complete(system, user)
-    try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key, base_url=base_url)
-        r = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            max_tokens=max_tokens,
-        )
-        if r.choices and r.choices[0].message.content:
-            return r.choices[0].message.content.strip()
-    except Exception as e:
-        logger.warning("OpenAI call failed: %s; using mock", e)
+    with metrics.llm_call(feature) as call:
+        if not api_key:
+            logger.debug("OPENAI_API_KEY not set; using mock LLM")
+            call.outcome = "mock"
+            return _mock_complete(system, user)
+        try:
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, base_url=base_url)
+            r = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user},
+                ],
+                max_tokens=max_tokens,
+            )
+            call.usage(getattr(r, "usage", None))
+            if r.choices and r.choices[0].message.content:
+                return r.choices[0].message.content.strip()
+            call.outcome = "empty"
+        except Exception as e:
+            logger.warning("OpenAI call failed: %s; using mock", e)
+            call.outcome = "error"
     return _mock_complete(system, user)
 
 
-def chat_completion(messages: list[dict[str, str]], max_tokens: int = 1024) -> str:
+@timing.timed("llm")
+def chat_completion(messages: list[dict[str, str]], max_tokens: int = 1024, feature: str = "other") -> str:
     """Multi-turn chat. messages = [{"role": "user"|"assistant"|"system", "content": "..."}]"""
     api_key, base_url, model = _get_config()
-    if not api_key:
-        return _mock_complete("", messages[-1].get("content", "") if messages else "")
-    try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key, base_url=base_url)
-        r = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            max_tokens=max_tokens,
-        )
-        if r.choices and r.choices[0].message.content:
-            return r.choices[0].message.content.strip()
-    except Exception as e:
-        logger.warning("OpenAI chat failed: %s; using mock", e)
+    with metrics.llm_call(feature) as call:
+        if not api_key:
+            call.outcome = "mock"
+            return _mock_complete("", messages[-1].get("content", "") if messages else "")
+        try:
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, base_url=base_url)
+            r = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+            )
+            call.usage(getattr(r, "usage", None))
+            if r.choices and r.choices[0].message.content:
+                return r.choices[0].message.content.strip()
+            call.outcome = "empty"
+        except Exception as e:
+            logger.warning("OpenAI chat failed: %s; using mock", e)
+            call.outcome = "error"
     return _mock_complete("", messages[-1].get("content", "") if messages else "")
 
 
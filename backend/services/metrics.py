@@ -0,0 +1,461 @@
+"""
+In-process metrics (counters, gauges, histograms) exposed in the Prometheus text format at GET /metrics.
+
+Metrics are defined at the bottom of this module: HTTP request latency per route template, provider call
+latency and outcome, cache lookups, DB pool checkout wait and connections, LLM latency and tokens per feature,
+and threadpool load. Gauges can be read from a callback at collection time (pool size, threadpool queue).
+
+Multiple uvicorn workers: set METRICS_DIR to a directory shared by the workers (empty it before starting
+the server). Each worker writes a snapshot of its metrics to METRICS_DIR/<pid>.json every
+METRICS_FLUSH_INTERVAL seconds (atomically, via rename) and on shutdown; whichever worker serves /metrics
+merges all snapshots. Counters and histograms are summed over every snapshot, including workers that have
+exited; gauges are summed over live workers only.
+"""
+import asyncio
+import contextlib
+import contextvars
+import json
+import logging
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+from urllib.parse import unquote
+
+logger = logging.getLogger(__name__)
+
+# "0" disables metrics (no /metrics route, no recording); on by default
+METRICS = (os.environ.get("METRICS") or "1").strip().lower() in ("1", "true", "on", "yes")
+# Shared directory for per-worker snapshots (multiple uvicorn workers); unset = this process only
+METRICS_DIR = (os.environ.get("METRICS_DIR") or "").strip() or None
+# Seconds between snapshot writes to METRICS_DIR
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL") or "1")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request / provider / LLM latency buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# DB pool checkout wait buckets (seconds); uncontended checkouts take microseconds
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+_lock = threading.Lock()
+_registry: dict[str, "_Metric"] = {}
+
+
+def enabled() -> bool:
+    return METRICS
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> list[tuple[tuple[str, ...], Any]]:
+        with _lock:
+            return [(key, _copy(value)) for key, value in self._values.items()]
+
+
+def _copy(value: Any) -> Any:
+    return [list(value[0]), value[1]] if isinstance(value, list) else value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if not METRICS:
+            return
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._callback: Callable[[], dict[tuple[str, ...], float]] | None = None
+
+    def set(self, value: float, **labels) -> None:
+        if not METRICS:
+            return
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = float(value)
+
+    def set_function(self, callback: Callable[[], dict[tuple[str, ...], float]]) -> None:
+        """Read the gauge from callback() at collection time: {label values tuple: value} (replaces any earlier one)."""
+        self._callback = callback
+
+    def samples(self) -> list[tuple[tuple[str, ...], Any]]:
+        values = dict(super().samples())
+        if self._callback is not None:
+            try:
+                values.update((key, float(value)) for key, value in self._callback().items())
+            except Exception as e:
+                logger.debug("metrics: gauge %s callback failed: %s", self.name, e)
+        return list(values.items())
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        """Count value in its bucket (non-cumulative here; rendering accumulates) and add it to the sum."""
+        if not METRICS:
+            return
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with _lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+
+def _register(metric: _Metric) -> Any:
+    with _lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            if existing.kind != metric.kind:
+                raise ValueError(f"metric {metric.name} already registered as a {existing.kind}")
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    return _register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+    return _register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+# --- Snapshots, merging and exposition ---
+
+
+def snapshot() -> dict[str, dict]:
+    """This process's metrics as plain JSON-able data (gauge callbacks evaluated now)."""
+    out = {}
+    for metric in list(_registry.values()):
+        out[metric.name] = {
+            "kind": metric.kind,
+            "help": metric.documentation,
+            "labelnames": list(metric.labelnames),
+            "buckets": list(getattr(metric, "buckets", ())),
+            "samples": [[list(key), value] for key, value in metric.samples()],
+        }
+    return out
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _merge(into: dict[str, dict], snap: dict[str, dict], live: bool) -> None:
+    for name, data in snap.items():
+        if data["kind"] == "gauge" and not live:
+            continue
+        target = into.get(name)
+        if target is None:
+            target = into[name] = {**data, "samples": {}}
+        elif target["kind"] != data["kind"] or target["buckets"] != data["buckets"]:
+            continue
+        samples = target["samples"]
+        for labels, value in data["samples"]:
+            key = tuple(labels)
+            if data["kind"] == "histogram":
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = [list(value[0]), value[1]]
+                else:
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+            else:
+                samples[key] = samples.get(key, 0.0) + value
+
+
+def collect() -> dict[str, dict]:
+    """Metrics of this process, plus every worker snapshot in METRICS_DIR, merged."""
+    merged: dict[str, dict] = {}
+    _merge(merged, snapshot(), live=True)
+    if METRICS_DIR:
+        own = f"{os.getpid()}.json"
+        for path in Path(METRICS_DIR).glob("*.json"):
+            if path.name == own:
+                continue
+            try:
+                snap = json.loads(path.read_text(encoding="utf-8"))
+                pid = int(path.stem)
+            except (OSError, ValueError) as e:
+                logger.debug("metrics: skipping %s: %s", path, e)
+                continue
+            _merge(merged, snap, live=_pid_alive(pid))
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """Prometheus text exposition (version 0.0.4) of collect()."""
+    lines = []
+    for name, data in sorted(collect().items()):
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['kind']}")
+        names = data["labelnames"]
+        for key, value in sorted(data["samples"].items()):
+            if data["kind"] != "histogram":
+                lines.append(f"{name}{_labels(names, key)} {_number(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip(list(data["buckets"]) + [math.inf], counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{name}_bucket{_labels(names, key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, key)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(names, key)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Multiprocess snapshots ---
+
+_flusher: threading.Thread | None = None
+_stop = threading.Event()
+
+
+def flush() -> None:
+    """Write this process's snapshot to METRICS_DIR/<pid>.json (no-op without METRICS_DIR)."""
+    if not (METRICS and METRICS_DIR):
+        return
+    directory = Path(METRICS_DIR)
+    path = directory / f"{os.getpid()}.json"
+    tmp = directory / f".{os.getpid()}.json.tmp"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(snapshot(), separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("metrics: could not write %s: %s", path, e)
+
+
+def _flush_loop() -> None:
+    while not _stop.wait(METRICS_FLUSH_INTERVAL):
+        flush()
+
+
+def start() -> None:
+    """Start writing snapshots to METRICS_DIR in the background (app startup; no-op without METRICS_DIR)."""
+    global _flusher
+    if not (METRICS and METRICS_DIR) or _flusher is not None:
+        return
+    _stop.clear()
+    _flusher = threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True)
+    _flusher.start()
+    flush()
+
+
+def stop() -> None:
+    """Stop the snapshot writer and write a final snapshot (app shutdown)."""
+    global _flusher
+    _stop.set()
+    if _flusher is not None:
+        _flusher.join(timeout=5)
+        _flusher = None
+    flush()
+
+
+# --- Metrics ---
+
+HTTP_REQUEST_DURATION = histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"],
+)
+PROVIDER_REQUEST_DURATION = histogram(
+    "job_provider_request_duration_seconds",
+    "Job provider call latency by provider and outcome (ok, empty, error, skipped, cancelled)",
+    ["provider", "outcome"],
+)
+CACHE_LOOKUPS = counter("cache_lookups_total", "Cache lookups by cache and result (hit, stale, miss)", ["cache", "result"])
+DB_POOL_CHECKOUT_WAIT = histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a connection from the DB pool", buckets=WAIT_BUCKETS,
+)
+DB_POOL_CONNECTIONS = gauge("db_pool_connections", "DB pool connections by state (checked_out, idle, overflow)", ["state"])
+LLM_REQUEST_DURATION = histogram(
+    "llm_request_duration_seconds", "LLM call latency by feature and outcome (ok, empty, error, mock)",
+    ["feature", "outcome"],
+)
+LLM_TOKENS = counter("llm_tokens_total", "LLM tokens used by feature and kind (prompt, completion)", ["feature", "kind"])
+THREADPOOL_THREADS = gauge(
+    "threadpool_threads", "Threadpool running sync endpoints: busy and max threads", ["state"],
+)
+THREADPOOL_QUEUE_DEPTH = gauge("threadpool_queue_depth", "Tasks waiting for a threadpool thread")
+
+
+def route_template(scope: dict) -> str:
+    """
+    Route label for a handled request: its path with path parameter values put back as {name}
+    (/api/ai/conversations/{conversation_id}/messages), so the label set stays bounded. "unmatched" if no route matched.
+    """
+    if scope.get("route") is None and scope.get("endpoint") is None:
+        return "unmatched"
+    params = {str(value): name for name, value in (scope.get("path_params") or {}).items()}
+    segments = scope.get("path", "").split("/")
+    return "/".join("{" + params[unquote(s)] + "}" if unquote(s) in params else s for s in segments)
+
+
+def cache_lookup(cache: str, result: str) -> None:
+    CACHE_LOOKUPS.inc(cache=cache, result=result)
+
+
+class ProviderCall:
+    """One provider call in progress; see provider_call()."""
+    __slots__ = ("outcome",)
+
+    def __init__(self):
+        self.outcome: str | None = None
+
+    def result(self, jobs: list) -> list:
+        """Record ok / empty from the jobs returned (unless the provider already reported error / skipped)."""
+        if self.outcome is None:
+            self.outcome = "ok" if jobs else "empty"
+        return jobs
+
+
+_provider_call: contextvars.ContextVar[ProviderCall | None] = contextvars.ContextVar("provider_call", default=None)
+
+
+@contextlib.contextmanager
+def provider_call(provider: str):
+    """
+    Time a provider call into job_provider_request_duration_seconds. Outcome: call.result(jobs) -> ok / empty,
+    provider_failed() / provider_skipped() inside the call -> error / skipped, an exception -> error,
+    cancellation (fan-out deadline) -> cancelled.
+    """
+    call = ProviderCall()
+    token = _provider_call.set(call)
+    started = time.perf_counter()
+    try:
+        yield call
+    except asyncio.CancelledError:
+        call.outcome = "cancelled"
+        raise
+    except BaseException:
+        call.outcome = "error"
+        raise
+    finally:
+        _provider_call.reset(token)
+        PROVIDER_REQUEST_DURATION.observe(time.perf_counter() - started, provider=provider, outcome=call.outcome or "ok")
+
+
+def provider_failed() -> None:
+    """Mark the current provider call as an error (providers that log and return [] on failure)."""
+    call = _provider_call.get()
+    if call is not None:
+        call.outcome = "error"
+
+
+def provider_skipped() -> None:
+    """Mark the current provider call as skipped (provider not configured, no request made)."""
+    call = _provider_call.get()
+    if call is not None and call.outcome is None:
+        call.outcome = "skipped"
+
+
+class LLMCall:
+    """One LLM call in progress; see llm_call()."""
+    __slots__ = ("feature", "outcome")
+
+    def __init__(self, feature: str):
+        self.feature = feature
+        self.outcome = "ok"
+
+    def usage(self, usage: Any) -> None:
+        """Count prompt / completion tokens from an OpenAI response's usage (if present)."""
+        for kind in ("prompt", "completion"):
+            tokens = getattr(usage, f"{kind}_tokens", None) if usage is not None else None
+            if tokens:
+                LLM_TOKENS.inc(tokens, feature=self.feature, kind=kind)
+
+
+@contextlib.contextmanager
+def llm_call(feature: str):
+    """Time an LLM call into llm_request_duration_seconds; set call.outcome for mock / empty / error results."""
+    call = LLMCall(feature)
+    started = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call.outcome = "error"
+        raise
+    finally:
+        LLM_REQUEST_DURATION.observe(time.perf_counter() - started, feature=feature, outcome=call.outcome)
+
+
+def watch_pool(pool) -> None:
+    """Report a QueuePool's checked-out / idle / overflow connections as db_pool_connections."""
+    def read() -> dict[tuple[str, ...], float]:
+        return {
+            ("checked_out",): pool.checkedout(),
+            ("idle",): pool.checkedin(),
+            ("overflow",): max(0, pool.overflow()),
+        }
+    DB_POOL_CONNECTIONS.set_function(read)
+
+
+def watch_threadpool(limiter) -> None:
+    """Report an anyio CapacityLimiter (the sync endpoint threadpool) as threadpool_threads / _queue_depth."""
+    THREADPOOL_THREADS.set_function(lambda: {
+        ("busy",): limiter.borrowed_tokens,
+        ("max",): limiter.total_tokens,
+    })
+    THREADPOOL_QUEUE_DEPTH.set_function(lambda: {(): limiter.statistics().tasks_waiting})
@@ -0,0 +1,95 @@
+"""
+Streaming, cursor-paginated provider fetches.
+
+follow_pages() turns a page fetcher (cursor -> (jobs, next cursor)) into an iterator of jobs that stops at
+the page or result cap, an empty page, or a missing / repeated cursor. stream_merged() runs several such
+iterators on a bounded thread pool and yields their items as they arrive, so the next page of one source is
+requested while the caller is still handling the previous one and slow sources do not hold up fast ones.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# (jobs on this page, cursor of the next page or None)
+PageFetch = Callable[[Any], tuple[list[dict], Any]]
+
+_DONE = object()
+
+
+def follow_pages(fetch_page: PageFetch, first_cursor: Any = None, max_pages: int = 5, max_results: int = 100) -> Iterator[dict]:
+    """Jobs from fetch_page(first_cursor), then from each next cursor, up to max_pages pages / max_results jobs."""
+    cursor = first_cursor
+    seen = set()
+    count = 0
+    for _ in range(max(1, max_pages)):
+        jobs, next_cursor = fetch_page(cursor)
+        for j in jobs:
+            if count >= max_results:
+                return
+            yield j
+            count += 1
+        seen.add(cursor)
+        if not jobs or next_cursor is None or next_cursor in seen:
+            return
+        cursor = next_cursor
+
+
+def stream_merged(
+    streams: list[Callable[[], Iterable[T]]],
+    max_workers: int = 4,
+    on_done: Callable[[int, int, Exception | None], None] | None = None,
+    buffer: int = 256,
+) -> Iterator[tuple[int, T]]:
+    """
+    (stream index, item) from every stream, in arrival order; at most max_workers streams run at once.
+    A stream that raises stops there (its earlier items are kept); on_done(index, items, error) is called
+    as each stream finishes. Closing the iterator early stops the workers after their current item.
+    """
+    if not streams:
+        return
+    items: queue.Queue = queue.Queue(maxsize=max(1, buffer))
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(i: int) -> None:
+        count, error = 0, None
+        try:
+            for item in streams[i]():
+                if not put((i, item)):
+                    return
+                count += 1
+        except Exception as e:
+            logger.warning("pagination: stream %d failed after %d items: %s", i, count, e)
+            error = e
+        put((i, _DONE, count, error))
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="pages")
+    try:
+        for i in range(len(streams)):
+            pool.submit(run, i)
+        remaining = len(streams)
+        while remaining:
+            entry = items.get()
+            if entry[1] is _DONE:
+                remaining -= 1
+                if on_done is not None:
+                    on_done(entry[0], entry[2], entry[3])
+                continue
+            yield entry
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
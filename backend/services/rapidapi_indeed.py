@@ -2,11 +2,16 @@
 RapidAPI Indeed: fetch company jobs from indeed12.p.rapidapi.com.
 Uses RAPIDAPI_KEY or RAPIDAPI_INDEED_KEY from env.
 Returns list of JobDict (title, company, location, description, apply_url, salary, posted_date).
+fetch_company_jobs_page() also returns the next_start cursor; iter_company_jobs() follows it.
 """
 import os
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from services import metrics
+from services.http_client import get_client
+from services.pagination import follow_pages
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +25,13 @@ except ImportError:
 JobDict = dict[str, Any]
 
 RAPIDAPI_HOST = "indeed12.p.rapidapi.com"
-RAPIDAPI_BASE = "https://indeed12.p.rapidapi.com"
+# Base URL override, e.g. scripts/provider_standin.py for offline runs
+RAPIDAPI_BASE = (os.environ.get("RAPIDAPI_BASE") or "https://indeed12.p.rapidapi.com").rstrip("/")
 MAX_JOBS_PER_COMPANY = 20
+RAPIDAPI_TIMEOUT = float(os.environ.get("RAPIDAPI_TIMEOUT") or "25")
+# Paginated fetches (iter_company_jobs): max pages and max jobs per company
+RAPIDAPI_MAX_PAGES = int(os.environ.get("RAPIDAPI_MAX_PAGES") or "5")
+RAPIDAPI_MAX_RESULTS = int(os.environ.get("RAPIDAPI_MAX_RESULTS") or "100")
 
 
 def _get_api_key() -> str:
@@ -63,26 +73,48 @@ def fetch_company_jobs(
     company: str,
     locality: str = "us",
     start: int = 1,
+    raise_errors: bool = False,
 ) -> list[JobDict]:
     """
-    Fetch jobs for one company from RapidAPI Indeed.
+    Fetch jobs for one company from RapidAPI Indeed (one page, up to MAX_JOBS_PER_COMPANY).
     GET /company/{company}/jobs?locality=us&start=1
-    Returns [] if key missing, request fails, or no jobs.
+    Returns [] if key missing, request fails, or no jobs (with raise_errors, a failed request raises its httpx error).
+    """
+    jobs, _ = fetch_company_jobs_page(company, locality=locality, start=start, raise_errors=raise_errors)
+    return jobs[:MAX_JOBS_PER_COMPANY]
+
+
+def fetch_company_jobs_page(
+    company: str,
+    locality: str = "us",
+    start: int = 1,
+    raise_errors: bool = False,
+) -> tuple[list[JobDict], int | None]:
     """
+    One page of a company's jobs and the response's next_start (None on the last page).
+    ([], None) if key missing, request fails, or no jobs (with raise_errors, a failed request raises).
+    """
+    with metrics.provider_call("indeed") as call:
+        jobs, next_start = _company_jobs_page(company, locality, start, raise_errors)
+        return call.result(jobs), next_start
+
+
+def _company_jobs_page(company: str, locality: str, start: int, raise_errors: bool) -> tuple[list[JobDict], int | None]:
     api_key = _get_api_key()
     if not api_key:
         logger.info("rapidapi_indeed: RAPIDAPI_KEY not set; skipping")
-        return []
+        metrics.provider_skipped()
+        return [], None
 
     try:
         import httpx
     except ImportError:
         logger.warning("rapidapi_indeed: httpx not installed")
-        return []
+        return [], None
 
     company_slug = (company or "").strip().replace(" ", "%20")
     if not company_slug:
-        return []
+        return [], None
     url = f"{RAPIDAPI_BASE}/company/{company_slug}/jobs"
     params: dict[str, Any] = {"locality": locality or "us", "start": max(1, start)}
     headers = {
@@ -91,16 +123,21 @@ def fetch_company_jobs(
     }
 
     try:
-        with httpx.Client(timeout=25.0) as client:
-            resp = client.get(url, params=params, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = get_client("rapidapi", RAPIDAPI_TIMEOUT).get(url, params=params, headers=headers)
+        resp.raise_for_status()
+        data = resp.json()
     except httpx.HTTPStatusError as e:
         logger.warning("rapidapi_indeed: HTTP %s for company=%s - %s", e.response.status_code, company, e.response.text[:200])
-        return []
+        metrics.provider_failed()
+        if raise_errors:
+            raise
+        return [], None
     except Exception as e:
         logger.warning("rapidapi_indeed: request failed for company=%s: %s", company, e)
-        return []
+        metrics.provider_failed()
+        if raise_errors:
+            raise
+        return [], None
 
     # Indeed12 RapidAPI returns { "count", "hits": [...], "indeed_final_url", "next_start", "prev_start" }
     jobs_raw: list[dict] = []
@@ -109,14 +146,31 @@ def fetch_company_jobs(
     elif isinstance(data, dict):
         jobs_raw = data.get("hits") or data.get("jobs") or data.get("results") or data.get("data") or []
     if not isinstance(jobs_raw, list):
-        return []
+        return [], None
+    next_start = data.get("next_start") if isinstance(data, dict) else None
+    if not isinstance(next_start, int) or next_start <= params["start"]:
+        next_start = None
 
     out: list[JobDict] = []
     company_name = company_slug.replace("%20", " ")
-    for r in jobs_raw[:MAX_JOBS_PER_COMPANY]:
+    for r in jobs_raw:
         if not isinstance(r, dict):
             continue
         out.append(_normalize_job(r, company_name))
     if out:
-        logger.info("rapidapi_indeed: got %d jobs for company=%s", len(out), company)
-    return out
+        logger.info("rapidapi_indeed: got %d jobs for company=%s start=%s", len(out), company, params["start"])
+    return out, next_start
+
+
+def iter_company_jobs(
+    company: str,
+    locality: str = "us",
+    max_pages: int = RAPIDAPI_MAX_PAGES,
+    max_results: int = RAPIDAPI_MAX_RESULTS,
+) -> Iterator[JobDict]:
+    """A company's jobs page by page (following next_start), yielded as each page arrives."""
+    return follow_pages(
+        lambda start: fetch_company_jobs_page(company, locality=locality, start=start or 1),
+        max_pages=max_pages,
+        max_results=max_results,
+    )
@@ -0,0 +1,57 @@
+"""
+Client-side rate limiting for job provider APIs: a token bucket per provider (steady rate plus a burst
+allowance) and a bound on in-flight requests. Thread-safe; acquire() blocks until a request may go out.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float | None = None):
+        """rate = tokens added per second (<= 0 means unlimited); capacity = burst size (default: max(1, rate))."""
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, sleeping until they are available. Returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, seconds: float) -> None:
+        """Hold off all callers for about this long (e.g. after a 429 with Retry-After)."""
+        if self.rate <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class ProviderLimiter:
+    """Token bucket plus max concurrent requests for one provider."""
+
+    def __init__(self, name: str, rate: float, burst: float | None = None, max_concurrency: int = 4):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+
+    @contextmanager
+    def request(self):
+        """Hold a concurrency slot and one token for the duration of a request."""
+        with self._slots:
+            self.bucket.acquire()
+            yield
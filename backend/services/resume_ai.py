@@ -45,7 +45,7 @@ def generate_resume(
         "Professional Summary, Experience, Education, Skills. Format with clear headings and bullet points. "
         "Reply with ONLY the resume text, no preamble or explanation. Do not invent details; use only what is provided."
     )
-    return complete(system, user_content[:6000], max_tokens=2048)
+    return complete(system, user_content[:6000], max_tokens=2048, feature="resume_ai")
 
 
 def evaluate_resume(resume_text: str, job_description: str | None = None) -> dict:
@@ -63,7 +63,7 @@ def evaluate_resume(resume_text: str, job_description: str | None = None) -> dic
         "Give 4 categories and 3-5 short feedback tips. overall_score must be 0-100."
     )
     user_msg = f"Resume to evaluate:\n{resume_text[:6000]}{job_ctx}"
-    raw = complete(system, user_msg, max_tokens=800)
+    raw = complete(system, user_msg, max_tokens=800, feature="resume_ai")
     try:
         text = raw.strip()
         if "```" in text:
@@ -107,7 +107,7 @@ def improve_resume(resume_text: str, job_description: str | None = None) -> dict
         "Reply with ONLY the improved resume text, no preamble or explanation."
     )
     user = f"Resume to improve:\n{resume_text[:8000]}{job_ctx}"
-    improved = complete(system, user, max_tokens=2048)
+    improved = complete(system, user, max_tokens=2048, feature="resume_ai")
 
     system2 = (
         "You are a resume expert. Reply with valid JSON only: "
@@ -115,7 +115,7 @@ def improve_resume(resume_text: str, job_description: str | None = None) -> dict
         "Give 5-8 keyword suggestions and brief section_feedback. No markdown."
     )
     user2 = f"Resume:\n{resume_text[:4000]}"
-    extra = complete(system2, user2, max_tokens=512)
+    extra = complete(system2, user2, max_tokens=512, feature="resume_ai")
     keyword_suggestions: list[str] = []
     section_feedback: dict[str, str] = {}
     try:
@@ -0,0 +1,136 @@
+"""
+In-process search result cache: bounded LRU with a freshness TTL and stale-while-revalidate.
+Fresh entries are served directly. Entries past the TTL but inside the stale window are served
+immediately while one background refresh replaces them. Older entries count as misses.
+Counters (hits / misses / stale / refreshes) are exposed via stats(); lookups are also counted in the
+cache_lookups_total metric under the cache's name.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached search is fresh (0 disables the cache)
+SEARCH_CACHE_TTL = float(os.environ.get("SEARCH_CACHE_TTL") or "900")
+# Seconds past the TTL an entry may still be served while it is refreshed in the background (default 4x the TTL)
+SEARCH_CACHE_STALE_TTL = float(os.environ.get("SEARCH_CACHE_STALE_TTL") or str(4 * SEARCH_CACHE_TTL))
+# Max cached searches (least recently used are evicted)
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES") or "512")
+
+
+class SearchCache:
+    def __init__(
+        self,
+        ttl: float = SEARCH_CACHE_TTL,
+        stale_ttl: float = SEARCH_CACHE_STALE_TTL,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        name: str = "search cache",
+        cacheable: Callable[[Any], bool] | None = None,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max(1, max_entries)
+        self.name = name
+        # Values for which cacheable(value) is False (e.g. fallback data) are returned but never stored
+        self.cacheable = cacheable
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._refreshing: set[Hashable] = set()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-cache-refresh")
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any], refresh: Callable[[], Any] | None = None) -> Any:
+        """
+        Return the cached value for key, or load() it on a miss and cache it (empty or non-cacheable results are not cached).
+        A stale value is returned as-is and refresh() (default: load) runs once in the background.
+        """
+        if not self.enabled:
+            return load()
+        now = time.monotonic()
+        schedule = False
+        result = "miss"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry[0]
+                if age < self.ttl:
+                    self.hits += 1
+                    result = "hit"
+                    self._entries.move_to_end(key)
+                elif age < self.ttl + self.stale_ttl:
+                    self.stale += 1
+                    result = "stale"
+                    self._entries.move_to_end(key)
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        schedule = True
+                else:
+                    del self._entries[key]
+                    entry = None
+            if entry is None:
+                self.misses += 1
+        metrics.cache_lookup(self.name, result)
+        if entry is not None:
+            if schedule:
+                self._executor.submit(self._refresh, key, refresh or load)
+            return entry[1]
+        value = load()
+        self.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not value or (self.cacheable is not None and not self.cacheable(value)):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key: Hashable, refresh: Callable[[], Any]) -> None:
+        try:
+            self.set(key, refresh())
+            with self._lock:
+                self.refreshes += 1
+        except Exception as e:
+            with self._lock:
+                self.refresh_errors += 1
+            logger.warning("%s: background refresh of %r failed: %s", self.name, key, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.stale
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "hit_ratio": round((self.hits + self.stale) / lookups, 4) if lookups else 0.0,
+            }
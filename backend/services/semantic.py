@@ -0,0 +1,348 @@
+"""
+Offline semantic job matching: jobs and resumes are embedded locally (no network) and a resume
+retrieves its nearest jobs from an approximate nearest-neighbour (IVF) index.
+
+Embedding: words and word bigrams are feature-hashed (signed, sublinear TF x IDF) and projected
+with a randomized truncated SVD fit on the job corpus (latent semantic analysis), so terms that
+co-occur across postings ("ml engineer", "machine learning") land close together.
+Index: spherical k-means centroids with inverted lists; a query scores only the vectors in its
+SEMANTIC_NPROBE nearest lists.
+
+scripts/build_semantic_index.py (also run at the end of fetch_jobs_to_json.py) writes the index to
+data/semantic_index.npz, tagged with the (mtime, size) key of the corpus file it was built from.
+The API only loads that file, in a background thread, and uses it while the key matches the loaded
+corpus; until then get_semantic_index() returns None and callers fall back to keyword ranking.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from services.job_match import _keyword_tokens
+from services.job_storage import corpus_key
+
+try:
+    import numpy as np
+except ImportError:  # semantic matching is unavailable without numpy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = Path(os.environ.get("JOB_DATA_DIR") or Path(__file__).resolve().parent.parent / "data")
+SEMANTIC_INDEX_PATH = Path(os.environ.get("SEMANTIC_INDEX_PATH") or _DATA_DIR / "semantic_index.npz")
+
+# Hashed feature space (power of two) and embedding size
+SEMANTIC_HASH_DIM = int(os.environ.get("SEMANTIC_HASH_DIM") or str(2 ** 15))
+SEMANTIC_DIM = int(os.environ.get("SEMANTIC_DIM") or "128")
+# IVF lists (0 = about sqrt(number of jobs)) and how many nearest lists a query scans
+SEMANTIC_NLIST = int(os.environ.get("SEMANTIC_NLIST") or "0")
+SEMANTIC_NPROBE = int(os.environ.get("SEMANTIC_NPROBE") or "8")
+
+_SEED = 20240601
+_OVERSAMPLE = 10
+_POWER_ITERATIONS = 2
+_KMEANS_ITERATIONS = 10
+# Rows per block when multiplying the sparse job matrix (bounds temporary memory)
+_BLOCK_ROWS = 512
+
+
+def semantic_available() -> bool:
+    return np is not None
+
+
+def _job_text(j: dict) -> str:
+    # Title twice: it says more about the role than the boilerplate in most descriptions
+    return f"{j.get('title') or ''} {j.get('title') or ''} {j.get('description') or ''}"
+
+
+def _hashed_features(text: str, dim: int) -> dict[int, float]:
+    """Signed hashed counts of words (min length 2, no stop words) and adjacent word pairs."""
+    tokens = _keyword_tokens(text, min_len=2)
+    grams = Counter(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    out: dict[int, float] = {}
+    for gram, count in grams.items():
+        # crc32 is stable across processes (unlike hash()), so persisted indexes stay valid
+        h = zlib.crc32(gram.encode("utf-8"))
+        bucket = h & (dim - 1)
+        sign = -1.0 if h & 0x80000000 else 1.0
+        out[bucket] = out.get(bucket, 0.0) + sign * (1.0 + math.log(count))
+    return out
+
+
+def _sparse_rows(texts: list[str], dim: int) -> tuple[Any, Any, Any]:
+    """CSR (indptr, indices, data) of hashed features, one row per text."""
+    rows = [_hashed_features(t, dim) for t in texts]
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in rows], out=indptr[1:])
+    indices = np.fromiter((b for r in rows for b in r), dtype=np.int64, count=int(indptr[-1]))
+    data = np.fromiter((v for r in rows for v in r.values()), dtype=np.float64, count=int(indptr[-1]))
+    return indptr, indices, data
+
+
+def _csr_dot(indptr, indices, data, dense):
+    """(sparse n x dim) @ (dense dim x k), in row blocks."""
+    n = len(indptr) - 1
+    out = np.zeros((n, dense.shape[1]))
+    for start in range(0, n, _BLOCK_ROWS):
+        stop = min(n, start + _BLOCK_ROWS)
+        lo, hi = indptr[start], indptr[stop]
+        if lo == hi:
+            continue
+        prod = data[lo:hi, None] * dense[indices[lo:hi]]
+        offsets = indptr[start:stop] - lo
+        nonempty = np.flatnonzero(np.diff(indptr[start:stop + 1]))
+        out[start + nonempty] = np.add.reduceat(prod, offsets[nonempty], axis=0)
+    return out
+
+
+def _csr_t_dot(indptr, indices, data, dense, dim: int):
+    """(sparse n x dim).T @ (dense n x k), in row blocks."""
+    out = np.zeros((dim, dense.shape[1]))
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    for lo in range(0, len(indices), _BLOCK_ROWS * 64):
+        hi = min(len(indices), lo + _BLOCK_ROWS * 64)
+        np.add.at(out, indices[lo:hi], data[lo:hi, None] * dense[rows[lo:hi]])
+    return out
+
+
+def _normalize_rows(m):
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
+
+
+def _randomized_svd_components(indptr, indices, data, dim: int, k: int):
+    """Top-k right singular vectors (k x dim) of the sparse matrix (Halko et al. randomized range finder)."""
+    rng = np.random.default_rng(_SEED)
+    y = _csr_dot(indptr, indices, data, rng.standard_normal((dim, k + _OVERSAMPLE)))
+    for _ in range(_POWER_ITERATIONS):
+        q, _ = np.linalg.qr(y)
+        z, _ = np.linalg.qr(_csr_t_dot(indptr, indices, data, q, dim))
+        y = _csr_dot(indptr, indices, data, z)
+    q, _ = np.linalg.qr(y)
+    b = _csr_t_dot(indptr, indices, data, q, dim).T
+    _, s, vt = np.linalg.svd(b, full_matrices=False)
+    keep = min(k, int((s > 1e-9).sum()) or 1)
+    return vt[:keep]
+
+
+def _assign(vectors, centroids):
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), _BLOCK_ROWS * 8):
+        block = vectors[start:start + _BLOCK_ROWS * 8]
+        out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def _spherical_kmeans(vectors, nlist: int):
+    """Centroids (nlist x k, unit length) and each vector's list."""
+    rng = np.random.default_rng(_SEED)
+    centroids = vectors[rng.choice(len(vectors), size=nlist, replace=False)].copy()
+    assign = _assign(vectors, centroids)
+    for _ in range(_KMEANS_ITERATIONS):
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = np.flatnonzero(np.linalg.norm(sums, axis=1) == 0)
+        if empty.size:
+            sums[empty] = vectors[rng.choice(len(vectors), size=empty.size, replace=False)]
+        centroids = _normalize_rows(sums)
+        new_assign = _assign(vectors, centroids)
+        if np.array_equal(new_assign, assign):
+            break
+        assign = new_assign
+    return centroids, assign
+
+
+class SemanticIndex:
+    """
+    Embedding model (IDF weights + SVD components over the hashed feature space) and an IVF index
+    of the job vectors. Positions are indexes into the job list the index was built from; source_key is
+    that corpus file's (mtime_ns, size) (job_storage.corpus_key), or None if unknown.
+    """
+
+    def __init__(self, idf, components, vectors, centroids, list_offsets, list_positions, source_key: tuple[int, int] | None):
+        self.idf = idf
+        self.components = components
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_positions = list_positions
+        self.source_key = source_key
+        self.hash_dim = len(idf)
+
+    @classmethod
+    def build(
+        cls,
+        jobs: list[dict],
+        source_key: tuple[int, int] | None = None,
+        dim: int = SEMANTIC_DIM,
+        hash_dim: int = SEMANTIC_HASH_DIM,
+        nlist: int = SEMANTIC_NLIST,
+    ) -> "SemanticIndex":
+        if np is None:
+            raise RuntimeError("semantic index needs numpy")
+        if hash_dim <= 0 or hash_dim & (hash_dim - 1):
+            raise ValueError(f"SEMANTIC_HASH_DIM must be a power of two, got {hash_dim}")
+        indptr, indices, data = _sparse_rows([_job_text(j) for j in jobs], hash_dim)
+        n = len(jobs)
+        df = np.bincount(indices, minlength=hash_dim)
+        idf = np.log((1 + n) / (1 + df)) + 1.0
+        data = data * idf[indices]
+        if n:
+            components = _randomized_svd_components(indptr, indices, data, hash_dim, dim).astype(np.float32)
+            vectors = _normalize_rows(_csr_dot(indptr, indices, data, components.T.astype(np.float64)))
+            nlist = nlist or int(math.sqrt(n))
+            centroids, assign = _spherical_kmeans(vectors, max(1, min(nlist, n, 1024)))
+        else:
+            components = np.zeros((0, hash_dim), dtype=np.float32)
+            vectors = np.zeros((0, 0))
+            centroids, assign = np.zeros((0, 0)), np.zeros(0, dtype=np.int64)
+        order = np.argsort(assign, kind="stable")
+        list_offsets = np.searchsorted(assign[order], np.arange(len(centroids) + 1))
+        return cls(
+            idf.astype(np.float32),
+            components,
+            vectors.astype(np.float32),
+            centroids.astype(np.float32),
+            list_offsets.astype(np.int64),
+            order.astype(np.int64),
+            source_key,
+        )
+
+    def embed(self, text: str):
+        """Unit vector for a resume or query text (zero vector if nothing in it is known to the model)."""
+        features = _hashed_features(text or "", self.hash_dim)
+        if not features or not len(self.components):
+            return np.zeros(len(self.components), dtype=np.float32)
+        buckets = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+        weights = np.fromiter(features.values(), dtype=np.float32, count=len(features)) * self.idf[buckets]
+        vec = self.components[:, buckets] @ weights
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+
+    def search(self, text: str, k: int, nprobe: int = SEMANTIC_NPROBE) -> list[tuple[int, float]]:
+        """Approximate top-k (position, cosine similarity) for text, best first."""
+        query = self.embed(text)
+        if k <= 0 or not len(self.centroids) or not query.any():
+            return []
+        probe = np.argsort(-(self.centroids @ query))[:max(1, nprobe)]
+        candidates = np.concatenate([
+            self.list_positions[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probe
+        ])
+        if not candidates.size:
+            return []
+        scores = self.vectors[candidates] @ query
+        if candidates.size > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(candidates.size)
+        top = top[np.lexsort((candidates[top], -scores[top]))]
+        return [(int(candidates[i]), float(scores[i])) for i in top]
+
+    def save(self, path: Path = SEMANTIC_INDEX_PATH) -> None:
+        """Write the index (npz via a temp file + rename, so readers never see a partial file)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                idf=self.idf,
+                components=self.components,
+                vectors=self.vectors,
+                centroids=self.centroids,
+                list_offsets=self.list_offsets,
+                list_positions=self.list_positions,
+                source_key=np.array(self.source_key or (-1, -1), dtype=np.int64),
+            )
+        os.replace(tmp_path, path)
+        logger.info("semantic: saved index of %d jobs to %s", len(self.vectors), path)
+
+    @classmethod
+    def load(cls, path: Path = SEMANTIC_INDEX_PATH) -> "SemanticIndex":
+        with np.load(path, allow_pickle=False) as f:
+            return cls(
+                f["idf"],
+                f["components"],
+                f["vectors"],
+                f["centroids"],
+                f["list_offsets"],
+                f["list_positions"],
+                _source_key(f["source_key"]),
+            )
+
+
+def _source_key(stored) -> tuple[int, int] | None:
+    key = tuple(int(v) for v in stored)
+    return None if key == (-1, -1) else key
+
+
+def _index_file_key() -> tuple[int, int] | None:
+    try:
+        st = os.stat(SEMANTIC_INDEX_PATH)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# ((corpus key, index file key) of the last load, index or None if the file was missing or for another corpus).
+# Loads run in one background thread at a time (_loading), so requests never wait on the file.
+_index_lock = threading.Lock()
+_index_cache: tuple[tuple, SemanticIndex | None] | None = None
+_loading = False
+
+
+def build_semantic_index(jobs: list[dict], path: Path | None = SEMANTIC_INDEX_PATH) -> SemanticIndex:
+    """Build the index for jobs (a load_jobs_from_json() result) and (unless path is None) persist it."""
+    index = SemanticIndex.build(jobs, corpus_key(jobs))
+    if path is not None:
+        index.save(path)
+    return index
+
+
+def _load_index(key: tuple) -> None:
+    global _index_cache, _loading
+    index = None
+    try:
+        index = SemanticIndex.load(SEMANTIC_INDEX_PATH)
+        if index.source_key is None or index.source_key != key[0]:
+            logger.info("semantic: %s was built from another corpus; run scripts/build_semantic_index.py", SEMANTIC_INDEX_PATH)
+            index = None
+        else:
+            logger.info("semantic: loaded index of %d jobs from %s", len(index.vectors), SEMANTIC_INDEX_PATH)
+    except FileNotFoundError:
+        logger.info("semantic: no index at %s; run scripts/build_semantic_index.py", SEMANTIC_INDEX_PATH)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("semantic: could not load %s (rebuild with scripts/build_semantic_index.py): %s", SEMANTIC_INDEX_PATH, e)
+    finally:
+        with _index_lock:
+            _index_cache = (key, index)
+            _loading = False
+
+
+def get_semantic_index(jobs: list[dict]) -> SemanticIndex | None:
+    """
+    The prebuilt index (SEMANTIC_INDEX_PATH) for this job list (a load_jobs_from_json() result), or None:
+    without numpy or jobs, while the file is being loaded, or when it is missing or built from another
+    corpus. A changed corpus or index file starts a background load; this never loads or builds inline.
+    """
+    global _loading
+    if np is None or not jobs:
+        return None
+    key = (corpus_key(jobs), _index_file_key())
+    if key[0] is None:
+        return None
+    cached = _index_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with _index_lock:
+        if _loading:
+            return None
+        _loading = True
+    threading.Thread(target=_load_index, args=(key,), name="semantic-index-load", daemon=True).start()
+    return None
@@ -1,11 +1,22 @@
 """
 Job search: SerpAPI first, then Adzuna (free API), then mock so frontend always gets jobs.
 Uses SERPAPI_KEY or SERP_API_KEY; optional ADZUNA_APP_ID + ADZUNA_APP_KEY for fallback.
+Providers are queried concurrently under one deadline (JOB_PROVIDER_MODE=fanout, default)
+or one after another in JOB_PROVIDER_ORDER (JOB_PROVIDER_MODE=sequential).
+serpapi_page() / iter_serpapi_jobs() page through SerpAPI results with next_page_token (bulk fetches).
 """
+import asyncio
 import os
 import logging
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from services.gazetteer import resolve_location
+from services.http_client import get_async_client, get_client
+from services.pagination import follow_pages
+from services import metrics, timing
+from services.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -20,52 +31,73 @@ except ImportError:
 # Normalized job dict: title, company, location, description, apply_url, optional salary, posted_date
 JobDict = dict[str, Any]
 
+# Provider endpoints; point them at scripts/provider_standin.py to run searches offline
 # SerpAPI endpoint (reference uses search.json)
-SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
+SERPAPI_SEARCH_URL = os.environ.get("SERPAPI_SEARCH_URL") or "https://serpapi.com/search.json"
+ADZUNA_BASE_URL = (os.environ.get("ADZUNA_BASE_URL") or "https://api.adzuna.com/v1/api").rstrip("/")
 
 # Max jobs returned per search (limit scraping)
 MAX_JOBS_PER_SEARCH = 5
+# Paginated fetches (iter_serpapi_jobs): max pages and max jobs per query
+SERPAPI_MAX_PAGES = int(os.environ.get("SERPAPI_MAX_PAGES") or "5")
+SERPAPI_MAX_RESULTS = int(os.environ.get("SERPAPI_MAX_RESULTS") or "50")
+
+# Provider timeouts (seconds) for a single request
+SERPAPI_TIMEOUT = float(os.environ.get("SERPAPI_TIMEOUT") or "30")
+ADZUNA_TIMEOUT = float(os.environ.get("ADZUNA_TIMEOUT") or "20")
+
+# "fanout": query providers concurrently; "sequential": try them one at a time (original behaviour)
+JOB_PROVIDER_MODE = (os.environ.get("JOB_PROVIDER_MODE") or "fanout").strip().lower()
+# Provider priority: order for sequential mode and for merged fan-out results
+JOB_PROVIDER_ORDER = [
+    p.strip().lower() for p in (os.environ.get("JOB_PROVIDER_ORDER") or "serpapi,adzuna").split(",") if p.strip()
+]
+# Fan-out result: "first" = first non-empty provider result; "merge" = all results in by the deadline, deduped
+JOB_FANOUT_STRATEGY = (os.environ.get("JOB_FANOUT_STRATEGY") or "first").strip().lower()
+# Whole-search deadline (seconds) in fan-out mode; unfinished providers are cancelled
+JOB_SEARCH_DEADLINE = float(os.environ.get("JOB_SEARCH_DEADLINE") or "15")
 
 
 def search_jobs_mock(q: str, location: str) -> list[JobDict]:
     """Return mock job list (up to MAX_JOBS_PER_SEARCH). Keys: title, company, location, description, apply_url."""
-    return [
-        {
-            "title": q or "Software Engineer",
-            "company": "Acme Corp",
-            "location": location or "New York, NY",
-            "description": "Join our team. Set SERPAPI_KEY for real listings.",
-            "apply_url": "https://example.com/apply",
-        },
-        {
-            "title": q or "Developer",
-            "company": "TechStart Inc",
-            "location": location or "San Francisco, CA",
-            "description": "Great opportunity. Configure SerpAPI for live data.",
-            "apply_url": "https://example.com/jobs",
-        },
-        {
-            "title": q or "Engineer",
-            "company": "BuildCo",
-            "location": location or "Austin, TX",
-            "description": "Growth role. Add SERPAPI_KEY in .env for real job data.",
-            "apply_url": "https://example.com/careers",
-        },
-        {
-            "title": q or "Software Developer",
-            "company": "DataFlow Inc",
-            "location": location or "Seattle, WA",
-            "description": "Remote-friendly. Use SerpAPI for live scraping.",
-            "apply_url": "https://example.com/apply-now",
-        },
-        {
-            "title": q or "Tech Lead",
-            "company": "ScaleUp Labs",
-            "location": location or "Boston, MA",
-            "description": "Leadership opportunity. Real jobs when SERPAPI_KEY is set.",
-            "apply_url": "https://example.com/join",
-        },
-    ][:MAX_JOBS_PER_SEARCH]
+    with metrics.provider_call("mock") as call:
+        return call.result([
+            {
+                "title": q or "Software Engineer",
+                "company": "Acme Corp",
+                "location": location or "New York, NY",
+                "description": "Join our team. Set SERPAPI_KEY for real listings.",
+                "apply_url": "https://example.com/apply",
+            },
+            {
+                "title": q or "Developer",
+                "company": "TechStart Inc",
+                "location": location or "San Francisco, CA",
+                "description": "Great opportunity. Configure SerpAPI for live data.",
+                "apply_url": "https://example.com/jobs",
+            },
+            {
+                "title": q or "Engineer",
+                "company": "BuildCo",
+                "location": location or "Austin, TX",
+                "description": "Growth role. Add SERPAPI_KEY in .env for real job data.",
+                "apply_url": "https://example.com/careers",
+            },
+            {
+                "title": q or "Software Developer",
+                "company": "DataFlow Inc",
+                "location": location or "Seattle, WA",
+                "description": "Remote-friendly. Use SerpAPI for live scraping.",
+                "apply_url": "https://example.com/apply-now",
+            },
+            {
+                "title": q or "Tech Lead",
+                "company": "ScaleUp Labs",
+                "location": location or "Boston, MA",
+                "description": "Leadership opportunity. Real jobs when SERPAPI_KEY is set.",
+                "apply_url": "https://example.com/join",
+            },
+        ][:MAX_JOBS_PER_SEARCH])
 
 
 def _parse_serpapi_jobs(data: dict) -> list[JobDict]:
@@ -114,21 +146,12 @@ def _parse_serpapi_jobs(data: dict) -> list[JobDict]:
     return results
 
 
-def _search_serpapi(q: str, location: str) -> list[JobDict]:
-    """Fetch from SerpAPI Google Jobs. Returns [] if key missing, request fails, or no jobs."""
-    q_norm = (q or "Software Engineer").strip() or "Software Engineer"
-    loc_norm = (location or "United States").strip() or "United States"
-
+def _serpapi_params(q_norm: str, loc_norm: str, radius_km: float | None = None) -> dict[str, Any] | None:
+    """Build SerpAPI Google Jobs query params (lrad = search radius in km). None if SERPAPI_KEY is not set."""
     api_key = (os.environ.get("SERPAPI_KEY") or os.environ.get("SERP_API_KEY") or "").strip()
     if not api_key:
         logger.info("job search: SERPAPI_KEY not set; skipping SerpAPI")
-        return []
-
-    try:
-        import httpx
-    except ImportError:
-        logger.warning("job search: httpx not installed; pip install httpx")
-        return []
+        return None
 
     params: dict[str, Any] = {
         "engine": "google_jobs",
@@ -139,21 +162,53 @@ def _search_serpapi(q: str, location: str) -> list[JobDict]:
     }
     if loc_norm:
         params["location"] = loc_norm
-        if "germany" in loc_norm.lower() or "deutschland" in loc_norm.lower():
-            params["gl"] = "de"
+        place = resolve_location(loc_norm)
+        if place and place.country:
+            # Google's country code for the United Kingdom is "uk"
+            params["gl"] = "uk" if place.country == "gb" else place.country
+        if radius_km:
+            params["lrad"] = radius_km
+    return params
+
+
+def _serpapi_request(
+    q: str, location: str, radius_km: float | None = None, page_token: str | None = None,
+) -> tuple[dict[str, Any], str, str] | None:
+    """
+    (params, q_norm, loc_norm) for one SerpAPI request, shared by serpapi_page and _search_serpapi_async.
+    None if SERPAPI_KEY is not set (provider counted as skipped) or httpx is not installed.
+    """
+    q_norm = (q or "Software Engineer").strip() or "Software Engineer"
+    loc_norm = (location or "United States").strip() or "United States"
+
+    params = _serpapi_params(q_norm, loc_norm, radius_km)
+    if params is None:
+        metrics.provider_skipped()
+        return None
+    if page_token:
+        params["next_page_token"] = page_token
 
     try:
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.get(SERPAPI_SEARCH_URL, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-    except httpx.HTTPStatusError as e:
+        import httpx  # noqa: F401
+    except ImportError:
+        logger.warning("job search: httpx not installed; pip install httpx")
+        return None
+    return params, q_norm, loc_norm
+
+
+def _serpapi_failed(e: Exception) -> None:
+    """Log and count a failed SerpAPI request (HTTP status errors with the start of the response body)."""
+    import httpx
+
+    if isinstance(e, httpx.HTTPStatusError):
         logger.warning("job search: SerpAPI HTTP %s - %s", e.response.status_code, (e.response.text or "")[:200])
-        return []
-    except Exception as e:
+    else:
         logger.warning("job search: SerpAPI request failed: %s", e)
-        return []
+    metrics.provider_failed()
+
 
+def _serpapi_results(data: Any, q_norm: str, loc_norm: str, limit: int | None = MAX_JOBS_PER_SEARCH) -> list[JobDict]:
+    """Validate a SerpAPI response body and parse it (first limit jobs). Returns [] on API error or no jobs."""
     err = data.get("error") if isinstance(data, dict) else None
     if err:
         logger.warning("job search: SerpAPI error in response: %s", err)
@@ -169,22 +224,180 @@ def _search_serpapi(q: str, location: str) -> list[JobDict]:
         logger.info("job search: SerpAPI returned no jobs for q=%r location=%r", q_norm, loc_norm)
         return []
     logger.info("job search: SerpAPI returned %d jobs", len(parsed))
-    return parsed[:MAX_JOBS_PER_SEARCH]
+    return parsed if limit is None else parsed[:limit]
 
 
-def search_jobs(q: str, location: str) -> list[JobDict]:
+def _search_serpapi(q: str, location: str, raise_errors: bool = False, radius_km: float | None = None) -> list[JobDict]:
     """
-    Fetch job listings: try SerpAPI first, then Adzuna (free API), then mock.
-    Frontend always gets jobs. Set SERPAPI_KEY for SerpAPI; ADZUNA_APP_ID + ADZUNA_APP_KEY for Adzuna fallback.
+    Fetch from SerpAPI Google Jobs. Returns [] if key missing, request fails, or no jobs.
+    With raise_errors, a failed request raises its httpx error instead (callers that retry).
+    """
+    jobs, _ = serpapi_page(q, location, raise_errors=raise_errors, radius_km=radius_km)
+    return jobs[:MAX_JOBS_PER_SEARCH]
+
+
+def serpapi_page(
+    q: str,
+    location: str,
+    page_token: str | None = None,
+    raise_errors: bool = False,
+    radius_km: float | None = None,
+) -> tuple[list[JobDict], str | None]:
+    """
+    One SerpAPI results page (every job on it) and serpapi_pagination.next_page_token (None on the last page).
+    ([], None) if key missing, request fails, or no jobs; with raise_errors, a failed request raises.
+    """
+    request = _serpapi_request(q, location, radius_km, page_token)
+    if request is None:
+        return [], None
+    params, q_norm, loc_norm = request
+
+    try:
+        resp = get_client("serpapi", SERPAPI_TIMEOUT).get(SERPAPI_SEARCH_URL, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:
+        _serpapi_failed(e)
+        if raise_errors:
+            raise
+        return [], None
+
+    jobs = _serpapi_results(data, q_norm, loc_norm, limit=None)
+    next_token = ((data.get("serpapi_pagination") or {}).get("next_page_token") or None) if jobs else None
+    return jobs, next_token
+
+
+def iter_serpapi_jobs(
+    q: str,
+    location: str,
+    max_pages: int = SERPAPI_MAX_PAGES,
+    max_results: int = SERPAPI_MAX_RESULTS,
+    raise_errors: bool = False,
+) -> Iterator[JobDict]:
+    """SerpAPI jobs page by page (following next_page_token), yielded as each page arrives."""
+    return follow_pages(
+        lambda token: serpapi_page(q, location, page_token=token, raise_errors=raise_errors),
+        max_pages=max_pages,
+        max_results=max_results,
+    )
+
+
+async def _search_serpapi_async(q: str, location: str, radius_km: float | None = None) -> list[JobDict]:
+    """Async _search_serpapi for fan-out mode. Returns [] if key missing, request fails, or no jobs."""
+    request = _serpapi_request(q, location, radius_km)
+    if request is None:
+        return []
+    params, q_norm, loc_norm = request
+
+    try:
+        resp = await get_async_client("serpapi", SERPAPI_TIMEOUT).get(SERPAPI_SEARCH_URL, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:
+        _serpapi_failed(e)
+        return []
+
+    return _serpapi_results(data, q_norm, loc_norm)
+
+
+# Late-bound: the Adzuna fetchers are defined further down
+_PROVIDERS = {
+    "serpapi": lambda q, loc, **kw: _search_serpapi(q, loc, **kw),
+    "adzuna": lambda q, loc, **kw: _search_adzuna(q, loc, **kw),
+}
+_ASYNC_PROVIDERS = {
+    "serpapi": lambda q, loc, **kw: _search_serpapi_async(q, loc, **kw),
+    "adzuna": lambda q, loc, **kw: _search_adzuna_async(q, loc, **kw),
+}
+
+
+def provider_order() -> list[str]:
+    """Configured live providers in priority order (JOB_PROVIDER_ORDER, unknown names dropped)."""
+    order = [p for p in JOB_PROVIDER_ORDER if p in _PROVIDERS]
+    return order or list(_PROVIDERS)
+
+
+def search_provider(name: str, q: str, location: str, raise_errors: bool = False) -> list[JobDict]:
+    """
+    One live provider's results, with no fallback to other providers or mock data.
+    With raise_errors, request failures raise (httpx errors) instead of returning [] (for callers that retry).
     """
     q_norm = (q or "Software Engineer").strip() or "Software Engineer"
     loc_norm = (location or "United States").strip() or "United States"
+    return _PROVIDERS[name](q_norm, loc_norm, raise_errors=raise_errors)
 
-    jobs = _search_serpapi(q_norm, loc_norm)
-    if jobs:
-        return jobs
 
-    jobs = _search_adzuna(q_norm, loc_norm)
+def _merge_results(results: dict[str, list[JobDict]], order: list[str]) -> list[JobDict]:
+    """Concatenate provider results in priority order, dropping repeats of (title, company)."""
+    seen: set[tuple[str, str]] = set()
+    merged: list[JobDict] = []
+    for name in order:
+        for j in results.get(name) or []:
+            key = ((j.get("title") or "").strip().lower(), (j.get("company") or "").strip().lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(j)
+    return merged
+
+
+async def _timed_provider(name: str, search):
+    with timing.span(f"provider_{name}"), metrics.provider_call(name) as call:
+        return call.result(await search)
+
+
+async def _fan_out(q_norm: str, loc_norm: str, radius_km: float | None = None) -> list[JobDict]:
+    """Query every configured provider concurrently; stop at the first good result (or merge) within the deadline."""
+    order = provider_order()
+    tasks = {
+        asyncio.create_task(_timed_provider(name, _ASYNC_PROVIDERS[name](q_norm, loc_norm, radius_km=radius_km))): name
+        for name in order
+    }
+    results: dict[str, list[JobDict]] = {}
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + JOB_SEARCH_DEADLINE
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                try:
+                    results[name] = task.result()
+                except Exception as e:
+                    logger.warning("job search: %s failed in fan-out: %s", name, e)
+                    results[name] = []
+                if results[name] and JOB_FANOUT_STRATEGY != "merge":
+                    logger.info("job search: fan-out using %s (%d jobs)", name, len(results[name]))
+                    return results[name]
+        if pending:
+            logger.warning(
+                "job search: deadline %.1fs reached; cancelling %s",
+                JOB_SEARCH_DEADLINE, ", ".join(sorted(tasks[t] for t in pending)),
+            )
+    finally:
+        stragglers = [t for t in tasks if not t.done()]
+        for task in stragglers:
+            task.cancel()
+        if stragglers:
+            await asyncio.gather(*stragglers, return_exceptions=True)
+    return _merge_results(results, order)
+
+
+# Concurrent identical provider searches on one event loop share a single fan-out
+_provider_flight = SingleFlight("provider search")
+
+
+async def search_jobs_async(q: str, location: str, radius_km: float | None = None) -> list[JobDict]:
+    """Async search_jobs: concurrent provider fan-out under JOB_SEARCH_DEADLINE, then mock."""
+    q_norm = (q or "Software Engineer").strip() or "Software Engineer"
+    loc_norm = (location or "United States").strip() or "United States"
+
+    key = (" ".join(q_norm.lower().split()), " ".join(loc_norm.lower().split()), radius_km)
+    jobs = await _provider_flight.ado(key, lambda: _fan_out(q_norm, loc_norm, radius_km))
     if jobs:
         return jobs
 
@@ -192,28 +405,76 @@ def search_jobs(q: str, location: str) -> list[JobDict]:
     return search_jobs_mock(q_norm, loc_norm)
 
 
-def _search_adzuna(q: str, location: str) -> list[JobDict]:
-    """Fetch jobs from Adzuna API (free). Country from location or default 'us'. Returns [] on failure."""
-    try:
-        import httpx
-    except ImportError:
-        return []
+# Background event loop that runs fan-out searches for sync callers (FastAPI threadpool, scripts)
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def _provider_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="job-provider-loop", daemon=True).start()
+        return _loop
+
+
+@timing.timed("providers")
+def search_jobs(q: str, location: str, radius_km: float | None = None) -> list[JobDict]:
+    """
+    Fetch job listings: try SerpAPI first, then Adzuna (free API), then mock.
+    Frontend always gets jobs. Set SERPAPI_KEY for SerpAPI; ADZUNA_APP_ID + ADZUNA_APP_KEY for Adzuna fallback.
+    In fan-out mode the providers run concurrently and the whole call is bounded by JOB_SEARCH_DEADLINE.
+    radius_km is passed to the providers as their search radius around location.
+    """
+    q_norm = (q or "Software Engineer").strip() or "Software Engineer"
+    loc_norm = (location or "United States").strip() or "United States"
+
+    if JOB_PROVIDER_MODE == "fanout":
+        # The provider loop thread does not see this request's context; hand it the timing collector
+        search = timing.run_with(timing.current(), search_jobs_async(q_norm, loc_norm, radius_km))
+        future = asyncio.run_coroutine_threadsafe(search, _provider_loop())
+        try:
+            return future.result(timeout=JOB_SEARCH_DEADLINE + 5)
+        except Exception as e:
+            future.cancel()
+            logger.warning("job search: fan-out failed: %s; using mock data", e)
+            return search_jobs_mock(q_norm, loc_norm)
+
+    for name in provider_order():
+        with timing.span(f"provider_{name}"), metrics.provider_call(name) as call:
+            jobs = call.result(_PROVIDERS[name](q_norm, loc_norm, radius_km=radius_km))
+        if jobs:
+            return jobs
+
+    logger.info("job search: using mock data (set SERPAPI_KEY or ADZUNA_APP_ID+ADZUNA_APP_KEY for real jobs)")
+    return search_jobs_mock(q_norm, loc_norm)
+
+
+# Countries with an Adzuna jobs endpoint (/v1/api/jobs/{country}/search)
+ADZUNA_COUNTRIES = frozenset({
+    "at", "au", "be", "br", "ca", "ch", "de", "es", "fr", "gb", "in", "it", "mx", "nl", "nz", "pl", "sg", "us", "za",
+})
+
+
+def _adzuna_country(location: str) -> str:
+    """Adzuna country for the location's gazetteer country (e.g. "Denver, CO" -> us, "Berlin" -> de); default us."""
+    place = resolve_location(location)
+    return place.country if place and place.country in ADZUNA_COUNTRIES else "us"
+
+
+def _adzuna_request(q: str, location: str, radius_km: float | None = None) -> tuple[str, dict[str, Any], str] | None:
+    """
+    Build (url, params, country) for Adzuna search (distance = radius in km around where).
+    None if ADZUNA_APP_ID/ADZUNA_APP_KEY are not set.
+    """
     app_id = (os.environ.get("ADZUNA_APP_ID") or "").strip()
     app_key = (os.environ.get("ADZUNA_APP_KEY") or "").strip()
     if not app_id or not app_key:
-        return []
+        return None
 
-    # Adzuna country: gb, us, etc. Default us; use gb if location suggests UK
-    country = "us"
-    loc_lower = (location or "").lower()
-    if "uk" in loc_lower or "united kingdom" in loc_lower or "london" in loc_lower or "gb" in loc_lower:
-        country = "gb"
-    elif "de" in loc_lower or "germany" in loc_lower or "berlin" in loc_lower:
-        country = "de"
-    elif "at" in loc_lower or "austria" in loc_lower:
-        country = "at"
-
-    url = f"https://api.adzuna.com/v1/api/jobs/{country}/search/1"
+    country = _adzuna_country(location)
+    url = f"{ADZUNA_BASE_URL}/jobs/{country}/search/1"
     params: dict[str, Any] = {
         "app_id": app_id,
         "app_key": app_key,
@@ -224,16 +485,13 @@ def _search_adzuna(q: str, location: str) -> list[JobDict]:
         params["where"] = (location or "").strip()[:100]
     elif location and country == "gb":
         params["where"] = (location or "").strip()[:100]
+    if radius_km and "where" in params:
+        params["distance"] = max(1, round(radius_km))
+    return url, params, country
 
-    try:
-        with httpx.Client(timeout=20.0) as client:
-            resp = client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-    except Exception as e:
-        logger.warning("job search: Adzuna request failed: %s", e)
-        return []
 
+def _adzuna_results(data: Any, location: str, country: str) -> list[JobDict]:
+    """Parse an Adzuna search response into normalized job dicts."""
     results = data.get("results") if isinstance(data, dict) else []
     if not isinstance(results, list):
         return []
@@ -251,7 +509,7 @@ def _search_adzuna(q: str, location: str) -> list[JobDict]:
         salary_min = r.get("salary_min")
         salary_max = r.get("salary_max")
         salary_str: str | None = None
-        sym = "£" if country == "gb" else "€" if country in ("de", "at") else "$"
+        sym = "£" if country == "gb" else "€" if country in ("at", "be", "de", "es", "fr", "it", "nl") else "$"
         if isinstance(salary_min, (int, float)) and isinstance(salary_max, (int, float)):
             salary_str = f"{sym}{salary_min:,.0f} - {sym}{salary_max:,.0f}"
         elif isinstance(salary_min, (int, float)):
@@ -268,6 +526,61 @@ def _search_adzuna(q: str, location: str) -> list[JobDict]:
             "salary": salary_str,
             "posted_date": posted or None,
         })
+        if isinstance(r.get("latitude"), (int, float)) and isinstance(r.get("longitude"), (int, float)):
+            out[-1]["latitude"], out[-1]["longitude"] = r["latitude"], r["longitude"]
     if out:
         logger.info("job search: Adzuna returned %d jobs", len(out))
     return out
+
+
+def _search_adzuna(q: str, location: str, raise_errors: bool = False, radius_km: float | None = None) -> list[JobDict]:
+    """
+    Fetch jobs from Adzuna API (free). Country from location or default 'us'. Returns [] on failure
+    (with raise_errors, a failed request raises its httpx error instead).
+    """
+    try:
+        import httpx
+    except ImportError:
+        return []
+    request = _adzuna_request(q, location, radius_km)
+    if request is None:
+        metrics.provider_skipped()
+        return []
+    url, params, country = request
+
+    try:
+        resp = get_client("adzuna", ADZUNA_TIMEOUT).get(url, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:
+        logger.warning("job search: Adzuna request failed: %s", e)
+        metrics.provider_failed()
+        if raise_errors:
+            raise
+        return []
+
+    return _adzuna_results(data, location, country)
+
+
+async def _search_adzuna_async(q: str, location: str, radius_km: float | None = None) -> list[JobDict]:
+    """Async _search_adzuna for fan-out mode. Returns [] on failure."""
+    try:
+        import httpx
+    except ImportError:
+        return []
+    request = _adzuna_request(q, location, radius_km)
+    if request is None:
+        metrics.provider_skipped()
+        return []
+    url, params, country = request
+
+    try:
+        resp = await get_async_client("adzuna", ADZUNA_TIMEOUT).get(url, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:
+        logger.warning("job search: Adzuna request failed: %s", e)
+        metrics.provider_failed()
+        return []
+
+    return _adzuna_results(data, location, country)
@@ -0,0 +1,79 @@
+"""
+Single-flight: coalesce concurrent calls that share a key. The first caller (leader) runs the work;
+callers arriving while it is in flight wait and get the leader's result (or its exception).
+do() is for sync code (FastAPI threadpool), ado() for coroutines on an event loop.
+Results are shared between callers, so treat them as read-only.
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._futures: dict[tuple[int, Hashable], asyncio.Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn() once per key at a time; concurrent callers with the same key wait for that run."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        if not leader:
+            logger.info("%s: waiting on in-flight %r", self.name, key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async do(): await fn() once per key per event loop; concurrent awaiters share the result."""
+        loop = asyncio.get_running_loop()
+        fkey = (id(loop), key)
+        future = self._futures.get(fkey)
+        if future is not None:
+            logger.info("%s: waiting on in-flight %r", self.name, key)
+            return await asyncio.shield(future)
+        future = loop.create_future()
+        # Mark the outcome as retrieved so a failure with no followers is not reported as unhandled
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._futures[fkey] = future
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._futures.pop(fkey, None)
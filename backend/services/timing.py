@@ -0,0 +1,169 @@
+"""
+Per-request timing spans, reported as a Server-Timing header and one structured log line per request.
+
+With SERVER_TIMING=1, main.py's middleware starts a collector per request and spans (span() blocks,
+@timed functions, SQL statements via instrument_engine(), session commits) add their elapsed time to it under
+their name, so repeated spans (e.g. one per SQL query) are summed and counted. Sync endpoints run in the
+threadpool with a copy of the request context, so spans there land in the same collector; work handed to
+another thread or event loop carries it explicitly with use_collector().
+
+Disabled (the default), span() returns a shared no-op context manager and @timed returns the function
+unchanged, so instrumented code pays one flag check and nothing is registered on the engine.
+"""
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# "1" = collect spans, add Server-Timing headers and log one line per request; "0" (default) = off
+SERVER_TIMING = (os.environ.get("SERVER_TIMING") or "0").strip().lower() in ("1", "true", "on", "yes")
+
+# name -> [total seconds, count]
+Collector = dict[str, list]
+
+_collector: contextvars.ContextVar[Collector | None] = contextvars.ContextVar("server_timing", default=None)
+_NOOP = contextlib.nullcontext()
+
+
+def enabled() -> bool:
+    return SERVER_TIMING
+
+
+def current() -> Collector | None:
+    """This request's collector (None when disabled or outside a request)."""
+    return _collector.get() if SERVER_TIMING else None
+
+
+def record(name: str, seconds: float, collector: Collector | None = None) -> None:
+    collector = collector if collector is not None else current()
+    if collector is None:
+        return
+    entry = collector.get(name)
+    if entry is None:
+        collector[name] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+
+class _Span:
+    __slots__ = ("name", "collector", "started")
+
+    def __init__(self, name: str, collector: Collector):
+        self.name = name
+        self.collector = collector
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.started, self.collector)
+        return False
+
+
+def span(name: str):
+    """Context manager timing a block into the current request's collector; a no-op without one."""
+    if not SERVER_TIMING:
+        return _NOOP
+    collector = _collector.get()
+    return _NOOP if collector is None else _Span(name, collector)
+
+
+def timed(name: str) -> Callable:
+    """Decorator: time every call of a sync or async function as span `name` (the function itself when disabled)."""
+    def decorate(fn):
+        if not SERVER_TIMING:
+            return fn
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def use_collector(collector: Collector | None):
+    """Make `collector` current in this thread / task (for work running outside the request's context)."""
+    token = _collector.set(collector)
+    try:
+        yield
+    finally:
+        _collector.reset(token)
+
+
+async def run_with(collector: Collector | None, awaitable):
+    """Await `awaitable` with `collector` current, e.g. a coroutine submitted to another thread's event loop."""
+    with use_collector(collector):
+        return await awaitable
+
+
+def start() -> tuple[Collector, contextvars.Token]:
+    collector: Collector = {}
+    return collector, _collector.set(collector)
+
+
+def finish(token: contextvars.Token) -> None:
+    _collector.reset(token)
+
+
+def header_value(collector: Collector, total_seconds: float | None = None) -> str:
+    """Server-Timing header: name;dur=<ms>[;desc="<n>x"] per span, then total."""
+    parts = []
+    for name, (seconds, count) in collector.items():
+        part = f"{name};dur={seconds * 1000.0:.1f}"
+        if count > 1:
+            part += f';desc="{count}x"'
+        parts.append(part)
+    if total_seconds is not None:
+        parts.append(f"total;dur={total_seconds * 1000.0:.1f}")
+    return ", ".join(parts)
+
+
+def log_request(method: str, path: str, status: int, collector: Collector, total_seconds: float) -> None:
+    payload: dict[str, Any] = {
+        "method": method,
+        "path": path,
+        "status": status,
+        "total_ms": round(total_seconds * 1000.0, 1),
+        "spans": {name: {"ms": round(s * 1000.0, 1), "n": n} for name, (s, n) in collector.items()},
+    }
+    logger.info("server_timing %s", json.dumps(payload, separators=(",", ":")))
+
+
+def instrument_engine(engine) -> None:
+    """Time SQL statements on this engine as span "db"; does nothing when disabled. db.py times commits."""
+    if not SERVER_TIMING:
+        return
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_timing_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("_timing_started")
+        if stack:
+            record("db", time.perf_counter() - stack.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        stack = context.connection.info.get("_timing_started") if context.connection is not None else None
+        if stack:
+            stack.pop()
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Tests import the backend the way the app does (services.x, routers.x)
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
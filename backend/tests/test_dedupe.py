@@ -0,0 +1,23 @@
+"""Near-duplicate detection merges the same posting, not different roles or cities at one company."""
+from services.dedupe import NearDuplicateIndex
+
+BOILERPLATE = (
+    "Acme builds payment infrastructure for Europe's largest retailers. We offer flexible hours, "
+    "a learning budget, 30 days of vacation and a modern office. Join a team of engineers who care "
+    "about quality, testing and shipping reliable software to millions of customers every day."
+)
+
+
+def test_same_posting_is_merged():
+    index = NearDuplicateIndex()
+    assert index.check_and_add("1", "Software Engineer", "Acme", BOILERPLATE, "Berlin, Germany") is None
+    assert index.check_and_add("2", "Software  Engineer", "Acme", BOILERPLATE + " Apply today.", "Berlin, Germany") == "1"
+
+
+def test_other_city_or_title_is_kept():
+    index = NearDuplicateIndex()
+    assert index.check_and_add("1", "Software Engineer", "Acme", BOILERPLATE, "Berlin, Germany") is None
+    assert index.check_and_add("2", "Senior Software Engineer", "Acme", BOILERPLATE, "Munich, Germany") is None
+    assert index.check_and_add("3", "Software Engineer", "Acme", BOILERPLATE, "Munich, Germany") is None
+    assert index.check_and_add("4", "Senior Software Engineer", "Acme", BOILERPLATE, "Berlin, Germany") is None
+    assert len(index) == 4
@@ -0,0 +1,22 @@
+"""Two-letter codes that are both a country and a US state resolve to the state only in US context."""
+import pytest
+
+from services.gazetteer import location_id
+from services.serpapi import _adzuna_country
+
+
+@pytest.mark.parametrize("text, expected, adzuna", [
+    ("de", "de", "de"),
+    ("Berlin, DE", "de/berlin", "de"),
+    ("Dover, DE", "us/de/dover", "us"),
+    ("DE, US", "us/de", "us"),
+    ("CA", "ca", "ca"),
+    ("Toronto, CA", "ca/on/toronto", "ca"),
+    ("San Jose, CA", "us/ca/san-jose", "us"),
+    ("IN", "in", "in"),
+    ("Indianapolis, IN", "us/in/indianapolis", "us"),
+    ("Paris, TX", "us/tx", "us"),
+])
+def test_country_code_vs_state_code(text, expected, adzuna):
+    assert location_id(text) == expected
+    assert _adzuna_country(text) == adzuna
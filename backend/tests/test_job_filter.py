@@ -0,0 +1,70 @@
+"""filter_jobs through the inverted index must return exactly what the substring scan returns."""
+import pytest
+
+from services import job_storage
+from services.job_corpus import JobCorpus, write_corpus
+from services.job_storage import JobIndex, filter_jobs
+
+JOBS = [
+    {"id": 1, "title": "Engineering Manager", "company": "Acme", "location": "Austin, TX",
+     "description": "Lead a team of software engineers."},
+    {"id": 2, "title": "Software Engineer", "company": "Globex", "location": "New York, NY",
+     "description": "Build backend services in Python."},
+    {"id": 3, "title": "Data Engineers wanted", "company": "Initech", "location": "Berlin, Germany",
+     "description": "Pipelines with Spark and SQL."},
+    {"id": 4, "title": "Product Designer", "company": "Hooli", "location": "Remote",
+     "description": "Design flows for our mobile app."},
+    {"id": 5, "title": "Senior Python Developer", "company": "Soylent", "location": "Austin, Texas",
+     "description": "Django, FastAPI and PostgreSQL; c++ a plus."},
+]
+
+QUERIES = [
+    ("engineer", ""), ("software engineer", ""), ("Engineering Manager", ""), ("Engineers", ""),
+    ("ngineer", ""), ("python", "austin"), ("c++", ""), ("postgres", ""), ("ware eng", ""),
+    ("", "aus"), ("", "york, ny"), ("design", "remote"), ("nothing-like-this", ""), ("engineer", "germany"),
+]
+
+
+@pytest.mark.parametrize("engine", ["keyword", "bm25"])
+@pytest.mark.parametrize("q,location", QUERIES)
+def test_index_mode_matches_scan(monkeypatch, engine, q, location):
+    jobs = [dict(j) for j in JOBS]
+    index = JobIndex(jobs)
+    monkeypatch.setattr(job_storage, "JOB_RANKING_ENGINE", engine)
+    monkeypatch.setattr(job_storage, "JOB_FILTER_MODE", "substring")
+    scanned = [j["id"] for j in filter_jobs(jobs, q, location, index=index)]
+    monkeypatch.setattr(job_storage, "JOB_FILTER_MODE", "index")
+    indexed = [j["id"] for j in filter_jobs(jobs, q, location, index=index)]
+    assert indexed == scanned
+
+
+def test_partial_words_are_found():
+    jobs = [dict(j) for j in JOBS]
+    index = JobIndex(jobs)
+    assert sorted(j["id"] for j in filter_jobs(jobs, "engineer", "", index=index)) == [1, 2, 3]
+    assert sorted(j["id"] for j in filter_jobs(jobs, "software engineer", "", index=index)) == [1, 2]
+
+
+def test_substring_expansion_matches_vocabulary_scan(tmp_path):
+    index = JobIndex([dict(j) for j in JOBS])
+    path = tmp_path / "jobs.bin"
+    write_corpus(path, JOBS, index, None)
+    corpus = JobCorpus(path)
+    mapped = JobIndex.from_corpus(corpus)
+    for substrings, postings in [(index.text_substrings, index.text_postings), (mapped.text_substrings, corpus.text_postings)]:
+        for token in ["e", "a", "engineer", "ngineer", "ware", "c", "pipelines", "zzz", "0"]:
+            assert substrings.containing(token) == sorted(t for t in postings if token in t)
+
+
+@pytest.mark.parametrize("location,radius_km", [("Austin, TX", 50), ("Berlin", 100), ("New York, NY", 2000), ("Berlin", 10000)])
+def test_radius_search_from_index_and_jobs_bin(tmp_path, monkeypatch, location, radius_km):
+    jobs = [dict(j) for j in JOBS]
+    monkeypatch.setattr(job_storage, "JOB_FILTER_MODE", "substring")
+    scanned = [j["id"] for j in filter_jobs(jobs, "", location, radius_km=radius_km)]
+    monkeypatch.setattr(job_storage, "JOB_FILTER_MODE", "index")
+    index = JobIndex(jobs)
+    path = tmp_path / "jobs.bin"
+    write_corpus(path, jobs, index, None)
+    corpus = JobCorpus(path)
+    assert [j["id"] for j in filter_jobs(jobs, "", location, index=index, radius_km=radius_km)] == scanned
+    assert [j["id"] for j in filter_jobs(corpus, "", location, index=JobIndex.from_corpus(corpus), radius_km=radius_km)] == scanned
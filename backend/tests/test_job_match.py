@@ -0,0 +1,24 @@
+"""Scores persisted by the app (job_matches, its own copy of the scorer) must equal the live search scores."""
+from app.models import Job
+from app.services.job_match import ResumeProfile, compute_keyword_match
+from services.job_match import compute_match
+
+RESUME = "Senior Python engineer: FastAPI, Django, PostgreSQL, AWS. Built data pipelines with Spark and SQL."
+
+JOBS = [
+    Job(title="Senior Python Developer", company="Soylent", description="Django, FastAPI and PostgreSQL; AWS a plus."),
+    Job(title="Data Engineer", company="Initech", description="Pipelines with Spark and SQL."),
+    Job(title="Product Designer", company="Hooli", description="Design flows for our mobile app."),
+    Job(title="Engineer", company="Acme", description=None),
+]
+
+
+def test_persisted_score_matches_search_score():
+    profile = ResumeProfile(RESUME)
+    for job in JOBS:
+        score, keywords = compute_keyword_match(profile, job.title, job.description)
+        live_score, reasons = compute_match(RESUME, job.title, job.description)
+        assert score == live_score
+        assert keywords == sorted(keywords)[:5]
+        if keywords:
+            assert reasons[0] == f"Your resume matches keywords: {', '.join(keywords)}"